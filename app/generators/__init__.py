@@ -1,23 +1,43 @@
 """
 Module des générateurs de documents.
+
+Les exports sont importés au premier accès : importer app.generators (ou un
+sous-module léger comme app.generators.assets) ne charge ni python-docx ni
+Pillow, ce qui raccourcit le démarrage du serveur.
 """
-from .report_generator import generate_report
-from .covers import get_cover_generator, COVER_GENERATORS
-from .sections import (
-    generate_toc_section,
-    generate_thanks_section,
-    generate_abstract_section,
-    generate_chapters,
-    generate_annexes_section,
-)
+import importlib
+
+# Nom exporté -> sous-module qui le définit
+_EXPORTS = {
+    'generate_report': '.report_generator',
+    'REPORT_STAGES': '.report_generator',
+    'ReportStats': '.stats',
+    'Outline': '.outline',
+    'report_outline': '.outline',
+    'paginate': '.pagination',
+    'ReportPlan': '.plan',
+    'plan_report': '.plan',
+    'get_cover_generator': '.covers',
+    'cover_model_name': '.covers',
+    'COVER_GENERATORS': '.covers',
+    'generate_toc_section': '.sections',
+    'generate_thanks_section': '.sections',
+    'generate_abstract_section': '.sections',
+    'generate_chapters': '.sections',
+    'generate_annexes_section': '.sections',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    'generate_report',
-    'get_cover_generator',
-    'COVER_GENERATORS',
-    'generate_toc_section',
-    'generate_thanks_section',
-    'generate_abstract_section',
-    'generate_chapters',
-    'generate_annexes_section',
-]
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,197 @@
+"""
+Stockage des images téléversées, normalisées une fois et référencées par empreinte.
+
+Les images sont écrites sur disque pour être partagées entre le processus
+principal et les workers de génération. Un champ de LogosConfig peut alors
+contenir « asset:<empreinte> » au lieu de l'image en base64.
+
+Les fonctions de lecture des champs d'image (has_image, load_image_bytes,
+image_digest) sont ici plutôt que dans utils : elles servent aussi au
+processus principal (cache, admission), sans python-docx ni Pillow.
+"""
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import threading
+
+ASSET_PREFIX = 'asset:'
+_HASH_RE = re.compile(r'[0-9a-f]{64}')
+
+# Répertoire partagé et budget disque des images stockées (octets)
+ASSETS_DIR = os.environ.get('REPORT_ASSETS_DIR') or os.path.join(
+    os.environ.get('REPORT_TMP_DIR') or tempfile.gettempdir(), 'rapport_assets')
+ASSETS_MAX_BYTES = int(os.environ.get('REPORT_ASSETS_MAX_BYTES', str(256 * 1024 * 1024)))
+
+
+def is_asset_hash(digest) -> bool:
+    """Indique si digest est une empreinte d'image valide (SHA-256 en hexadécimal minuscule)."""
+    return isinstance(digest, str) and _HASH_RE.fullmatch(digest) is not None
+
+
+def asset_hash(value):
+    """Empreinte désignée par une référence « asset:<empreinte> », sinon None."""
+    if not isinstance(value, str) or not value.startswith(ASSET_PREFIX):
+        return None
+    digest = value[len(ASSET_PREFIX):]
+    return digest if is_asset_hash(digest) else None
+
+
+def content_hash(content: bytes) -> str:
+    """Empreinte SHA-256 du contenu original d'une image."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class AssetStore:
+    """Images normalisées (JPEG ou PNG) rangées par empreinte de leur contenu original.
+
+    L'empreinte est celle des octets téléversés. Les fichiers portent
+    l'empreinte seule, sans extension : le format est lu dans leur en-tête
+    (media_type). Au-delà du budget disque, les images les moins récemment
+    utilisées sont supprimées.
+    """
+
+    def __init__(self, directory: str = ASSETS_DIR, max_bytes: int = ASSETS_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def size(self, digest: str) -> int:
+        """Taille de l'image stockée, ou 0 si elle est inconnue."""
+        try:
+            return os.path.getsize(self.path(digest))
+        except OSError:
+            return 0
+
+    def media_type(self, digest: str) -> str:
+        """Type MIME de l'image stockée, d'après son en-tête (JPEG ou PNG)."""
+        with open(self.path(digest), 'rb') as f:
+            head = f.read(3)
+        return "image/jpeg" if head == b'\xff\xd8\xff' else "image/png"
+
+    def get(self, digest: str) -> bytes:
+        """Octets de l'image ; KeyError si elle est inconnue ou évincée."""
+        path = self.path(digest)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        try:
+            # Marque l'image comme récemment utilisée (éviction LRU)
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    def add(self, content: bytes) -> dict:
+        """Normalise et stocke une image ; renvoie sa description.
+
+        Lève ImageError (une ValueError) si l'image est illisible ou trop grande.
+        """
+        from .utils import normalize_image
+
+        digest = content_hash(content)
+        path = self.path(digest)
+        if not os.path.exists(path):
+            normalized, (width, height) = normalize_image(content)
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.asset_', dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(normalized)
+            os.replace(tmp_path, path)
+            self._evict(keep=digest)
+        else:
+            os.utime(path)
+            from PIL import Image as PILImage
+            with PILImage.open(path) as image:
+                width, height = image.size
+
+        return {
+            "ref": ASSET_PREFIX + digest,
+            "hash": digest,
+            "size": os.path.getsize(path),
+            "width": width,
+            "height": height,
+        }
+
+    def _evict(self, keep: str):
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                # Images stockées, y compris celles des versions qui les
+                # nommaient « <empreinte>.png » ; pas les fichiers temporaires
+                if not is_asset_hash(entry.name.partition('.')[0]):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+                total += stat.st_size
+            entries.sort()
+            for _, name, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+asset_store = AssetStore()
+
+
+def add_asset(content: bytes) -> dict:
+    """asset_store.add() sous forme de fonction de module, transmissible aux workers du pool."""
+    return asset_store.add(content)
+
+
+def has_image(value) -> bool:
+    """Indique si un champ de LogosConfig contient une image exploitable."""
+    if asset_hash(value):
+        return True
+    return bool(value) and len(value) > 100
+
+
+def load_image_bytes(source) -> bytes:
+    """Renvoie les octets d'une image fournie en base64 (data URL), en référence
+    « asset:<empreinte> » ou déjà brute."""
+    if not source:
+        raise ValueError("Image base64 vide")
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    digest = asset_hash(source)
+    if digest:
+        return asset_store.get(digest)
+    if ',' in source:
+        source = source.split(',')[1]
+    return base64.b64decode(source)
+
+
+def image_digest(source) -> str:
+    """Empreinte SHA-256 d'un champ d'image tel que reçu (« - » s'il est vide).
+
+    Une référence « asset:<empreinte> » désigne déjà l'empreinte du contenu.
+    Les autres valeurs (base64, octets bruts) sont hachées sans être
+    décodées : une image mal formée ne fait pas échouer le calcul, ignorée
+    ensuite comme à la génération.
+    """
+    if not source:
+        return '-'
+    digest = asset_hash(source)
+    if digest is not None:
+        return digest
+    if isinstance(source, str):
+        # Préfixe distinct : un texte base64 et les mêmes octets bruts ne
+        # désignent pas la même image
+        return hashlib.sha256(b'base64\0' + source.encode('utf-8')).hexdigest()
+    return hashlib.sha256(source).hexdigest()
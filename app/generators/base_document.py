@@ -0,0 +1,142 @@
+"""
+Documents de base (page A4, marges, styles) préparés une fois et clonés par rapport.
+"""
+import copy
+import os
+import threading
+from collections import OrderedDict
+
+from docx import Document
+from docx.parts.styles import StylesPart
+from docx.shared import Cm, Twips
+
+from .utils import setup_document_styles
+
+# Nombre de combinaisons style/mise en page conservées (par processus)
+BASE_DOCUMENTS_MAX = int(os.environ.get('REPORT_BASE_DOCUMENTS', '16'))
+
+
+class _SharedStylesPart(StylesPart):
+    """Partie styles.xml partagée en lecture seule entre les clones.
+
+    Sa sérialisation (≈ 350 Kio) est calculée une seule fois.
+    """
+
+    _cached_blob = None
+
+    @property
+    def blob(self):
+        if self._cached_blob is None:
+            self._cached_blob = super().blob
+        return self._cached_blob
+
+
+def base_document_key(style, page) -> str:
+    """Clé normalisée des réglages qui déterminent le document de base."""
+    values = style.model_dump()
+    for name, value in values.items():
+        if name.endswith('_color'):
+            values[name] = value.lower()
+    margins = (page.margin_top, page.margin_bottom, page.margin_left, page.margin_right)
+    return repr((sorted(values.items()), margins))
+
+
+def block_width(page) -> int:
+    """Largeur utile de la page A4 (EMU), égale à doc._block_width du document de base.
+
+    Connue avant la création du document : sert à la clé du cache des pages de
+    garde. Les dimensions sont arrondies en twips, comme dans sectPr.
+    """
+    def twips(cm):
+        return Twips(Cm(cm).twips)
+
+    return int(twips(21) - twips(page.margin_left) - twips(page.margin_right))
+
+
+def build_base_document(style, page):
+    """Crée un document vierge avec la géométrie de page et les styles demandés."""
+    doc = Document()
+
+    # Configuration de la page (A4)
+    section = doc.sections[0]
+    section.page_width = Cm(21)
+    section.page_height = Cm(29.7)
+    section.top_margin = Cm(page.margin_top)
+    section.bottom_margin = Cm(page.margin_bottom)
+    section.left_margin = Cm(page.margin_left)
+    section.right_margin = Cm(page.margin_right)
+
+    # Première page différente (pas de header/footer sur page de garde)
+    section.different_first_page_header_footer = True
+
+    setup_document_styles(doc, style)
+    return doc
+
+
+class BaseDocumentCache:
+    """Cache LRU de documents de base, clonés à chaque génération.
+
+    Le clonage est une copie profonde de l'arbre python-docx, sauf pour les
+    parties jamais modifiées pendant la génération : styles.xml (de loin la
+    plus grosse, configurée une fois pour toutes) et les parties binaires
+    (thème, polices, miniature...), partagées entre les clones.
+    """
+
+    def __init__(self, max_entries: int = BASE_DOCUMENTS_MAX):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _prepare(self, style, page):
+        doc = build_base_document(style, page)
+        shared = {}
+        for part in doc.part.package.iter_parts():
+            if isinstance(part, StylesPart):
+                part.__class__ = _SharedStylesPart
+                shared[id(part)] = part
+            elif not hasattr(part, '_element'):
+                shared[id(part)] = part
+        return doc, shared
+
+    def _entry(self, style, page):
+        key = base_document_key(style, page)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._prepare(style, page)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def new_document(self, style, page):
+        """Nouveau document prêt à remplir pour ces réglages."""
+        doc, shared = self._entry(style, page)
+        # Le mémo pré-rempli fait pointer les clones sur les parties partagées
+        return copy.deepcopy(doc, dict(shared))
+
+    def warm(self, configs=None) -> list:
+        """Prépare les documents de base (par défaut : réglages par défaut) et les renvoie."""
+        if configs is None:
+            from app.models.schemas import PageConfig, StyleConfig
+            configs = [(StyleConfig(), PageConfig())]
+        return [self._entry(style, page)[0] for style, page in configs]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+base_documents = BaseDocumentCache()
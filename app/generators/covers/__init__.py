@@ -1,22 +1,36 @@
 """
 Module des générateurs de pages de garde.
+
+Les generate_cover_<modèle> sont résolus à la demande par COVER_GENERATORS,
+qui n'importe le module d'un modèle qu'à sa première utilisation. Le cache
+des pages rendues (python-docx, lxml) n'est importé qu'au premier accès.
 """
+import importlib
+
 from .covers import (
-    generate_cover_classique,
-    generate_cover_moderne,
-    generate_cover_elegant,
-    generate_cover_minimaliste,
-    generate_cover_academique,
-    generate_cover_geometrique,
-    generate_cover_bicolore,
-    generate_cover_pro,
-    generate_cover_gradient,
-    generate_cover_timeline,
-    generate_cover_creative,
-    generate_cover_luxe,
+    COVER_MODELS,
+    CoverRegistry,
     COVER_GENERATORS,
     get_cover_generator,
+    cover_model_name,
 )
+from .layout import CoverLayout, compile_layouts
+
+_GENERATOR_PREFIX = 'generate_cover_'
+
+# Exports du cache, importés au premier accès
+_CACHE_EXPORTS = ('CoverCache', 'cover_cache', 'cover_cache_key', 'cover_images', 'render_cover')
+
+
+def __getattr__(name):
+    if name.startswith(_GENERATOR_PREFIX) and name[len(_GENERATOR_PREFIX):] in COVER_GENERATORS:
+        return COVER_GENERATORS[name[len(_GENERATOR_PREFIX):]]
+    if name in _CACHE_EXPORTS:
+        value = getattr(importlib.import_module('.cache', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'generate_cover_classique',
@@ -31,6 +45,16 @@ __all__ = [
     'generate_cover_timeline',
     'generate_cover_creative',
     'generate_cover_luxe',
+    'COVER_MODELS',
+    'CoverRegistry',
     'COVER_GENERATORS',
     'get_cover_generator',
+    'cover_model_name',
+    'CoverLayout',
+    'compile_layouts',
+    'CoverCache',
+    'cover_cache',
+    'cover_cache_key',
+    'cover_images',
+    'render_cover',
 ]
@@ -0,0 +1,131 @@
+"""
+Cache des pages de garde rendues (fragment XML du corps et images associées).
+
+Une page de garde ne dépend que de quelques champs de ReportData : le
+fragment produit est réutilisé tant que ces champs ne changent pas (par
+exemple quand seuls les chapitres sont modifiés).
+"""
+import copy
+import hashlib
+import io
+import os
+from operator import attrgetter
+
+from docx.oxml.ns import qn
+from lxml import etree
+
+from ..lru import ByteBudgetCache
+from ..stats import timed_stage
+from ..utils import image_digest
+from .covers import cover_model_name, get_cover_generator
+
+# Budget mémoire des fragments conservés (octets, par processus)
+COVER_CACHE_BYTES = int(os.environ.get('REPORT_COVER_CACHE_BYTES', str(32 * 1024 * 1024)))
+
+_R_EMBED = qn('r:embed')
+
+
+def cover_cache_key(model: str, data, date_debut_fr: str, date_fin_fr: str, duree: str,
+                    block_width: int = 0) -> str:
+    """Empreinte des seules données lues par la page de garde du modèle.
+
+    Les champs sont ceux déclarés par la mise en page du modèle ;
+    block_width (largeur utile de la page, en EMU) détermine la largeur des
+    cellules de ses tableaux.
+    """
+    generator = get_cover_generator(model)
+    digest = hashlib.sha256(cover_model_name(model).encode('utf-8'))
+    for part in (block_width, date_debut_fr, date_fin_fr, duree):
+        digest.update(f"\0{part}".encode('utf-8'))
+    for chain in generator.fields:
+        value = data
+        for attr in chain:
+            value = getattr(value, attr)
+        if chain[0] == 'logos':
+            value = image_digest(value)
+        digest.update(f"\0{'.'.join(chain)}={value!r}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class CoverFragment:
+    """Éléments du corps d'une page de garde et images qu'ils référencent."""
+
+    __slots__ = ('elements', 'images', 'size')
+
+    def __init__(self, elements, images):
+        self.elements = elements
+        # [(rId d'origine, octets de l'image)], dans l'ordre d'ajout
+        self.images = images
+        self.size = sum(len(blob) for _, blob in images) + sum(
+            len(etree.tostring(element)) for element in elements)
+
+    @classmethod
+    def capture(cls, doc, elements):
+        images = []
+        seen = set()
+        for element in elements:
+            for node in element.iter():
+                rid = node.get(_R_EMBED)
+                if rid and rid not in seen:
+                    seen.add(rid)
+                    images.append((rid, doc.part.related_parts[rid].blob))
+        return cls([copy.deepcopy(element) for element in elements], images)
+
+    def insert_into(self, doc):
+        """Insère une copie du fragment à la fin du corps de doc."""
+        rids = {}
+        for rid, blob in self.images:
+            rids[rid], _ = doc.part.get_or_add_image(io.BytesIO(blob))
+
+        body = doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        for element in self.elements:
+            element = copy.deepcopy(element)
+            for node in element.iter():
+                rid = node.get(_R_EMBED)
+                if rid:
+                    node.set(_R_EMBED, rids[rid])
+            if sect_pr is not None:
+                sect_pr.addprevious(element)
+            else:
+                body.append(element)
+
+
+class CoverCache(ByteBudgetCache):
+    """Cache LRU de fragments de page de garde, borné par un budget en octets."""
+
+    def __init__(self, max_bytes: int = COVER_CACHE_BYTES):
+        super().__init__(max_bytes, sizeof=attrgetter('size'))
+
+
+cover_cache = CoverCache()
+
+
+def cover_images(key: str, data) -> list:
+    """Images à préparer pour la page de garde de clé key ([] si elle est en cache)."""
+    if key in cover_cache:
+        return []
+    return get_cover_generator(getattr(data, 'cover_model', 'classique')).images(data)
+
+
+def render_cover(doc, data, date_debut_fr: str, date_fin_fr: str, duree: str, key: str = None):
+    """Ajoute la page de garde de data.cover_model, depuis le cache si possible.
+
+    key est la clé cover_cache_key() si elle a déjà été calculée.
+    """
+    model = getattr(data, 'cover_model', 'classique')
+    if key is None:
+        key = cover_cache_key(model, data, date_debut_fr, date_fin_fr, duree, doc._block_width)
+
+    fragment = cover_cache.get(key)
+    if fragment is not None:
+        with timed_stage('cover_reuse'):
+            fragment.insert_into(doc)
+        return
+
+    body = doc.element.body
+    before = set(body)
+    get_cover_generator(model)(doc, data, date_debut_fr, date_fin_fr, duree)
+    added = [element for element in body
+             if element not in before and element.tag != qn('w:sectPr')]
+    cover_cache.put(key, CoverFragment.capture(doc, added))
@@ -0,0 +1,255 @@
+"""
+Compilation des mises en page de garde (layout.py) en XML WordprocessingML.
+
+Une mise en page devient un programme : une liste de segments, chaînes fixes
+ou fonctions du contexte de génération (champs, conditions, images). Seul
+ce module dépend de python-docx ; il est importé à la première compilation.
+"""
+from xml.sax.saxutils import escape
+
+from docx.oxml.ns import qn
+from docx.shared import Cm, Emu, Pt, Twips
+
+from ..utils import decode_base64_image, hex_to_rgb
+from ..xml_builder import BodyBuilder, _run_content
+from .layout import _FIELD, _INDENT, _SPACING, PRIMARY, Borders, Cell, Para, Picture, Run, Table, When
+
+_TBL_LOOK = ('<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" '
+             'w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>')
+_PICTURE = '<w:r><w:drawing/></w:r>'
+
+
+def _render(program, ctx) -> str:
+    return ''.join(segment if segment.__class__ is str else segment(ctx)
+                   for segment in program)
+
+
+def _merge(segments) -> list:
+    """Regroupe les segments fixes consécutifs."""
+    program = []
+    for segment in segments:
+        if segment.__class__ is str and program and program[-1].__class__ is str:
+            program[-1] += segment
+        elif segment != '':
+            program.append(segment)
+    return program
+
+
+def _primary(ctx, raw: bool) -> str:
+    """Couleur principale : brute (fonds, bordures) ou normalisée (texte)."""
+    color = ctx.data.style.title1_color
+    return escape(color.lstrip('#'), {'"': '&quot;'}) if raw else str(hex_to_rgb(color))
+
+
+def _color(color, raw: bool):
+    if color == PRIMARY:
+        return lambda ctx: _primary(ctx, raw)
+    return color
+
+
+def _text(template: str):
+    """Contenu d'un run : fixe si le texte n'a pas de champ."""
+    pieces = []
+    position = 0
+    for match in _FIELD.finditer(template):
+        pieces.append(template[position:match.start()])
+        pieces.append((match.group(1), match.group(2)))
+        position = match.end()
+    if not pieces:
+        return _run_content(template)
+    pieces.append(template[position:])
+
+    def text(ctx):
+        chunks = []
+        for piece in pieces:
+            if piece.__class__ is str:
+                chunks.append(piece)
+                continue
+            name, default = piece
+            value = ctx.value(name)
+            if default is not None and not value:
+                value = default
+            chunks.append(str(value))
+        return _run_content(''.join(chunks))
+
+    return text
+
+
+def _when(node, compile_children):
+    then = _merge(compile_children(node.then))
+    otherwise = _merge(compile_children(node.otherwise))
+    fields = node.fields
+
+    def when(ctx):
+        if any(ctx.test(name) for name in fields):
+            return _render(then, ctx)
+        return _render(otherwise, ctx)
+
+    return when
+
+
+def _compile_inline(nodes) -> list:
+    segments = []
+    for node in nodes:
+        if isinstance(node, Run):
+            segments.append('<w:r>')
+            properties = []
+            if node.bold:
+                properties.append('<w:b/>')
+            if node.italic:
+                properties.append('<w:i/>')
+            if node.small_caps:
+                properties.append('<w:smallCaps/>')
+            if node.color is not None:
+                properties += ['<w:color w:val="', _color(node.color, raw=False), '"/>']
+            if node.size is not None:
+                properties.append(f'<w:sz w:val="{int(Pt(node.size).pt * 2)}"/>')
+            if properties:
+                segments += ['<w:rPr>', *properties, '</w:rPr>']
+            segments += [_text(node.text), '</w:r>']
+        elif isinstance(node, Picture):
+            segments.append(_picture(node))
+        elif isinstance(node, When):
+            segments.append(_when(node, _compile_inline))
+        else:
+            raise TypeError(f"Élément de paragraphe inattendu : {node!r}")
+    return segments
+
+
+def _picture(node: Picture):
+    image = (node.field, Cm(node.height))
+
+    def picture(ctx):
+        # Emplacement rempli après insertion dans le document (voir CoverLayout)
+        ctx.pictures.append(image)
+        return _PICTURE
+
+    return picture
+
+
+def _compile_para(node: Para) -> list:
+    spacing = ''.join(f' {_SPACING[key]}="{Pt(value).twips}"'
+                      for key, value in node.format.items() if key in _SPACING)
+    indent = ''.join(f' {_INDENT[key]}="{Cm(value).twips}"'
+                     for key, value in node.format.items() if key in _INDENT)
+    properties = ''
+    if spacing:
+        properties += f'<w:spacing{spacing}/>'
+    if indent:
+        properties += f'<w:ind{indent}/>'
+    if node.align:
+        properties += f'<w:jc w:val="{node.align}"/>'
+    if properties:
+        properties = f'<w:pPr>{properties}</w:pPr>'
+    return ['<w:p>', properties, *_compile_inline(node.content), '</w:p>']
+
+
+def _compile_borders(borders: Borders) -> list:
+    segments = ['<w:tblBorders>']
+    for side, color, size in borders.sides:
+        if color is None:
+            segments.append(f'<w:{side} w:val="nil"/>')
+        else:
+            segments += [f'<w:{side} w:val="single" w:sz="{size}" w:color="',
+                         _color(color, raw=True), '"/>']
+    segments.append('</w:tblBorders>')
+    return segments
+
+
+def _compile_cell(cell: Cell, width) -> list:
+    segments = [f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width.twips}"/>']
+    if cell.fill is not None:
+        segments += ['<w:shd w:fill="', _color(cell.fill, raw=True), '"/>']
+    segments.append('</w:tcPr>')
+
+    content = _merge(_compile_blocks(cell.blocks, Twips(width.twips), nested=True))
+    if not cell.blocks:
+        segments.append('<w:p/>')
+    elif isinstance(cell.blocks[0], Para):
+        segments += content
+    else:
+        # Une cellule commence toujours par un paragraphe (vide par défaut)
+        def first_paragraph(ctx):
+            xml = _render(content, ctx)
+            return xml if xml.startswith('<w:p>') else '<w:p/>' + xml
+
+        segments.append(first_paragraph)
+    segments.append('</w:tc>')
+    return segments
+
+
+def _compile_table(table: Table, width, nested: bool) -> list:
+    # python-docx répartit la largeur disponible entre les cellules (w:tcW) ;
+    # les largeurs demandées ne portent que sur la grille (w:gridCol).
+    col_width = Emu(width / len(table.widths))
+    segments = ['<w:tbl><w:tblPr><w:tblW w:type="auto" w:w="0"/>']
+    if table.align:
+        segments.append(f'<w:jc w:val="{table.align}"/>')
+    segments += ['<w:tblLayout w:type="fixed"/>', _TBL_LOOK]
+    for borders in table.borders:
+        segments += _compile_borders(borders)
+    segments.append('</w:tblPr><w:tblGrid>')
+    segments += [f'<w:gridCol w:w="{Cm(column).twips}"/>' for column in table.widths]
+    segments.append('</w:tblGrid>')
+    for row in table.rows:
+        segments.append('<w:tr>')
+        for cell in row:
+            segments += _compile_cell(cell, col_width)
+        segments.append('</w:tr>')
+    segments.append('</w:tbl>')
+    if nested:
+        # Word exige un paragraphe après un tableau en fin de cellule
+        segments.append('<w:p/>')
+    return segments
+
+
+def _compile_blocks(nodes, width, nested: bool = False) -> list:
+    segments = []
+    for node in nodes:
+        if isinstance(node, Para):
+            segments += _compile_para(node)
+        elif isinstance(node, Table):
+            segments += _compile_table(node, width, nested)
+        elif isinstance(node, When):
+            segments.append(_when(node, lambda children: _compile_blocks(children, width, nested)))
+        else:
+            raise TypeError(f"Bloc de page de garde inattendu : {node!r}")
+    return segments
+
+
+def compile_blocks(blocks, block_width: int) -> list:
+    """Programme d'une mise en page pour une largeur utile de page (EMU)."""
+    return _merge(_compile_blocks(blocks, Emu(block_width)))
+
+
+def render_program(program, ctx) -> str:
+    """XML d'un programme pour les valeurs d'une génération."""
+    return _render(program, ctx)
+
+
+def add_layout(doc, data, xml: str, pictures):
+    """Ajoute au corps de doc le XML d'une page de garde, puis ses images [(champ, hauteur)]."""
+    builder = BodyBuilder(doc)
+    builder.add_xml(xml)
+    elements = builder.flush()
+
+    # Images ajoutées une fois le fragment dans le document, dans l'ordre,
+    # pour que les identifiants de dessin se suivent
+    drawings = [drawing for element in elements for drawing in element.iter(qn('w:drawing'))]
+    for drawing, (field, height) in zip(drawings, pictures):
+        _add_picture(doc, drawing, getattr(data.logos, field), height)
+
+
+def _add_picture(doc, drawing, source, height):
+    run = drawing.getparent()
+    try:
+        image = decode_base64_image(source, height)
+    except Exception:
+        # Image indécodable : pas de run, comme avant
+        run.getparent().remove(run)
+        return
+    try:
+        drawing.append(doc.part.new_pic_inline(image, None, height))
+    except Exception:
+        # Format non reconnu par python-docx : run vide
+        run.remove(drawing)
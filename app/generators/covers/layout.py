@@ -0,0 +1,325 @@
+"""
+Mises en page déclaratives des pages de garde.
+
+Un modèle est décrit par des données (tableaux, paragraphes, runs, blocs
+conditionnels) puis compilé, une fois par largeur de page, en segments de
+XML WordprocessingML (voir compiler.py) : les parties fixes sont sérialisées
+à la compilation et seuls les champs du rapport (étudiant, entreprise,
+dates, couleur principale) sont substitués à chaque génération. Le XML
+produit est celui des appels python-docx équivalents (add_table,
+add_paragraph, add_run...).
+
+Ce module n'importe pas python-docx : le plan d'un rapport (plan_report)
+compte les éléments d'une page de garde sans la compiler.
+"""
+import re
+import threading
+
+from app.models.schemas import LogosConfig, ReportData
+
+from ..assets import has_image
+
+# Couleur des titres de niveau 1 (data.style.title1_color)
+PRIMARY = 'primary'
+
+# Champs d'image (conditions et images)
+IMAGE_FIELDS = tuple(LogosConfig.model_fields)
+
+# Valeurs fournies par le générateur en plus des champs de ReportData
+CONTEXT_FIELDS = ('date_debut_fr', 'date_fin_fr', 'duree', 'jour_debut', 'jour_fin')
+
+# Champ d'un texte : {nom} ou {nom|valeur si vide}
+_FIELD = re.compile(r'\{(\w+)(?:\|([^}]*))?\}')
+
+_ALIGNMENTS = ('left', 'center', 'right')
+_SPACING = {'before': 'w:before', 'after': 'w:after'}
+_INDENT = {'first_line': 'w:firstLine', 'left': 'w:left'}
+
+# EMU par centimètre (comme docx.shared.Cm)
+_EMUS_PER_CM = 360000
+
+
+# --- Vocabulaire des mises en page -----------------------------------------
+
+class Run:
+    """Texte mis en forme ; text peut contenir des champs {nom} ou {nom|défaut}."""
+
+    def __init__(self, text: str, size=None, bold=False, italic=False,
+                 small_caps=False, color=None):
+        self.text = text
+        self.size = size
+        self.bold = bold
+        self.italic = italic
+        self.small_caps = small_caps
+        self.color = color
+
+
+class Picture:
+    """Image d'un champ de LogosConfig, de hauteur donnée (cm)."""
+
+    def __init__(self, field: str, height: float):
+        if field not in IMAGE_FIELDS:
+            raise ValueError(f"Champ d'image inconnu : {field}")
+        self.field = field
+        self.height = height
+
+
+class Para:
+    """Paragraphe : runs, images et mise en forme (espacements en pt, retraits en cm).
+
+    Les attributs de w:spacing et w:ind sont écrits dans l'ordre des
+    arguments, comme python-docx les écrit dans l'ordre des affectations.
+    """
+
+    def __init__(self, *content, align=None, **format):
+        unknown = set(format) - set(_SPACING) - set(_INDENT)
+        if unknown or align not in (None,) + _ALIGNMENTS:
+            raise ValueError(f"Mise en forme de paragraphe inconnue : {sorted(unknown) or align}")
+        self.content = content
+        self.align = align
+        self.format = format
+
+
+class Borders:
+    """Bordures d'un tableau (un élément w:tblBorders) : (côté, couleur, épaisseur).
+
+    Une couleur None désactive le côté (w:val="nil").
+    """
+
+    def __init__(self, *sides):
+        self.sides = sides
+
+
+class Cell:
+    """Cellule de tableau : blocs (paragraphes, tableaux imbriqués) et fond."""
+
+    def __init__(self, *blocks, fill=None):
+        self.blocks = blocks
+        self.fill = fill
+
+
+class Table:
+    """Tableau à largeurs de colonnes fixes (cm) ; chaque ligne est un tuple de Cell."""
+
+    def __init__(self, widths, *rows, align=None, borders=()):
+        if align not in (None,) + _ALIGNMENTS:
+            raise ValueError(f"Alignement de tableau inconnu : {align}")
+        if isinstance(borders, Borders):
+            borders = (borders,)
+        self.widths = widths
+        self.rows = rows
+        self.align = align
+        self.borders = borders
+
+
+class When:
+    """Contenu affiché si au moins un des champs est renseigné (otherwise sinon).
+
+    Pour un champ d'image, « renseigné » signifie contenir une image exploitable.
+    """
+
+    def __init__(self, fields, *then, otherwise=()):
+        if isinstance(fields, str):
+            fields = (fields,)
+        if not isinstance(otherwise, tuple):
+            otherwise = (otherwise,)
+        self.fields = fields
+        self.then = then
+        self.otherwise = otherwise
+
+
+NO_BORDERS = Borders(*((side, None, None) for side in
+                       ('top', 'left', 'bottom', 'right', 'insideH', 'insideV')))
+
+
+def frame(color: str, size: str = '6') -> Borders:
+    """Cadre coloré sans bordures intérieures."""
+    return Borders(*((side, color, size) for side in ('top', 'left', 'bottom', 'right')),
+                   ('insideH', None, None), ('insideV', None, None))
+
+
+def top_border(color: str, size: str = '6') -> Borders:
+    """Bordure supérieure seule."""
+    return Borders(('top', color, size))
+
+
+def Centered(after, *content):
+    """Paragraphe centré sans retrait ni espacement avant."""
+    return Para(*content, align='center', first_line=0, left=0, after=after, before=0)
+
+
+def CellPara(after, *content, align=None):
+    """Paragraphe de cellule sans retrait."""
+    return Para(*content, align=align, first_line=0, left=0, after=after)
+
+
+def Logo(field: str, height: float, align=None, **format):
+    """Paragraphe d'image sans retrait, présent seulement si le champ contient une image."""
+    return When(field, Para(Picture(field, height), align=align, first_line=0, **format))
+
+
+# --- Données d'une génération -----------------------------------------------
+
+class _Context:
+    """Valeurs d'une génération : données, dates et images à insérer."""
+
+    def __init__(self, data, values):
+        self.data = data
+        self.values = values
+        self.pictures = []
+
+    def value(self, name):
+        if name in self.values:
+            return self.values[name]
+        return getattr(self.data, name)
+
+    def test(self, name) -> bool:
+        if name in IMAGE_FIELDS:
+            return has_image(getattr(self.data.logos, name))
+        return bool(self.value(name))
+
+
+def _expand(nodes, ctx):
+    """Nœuds effectivement rendus pour ctx (blocs conditionnels résolus)."""
+    for node in nodes:
+        if isinstance(node, When):
+            chosen = node.then if any(ctx.test(name) for name in node.fields) else node.otherwise
+            yield from _expand(chosen, ctx)
+        else:
+            yield node
+
+
+def _count(nodes, ctx, counts: list, nested: bool = False):
+    """Ajoute à counts [paragraphes, tableaux, images] ce que produisent les blocs."""
+    for node in _expand(nodes, ctx):
+        if isinstance(node, Para):
+            counts[0] += 1
+            counts[2] += sum(1 for item in _expand(node.content, ctx) if isinstance(item, Picture))
+        elif isinstance(node, Table):
+            counts[1] += 1
+            # Paragraphe vide après un tableau imbriqué
+            counts[0] += nested
+            for row in node.rows:
+                for cell in row:
+                    blocks = list(_expand(cell.blocks, ctx))
+                    # Paragraphe vide en tête d'une cellule qui n'en commence pas par un
+                    counts[0] += not blocks or not isinstance(blocks[0], Para)
+                    _count(blocks, ctx, counts, nested=True)
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        if isinstance(node, Para):
+            yield from _walk(node.content)
+        elif isinstance(node, Cell):
+            yield from _walk(node.blocks)
+        elif isinstance(node, Table):
+            for row in node.rows:
+                yield from _walk(row)
+        elif isinstance(node, When):
+            yield from _walk(node.then + node.otherwise)
+
+
+def _layout_fields(blocks) -> tuple:
+    """Champs de data lus par une mise en page (ex. ('style', 'title1_color'))."""
+    names = set()
+    primary = False
+    for node in _walk(blocks):
+        if isinstance(node, Run):
+            names.update(match.group(1) for match in _FIELD.finditer(node.text))
+            primary = primary or node.color == PRIMARY
+        elif isinstance(node, Picture):
+            names.add(node.field)
+        elif isinstance(node, When):
+            names.update(node.fields)
+        elif isinstance(node, Cell):
+            primary = primary or node.fill == PRIMARY
+        elif isinstance(node, Table):
+            primary = primary or any(color == PRIMARY for borders in node.borders
+                                     for _, color, _ in borders.sides)
+
+    fields = set()
+    for name in names - set(CONTEXT_FIELDS):
+        if name in IMAGE_FIELDS:
+            fields.add(('logos', name))
+        elif name in ReportData.model_fields:
+            fields.add((name,))
+        else:
+            raise ValueError(f"Champ inconnu dans une page de garde : {name}")
+    if primary:
+        fields.add(('style', 'title1_color'))
+    return tuple(sorted(fields))
+
+
+class CoverLayout:
+    """Page de garde décrite par des données, compilée une fois par largeur de page.
+
+    S'utilise comme un générateur : layout(doc, data, date_debut_fr, date_fin_fr, duree).
+    """
+
+    def __init__(self, description: str, *blocks):
+        self.__doc__ = description
+        self.blocks = blocks
+        self.fields = _layout_fields(blocks)
+        # Images que la page peut afficher [(champ, hauteur)]
+        self.pictures = tuple(dict.fromkeys(
+            (node.field, int(node.height * _EMUS_PER_CM)) for node in _walk(blocks)
+            if isinstance(node, Picture)))
+        self._programs = {}
+        self._lock = threading.Lock()
+
+    def compile(self, block_width: int) -> list:
+        """Segments XML pour une largeur utile de page (EMU)."""
+        program = self._programs.get(block_width)
+        if program is None:
+            with self._lock:
+                program = self._programs.get(block_width)
+                if program is None:
+                    from .compiler import compile_blocks
+                    program = compile_blocks(self.blocks, block_width)
+                    self._programs[block_width] = program
+        return program
+
+    def images(self, data) -> list:
+        """Images présentes dans data [(source, hauteur)], pour les préparer à l'avance."""
+        images = []
+        for field, height in self.pictures:
+            source = getattr(data.logos, field)
+            if has_image(source):
+                images.append((source, height))
+        return images
+
+    def count(self, data) -> tuple:
+        """(paragraphes, tableaux, images) de la page pour data, sans la rendre."""
+        # Les valeurs calculées (dates, durée) ne sont jamais vides
+        ctx = _Context(data, {name: name for name in CONTEXT_FIELDS})
+        counts = [0, 0, 0]
+        _count(self.blocks, ctx, counts)
+        return tuple(counts)
+
+    def render(self, data, date_debut_fr: str, date_fin_fr: str, duree: str,
+               block_width: int):
+        """XML des éléments du corps et images à insérer [(champ, hauteur)], dans l'ordre."""
+        from .compiler import render_program
+
+        ctx = _Context(data, {
+            'date_debut_fr': date_debut_fr,
+            'date_fin_fr': date_fin_fr,
+            'duree': duree,
+            'jour_debut': date_debut_fr.split()[0] if date_debut_fr else "",
+            'jour_fin': date_fin_fr.split()[0] if date_fin_fr else "",
+        })
+        return render_program(self.compile(block_width), ctx), ctx.pictures
+
+    def __call__(self, doc, data, date_debut_fr: str, date_fin_fr: str, duree: str):
+        from .compiler import add_layout
+
+        xml, pictures = self.render(data, date_debut_fr, date_fin_fr, duree, doc._block_width)
+        add_layout(doc, data, xml, pictures)
+
+
+def compile_layouts(layouts, block_width: int):
+    """Compile à l'avance les mises en page pour une largeur de page."""
+    for layout in layouts:
+        layout.compile(block_width)
@@ -0,0 +1,4 @@
+"""
+Mises en page des pages de garde : un module par modèle, importé au premier
+usage par COVER_GENERATORS (voir covers.py).
+"""
@@ -0,0 +1,68 @@
+"""
+Page de garde style académique - Cadre double traditionnel.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    CellPara,
+    Logo,
+    frame,
+)
+from .common import (
+    LOGOS,
+    TITLE,
+    STUDENT,
+    SUJET,
+    PERIOD,
+)
+
+
+generate_cover_academique = CoverLayout(
+    "Page de garde style académique - Cadre double traditionnel.",
+    # Cadre extérieur
+    Table(
+        (16,),
+        (Cell(
+            Para(),
+            CellPara(4),
+            # Cadre intérieur
+            Table(
+                (15,),
+                (Cell(
+                    Para(first_line=0),
+                    When(LOGOS, Table(
+                        (7, 7),
+                        (Cell(Logo('logo_ecole', 1.8, align='center')),
+                         Cell(Logo('logo_entreprise', 1.8, align='center'))),
+                        borders=NO_BORDERS,
+                    )),
+                    CellPara(10),
+                    CellPara(6, Run("{ecole|[Établissement]}", 14, bold=True, color=PRIMARY), align='center'),
+                    CellPara(15, Run("{formation|[Formation]}", 12), align='center'),
+                    CellPara(6, TITLE, align='center'),
+                    When('sujet_stage', CellPara(12, SUJET, align='center')),
+                    When('image_centrale', CellPara(15, Picture('image_centrale', 3), align='center')),
+                    CellPara(10),
+                    CellPara(4, Run("Présenté par", 10), align='center'),
+                    CellPara(8, STUDENT, align='center'),
+                    CellPara(4, Run("Stage effectué chez {entreprise_nom|[Entreprise]}", 12), align='center'),
+                    CellPara(15, Run(PERIOD, 11), align='center'),
+                    CellPara(4, Run("Tuteur entreprise : {tuteur_nom|[Nom]}", 10), align='center'),
+                    When('tuteur_academique_nom',
+                         CellPara(4, Run("Tuteur académique : {tuteur_academique_nom}", 10), align='center')),
+                    CellPara(10),
+                    CellPara(6, Run("{annee_scolaire|[Année scolaire]}", 12, color=PRIMARY), align='center'),
+                ),),
+                align='center', borders=frame(PRIMARY, '12'),
+            ),
+        ),),
+        align='center', borders=frame(PRIMARY, '24'),
+    ),
+)
@@ -0,0 +1,61 @@
+"""
+Page de garde style bicolore - Division verticale.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    CellPara,
+)
+from .common import (
+    WHITE,
+    GREY,
+    LIGHT_GREY,
+    STUDENT,
+    SUJET,
+)
+
+
+generate_cover_bicolore = CoverLayout(
+    "Page de garde style bicolore - Division verticale.",
+    Table(
+        (6.4, 9.6),
+        (
+            Cell(
+                Para(first_line=0),
+                When('logo_ecole', CellPara(15),
+                     CellPara(15, Picture('logo_ecole', 2), align='center')),
+                *[CellPara(20)] * 3,
+                CellPara(30, Run("STAGE", 24, bold=True, color=WHITE), align='center'),
+                CellPara(10, Run("{annee_scolaire|[Année]}", 12, color=LIGHT_GREY), align='center'),
+                CellPara(30, Run("{date_debut_fr}\n—\n{date_fin_fr}", 10, color=LIGHT_GREY), align='center'),
+                When('logo_entreprise', *[CellPara(20)] * 2,
+                     CellPara(10, Picture('logo_entreprise', 1.5), align='center')),
+                fill=PRIMARY,
+            ),
+            # Colonne droite
+            Cell(
+                Para(first_line=0),
+                CellPara(30),
+                CellPara(6, Run("RAPPORT\nDE STAGE", 28, bold=True, color=PRIMARY)),
+                When('sujet_stage', CellPara(12), CellPara(12, SUJET)),
+                When('image_centrale', CellPara(8), CellPara(12, Picture('image_centrale', 2.5))),
+                CellPara(25),
+                CellPara(4, STUDENT),
+                CellPara(4, Run("{formation|[Formation]}", 12)),
+                CellPara(20, Run("{ecole|[Établissement]}", 11, color=GREY)),
+                CellPara(4, Run("{entreprise_nom|[Entreprise]}", 14, bold=True, color=PRIMARY)),
+                When('entreprise_ville', CellPara(15, Run("{entreprise_ville}", 11))),
+                CellPara(20),
+                CellPara(4, Run("Tuteur : {tuteur_nom|[Nom]}", 10, color=GREY)),
+            ),
+        ),
+        align='center', borders=NO_BORDERS,
+    ),
+)
@@ -0,0 +1,48 @@
+"""
+Page de garde style classique - NORMES OFFICIELLES.
+"""
+from ..layout import (
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Cell,
+    Table,
+    When,
+    Centered,
+    Logo,
+)
+from .common import (
+    LOGOS,
+    TITLE,
+    STUDENT,
+    SUJET,
+    PERIOD,
+    TUTORS,
+)
+
+
+generate_cover_classique = CoverLayout(
+    "Page de garde style classique - NORMES OFFICIELLES.",
+    # Logos en haut
+    When(LOGOS, Table(
+        (5, 6, 5),
+        (Cell(Logo('logo_ecole', 2, align='center')), Cell(),
+         Cell(Logo('logo_entreprise', 2, align='center'))),
+        align='center', borders=NO_BORDERS,
+    )),
+    Centered(25),
+    Centered(6, TITLE),
+    When('sujet_stage', Centered(15, SUJET)),
+    When('image_centrale', Centered(12, Picture('image_centrale', 3))),
+    # Étudiant
+    Centered(18),
+    Centered(4, STUDENT),
+    Centered(4, Run("{formation|[Formation]}", 12)),
+    Centered(20, Run("{ecole|[Établissement]} — {annee_scolaire|[Année]}", 12)),
+    # Entreprise
+    Centered(4, Run("Stage réalisé chez {entreprise_nom|[Entreprise]}", 14)),
+    When('entreprise_ville', Centered(6, Run("{entreprise_ville}", 12))),
+    Centered(15, Run(PERIOD, 12)),
+    TUTORS,
+)
@@ -0,0 +1,36 @@
+"""
+Éléments partagés par les mises en page des pages de garde.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    Run,
+    Para,
+    Cell,
+    Table,
+)
+
+WHITE = 'FFFFFF'
+GREY = '646464'
+LIGHT_GREY = 'C8C8C8'
+GOLD = 'B8860B'
+
+# Au moins un des deux logos
+LOGOS = ('logo_ecole', 'logo_entreprise')
+
+TITLE = Run("RAPPORT DE STAGE", 28, bold=True, color=PRIMARY)
+STUDENT = Run("{prenom|[Prénom]} {nom|[NOM]}", 16, bold=True)
+SUJET = Run("{sujet_stage}", 14, italic=True)
+PERIOD = "Du {date_debut_fr} au {date_fin_fr}"
+
+# Tuteurs côte à côte (classique, moderne)
+TUTORS = Table(
+    (7, 7),
+    (
+        Cell(Para(Run("Tuteur entreprise\n", 10), Run("{tuteur_nom|[Nom]}", 12, bold=True),
+                  align='center', first_line=0)),
+        Cell(Para(Run("Tuteur académique\n", 10), Run("{tuteur_academique_nom|[Nom]}", 12, bold=True),
+                  align='center', first_line=0)),
+    ),
+    align='center', borders=NO_BORDERS,
+)
@@ -0,0 +1,47 @@
+"""
+Page de garde style creative - Design original avec cercles.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Cell,
+    Table,
+    When,
+    Centered,
+    Logo,
+)
+from .common import (
+    GREY,
+    LIGHT_GREY,
+    LOGOS,
+    STUDENT,
+)
+
+
+generate_cover_creative = CoverLayout(
+    "Page de garde style creative - Design original avec cercles.",
+    When(LOGOS, Table(
+        (8, 8),
+        (Cell(Logo('logo_ecole', 1.8, align='left')),
+         Cell(Logo('logo_entreprise', 1.8, align='right'))),
+        align='center', borders=NO_BORDERS,
+    )),
+    Centered(30),
+    Centered(0, Run("RAPPORT", 32, bold=True, color=PRIMARY)),
+    Centered(8, Run("DE STAGE", 16, color='969696')),
+    Centered(15, Run("━━━━━━━━━━━━━━━━", 10, color=PRIMARY)),
+    When('sujet_stage', Centered(15, Run("« {sujet_stage} »", 13, italic=True))),
+    When('image_centrale', Centered(15, Picture('image_centrale', 3))),
+    Centered(20),
+    Centered(4, STUDENT),
+    Centered(4, Run("{formation|[Formation]}", 11, color=GREY)),
+    Centered(15, Run("{ecole|[Établissement]}  |  {annee_scolaire|[Année]}", 10)),
+    Centered(10, Run("─────────────", color=LIGHT_GREY)),
+    Centered(4, Run("{entreprise_nom|[Entreprise]}", 13, bold=True, color=PRIMARY)),
+    When('entreprise_ville', Centered(4, Run("{entreprise_ville}", 10))),
+    Centered(8, Run("{date_debut_fr}  —  {date_fin_fr}", 10, color=GREY)),
+    Centered(4, Run("Encadré par {tuteur_nom|[Nom]}", 10, color='787878')),
+)
@@ -0,0 +1,59 @@
+"""
+Page de garde style élégant avec ligne verticale.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    CellPara,
+    Logo,
+)
+from .common import (
+    LOGOS,
+    TITLE,
+    STUDENT,
+    SUJET,
+    PERIOD,
+)
+
+
+generate_cover_elegant = CoverLayout(
+    "Page de garde style élégant avec ligne verticale.",
+    # Ligne verticale + contenu
+    Table(
+        (0.5, 15.5),
+        (
+            Cell(fill=PRIMARY),
+            Cell(
+                Para(first_line=0),
+                When(LOGOS, Table(
+                    (7, 7),
+                    (Cell(Logo('logo_ecole', 2, align='left')),
+                     Cell(Logo('logo_entreprise', 2, align='right'))),
+                    borders=NO_BORDERS,
+                )),
+                CellPara(25),
+                CellPara(4, TITLE),
+                When('sujet_stage', CellPara(12, SUJET)),
+                When('image_centrale', CellPara(12, Picture('image_centrale', 3))),
+                CellPara(18),
+                CellPara(4, STUDENT),
+                CellPara(4, Run("{formation|[Formation]}", 12)),
+                CellPara(15, Run("{ecole|[Établissement]}  |  {annee_scolaire|[Année]}", 12)),
+                CellPara(4, Run("{entreprise_nom|[Entreprise]}", 14, bold=True, color=PRIMARY)),
+                When('entreprise_ville', CellPara(6, Run("{entreprise_ville}", 12))),
+                CellPara(15, Run(PERIOD, 12)),
+                CellPara(4, Run("Tuteur entreprise : {tuteur_nom|[Nom]}", 12)),
+                When('tuteur_academique_nom',
+                     CellPara(0, Run("Tuteur académique : {tuteur_academique_nom}", 12))),
+            ),
+        ),
+        align='center', borders=NO_BORDERS,
+    ),
+)
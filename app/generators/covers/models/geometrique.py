@@ -0,0 +1,65 @@
+"""
+Page de garde style géométrique - Formes modernes.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    Centered,
+    CellPara,
+    Logo,
+)
+from .common import (
+    WHITE,
+    GREY,
+    TITLE,
+    STUDENT,
+    SUJET,
+    PERIOD,
+)
+
+
+generate_cover_geometrique = CoverLayout(
+    "Page de garde style géométrique - Formes modernes.",
+    # Bloc coloré en haut à droite
+    Table(
+        (10, 6),
+        (
+            Cell(Logo('logo_ecole', 2, align='left')),
+            Cell(Para(Run("{annee_scolaire|[Année]}", 14, bold=True, color=WHITE),
+                      align='center', first_line=0, before=15, after=15),
+                 fill=PRIMARY),
+        ),
+        align='center', borders=NO_BORDERS,
+    ),
+    Centered(20),
+    Para(TITLE, first_line=0, after=6),
+    When('sujet_stage', Para(SUJET, first_line=0, after=15)),
+    # Ligne décorative
+    Table((5,), (Cell(Para(), CellPara(0), fill=PRIMARY),), borders=NO_BORDERS),
+    When('image_centrale', Centered(15), Centered(15, Picture('image_centrale', 3))),
+    Centered(20),
+    Para(STUDENT, first_line=0, after=4),
+    Para(Run("{formation|[Formation]}", 12), first_line=0, after=4),
+    Para(Run("{ecole|[Établissement]}", 12, color=GREY), first_line=0, after=20),
+    # Bloc infos en bas
+    Table(
+        (8, 8),
+        (
+            Cell(Para(Run("Entreprise : ", 10, color=GREY),
+                      Run("{entreprise_nom|[Entreprise]}", 11, bold=True), first_line=0)),
+            Cell(Para(Run(PERIOD, 10), first_line=0)),
+        ),
+        (
+            Cell(Para(Run("Tuteur : {tuteur_nom|[Nom]}", 10), first_line=0)),
+            Cell(Logo('logo_entreprise', 1.5, align='right')),
+        ),
+        align='left', borders=NO_BORDERS,
+    ),
+)
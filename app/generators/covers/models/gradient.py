@@ -0,0 +1,57 @@
+"""
+Page de garde style gradient - Dégradé coloré moderne.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    Centered,
+    CellPara,
+    Logo,
+)
+from .common import (
+    WHITE,
+    GREY,
+    LOGOS,
+    STUDENT,
+    PERIOD,
+)
+
+
+generate_cover_gradient = CoverLayout(
+    "Page de garde style gradient - Dégradé coloré moderne.",
+    # Bandeau dégradé en haut
+    Table(
+        (16,),
+        (Cell(
+            Para(Run("RAPPORT DE STAGE", 28, bold=True, color=WHITE),
+                 align='center', first_line=0, before=20, after=8),
+            When('sujet_stage', CellPara(15, Run("{sujet_stage}", 13, italic=True, color=WHITE),
+                                         align='center')),
+            fill=PRIMARY,
+        ),),
+        align='center', borders=NO_BORDERS,
+    ),
+    # Logos
+    Centered(15),
+    When(LOGOS, Table(
+        (7, 7),
+        (Cell(Logo('logo_ecole', 1.8, align='center')),
+         Cell(Logo('logo_entreprise', 1.8, align='center'))),
+        align='center', borders=NO_BORDERS,
+    )),
+    When('image_centrale', Centered(10, Picture('image_centrale', 3))),
+    Centered(20),
+    Centered(4, STUDENT),
+    Centered(4, Run("{formation|[Formation]}", 12)),
+    Centered(15, Run("{ecole|[Établissement]}  •  {annee_scolaire|[Année]}", 11, color=GREY)),
+    Centered(4, Run("{entreprise_nom|[Entreprise]}", 13, bold=True, color=PRIMARY)),
+    Centered(10, Run(PERIOD, 11)),
+    Centered(4, Run("Tuteur : {tuteur_nom|[Nom]}", 10, color=GREY)),
+)
@@ -0,0 +1,66 @@
+"""
+Page de garde style luxe - Élégant avec bordures dorées.
+"""
+from ..layout import (
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    CellPara,
+    Logo,
+    frame,
+)
+from .common import (
+    GREY,
+    GOLD,
+    LOGOS,
+    STUDENT,
+)
+
+
+generate_cover_luxe = CoverLayout(
+    "Page de garde style luxe - Élégant avec bordures dorées.",
+    # Cadre extérieur doré
+    Table(
+        (16,),
+        (Cell(
+            Para(),
+            CellPara(6),
+            Table(
+                (15,),
+                (Cell(
+                    Para(first_line=0),
+                    When(LOGOS, CellPara(6), Table(
+                        (7, 7),
+                        (Cell(Logo('logo_ecole', 1.5, align='center')),
+                         Cell(Logo('logo_entreprise', 1.5, align='center'))),
+                        borders=NO_BORDERS,
+                    )),
+                    CellPara(10),
+                    CellPara(4, Run("{ecole|[Établissement]}", 11, small_caps=True, color=GOLD), align='center'),
+                    CellPara(6, Run("— ✦ —", 10, color=GOLD), align='center'),
+                    CellPara(6, Run("RAPPORT DE STAGE", 26, bold=True, color='323232'), align='center'),
+                    When('sujet_stage', CellPara(8, Run("{sujet_stage}", 13, italic=True, color='505050'),
+                                                 align='center')),
+                    When('image_centrale', CellPara(10, Picture('image_centrale', 2.5), align='center')),
+                    CellPara(10),
+                    CellPara(8, Run("───────────────────", 10, color=GOLD), align='center'),
+                    CellPara(6, STUDENT, align='center'),
+                    CellPara(2, Run("{formation|[Formation]}", 11, italic=True), align='center'),
+                    CellPara(10),
+                    CellPara(2, Run("{entreprise_nom|[Entreprise]}", 13, color=GOLD), align='center'),
+                    CellPara(4, Run("{date_debut_fr}  —  {date_fin_fr}", 10, color=GREY), align='center'),
+                    CellPara(8),
+                    CellPara(6, Run("{annee_scolaire|[Année scolaire]}", 10, small_caps=True, color=GOLD),
+                             align='center'),
+                ),),
+                align='center', borders=frame('b8860b', '18'),
+            ),
+        ),),
+        align='center', borders=frame('b8860b', '36'),
+    ),
+)
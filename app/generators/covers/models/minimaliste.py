@@ -0,0 +1,33 @@
+"""
+Page de garde style minimaliste - Ultra épuré.
+"""
+from ..layout import (
+    PRIMARY,
+    CoverLayout,
+    Run,
+    Picture,
+    When,
+    Centered,
+)
+from .common import (
+    GREY,
+    TITLE,
+    STUDENT,
+    SUJET,
+)
+
+
+generate_cover_minimaliste = CoverLayout(
+    "Page de garde style minimaliste - Ultra épuré.",
+    *[Centered(18)] * 5,
+    Centered(6, TITLE),
+    Centered(15, Run("─────────────", 12, color=PRIMARY)),
+    When('sujet_stage', Centered(25, SUJET)),
+    When('image_centrale', Centered(15, Picture('image_centrale', 2.5))),
+    Centered(25),
+    Centered(4, STUDENT),
+    Centered(15, Run("{formation|[Formation]}", 11)),
+    Centered(30),
+    Centered(4, Run("{entreprise_nom|[Entreprise]}", 12, color=GREY)),
+    Centered(4, Run("{date_debut_fr} — {date_fin_fr}", 11, color='808080')),
+)
@@ -0,0 +1,59 @@
+"""
+Page de garde style moderne avec bandeau coloré.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    Centered,
+    CellPara,
+    Logo,
+)
+from .common import (
+    WHITE,
+    LOGOS,
+    STUDENT,
+    PERIOD,
+    TUTORS,
+)
+
+
+generate_cover_moderne = CoverLayout(
+    "Page de garde style moderne avec bandeau coloré.",
+    # Bandeau supérieur coloré
+    Table(
+        (16,),
+        (Cell(
+            Para(Run("RAPPORT DE STAGE", 28, bold=True, color=WHITE),
+                 align='center', first_line=0, before=18, after=6),
+            When('sujet_stage', CellPara(12, Run("{sujet_stage}", 14, italic=True, color=WHITE),
+                                         align='center')),
+            fill=PRIMARY,
+        ),),
+        align='center', borders=NO_BORDERS,
+    ),
+    Centered(15),
+    When(LOGOS, Table(
+        (7, 7),
+        (Cell(Logo('logo_ecole', 2, align='center')),
+         Cell(Logo('logo_entreprise', 2, align='center'))),
+        align='center', borders=NO_BORDERS,
+    )),
+    When('image_centrale', Centered(12, Picture('image_centrale', 3))),
+    # Étudiant
+    Centered(18),
+    Centered(4, STUDENT),
+    Centered(4, Run("{formation|[Formation]}", 12)),
+    Centered(15, Run("{ecole|[Établissement]}  •  {annee_scolaire|[Année]}", 12)),
+    # Entreprise
+    Centered(4, Run("{entreprise_nom|[Entreprise]}", 14, bold=True, color=PRIMARY)),
+    When('entreprise_ville', Centered(6, Run("{entreprise_ville}", 12))),
+    Centered(15, Run(PERIOD, 12)),
+    TUTORS,
+)
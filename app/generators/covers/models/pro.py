@@ -0,0 +1,77 @@
+"""
+Page de garde style Pro - Corporate business.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    Centered,
+    Logo,
+    top_border,
+)
+from .common import (
+    WHITE,
+    GREY,
+    TITLE,
+    STUDENT,
+    SUJET,
+)
+
+
+generate_cover_pro = CoverLayout(
+    "Page de garde style Pro - Corporate business.",
+    # Header bar
+    Table(
+        (5, 6, 5),
+        (
+            Cell(When('logo_ecole',
+                      Para(Picture('logo_ecole', 1.5), align='left', first_line=0, before=10, after=10),
+                      otherwise=Para(before=15, after=15)),
+                 fill=PRIMARY),
+            Cell(Para(Run("{annee_scolaire|[Année]}", 11, color=WHITE),
+                      align='center', first_line=0, before=15, after=15),
+                 fill=PRIMARY),
+            Cell(Logo('logo_entreprise', 1.5, align='right', before=10, after=10), fill=PRIMARY),
+        ),
+        align='center', borders=NO_BORDERS,
+    ),
+    Centered(30),
+    Centered(6, TITLE),
+    When('sujet_stage', Centered(15, SUJET)),
+    When('image_centrale', Centered(15, Picture('image_centrale', 3))),
+    Centered(25),
+    Centered(4, STUDENT),
+    Centered(4, Run("{formation|[Formation]}  •  {ecole|[Établissement]}", 12)),
+    Centered(30),
+    # Info table
+    Table(
+        (4, 8),
+        (Cell(Para(Run("Entreprise", 10, color=GREY), first_line=0)),
+         Cell(Para(Run("{entreprise_nom|[Entreprise]}", 12, bold=True), first_line=0))),
+        (Cell(Para(Run("Période", 10, color=GREY), first_line=0)),
+         Cell(Para(Run("{date_debut_fr} — {date_fin_fr}", 11), first_line=0))),
+        (Cell(Para(Run("Tuteur", 10, color=GREY), first_line=0)),
+         Cell(Para(Run("{tuteur_nom|[Nom]}", 11), first_line=0))),
+        (Cell(When('tuteur_academique_nom', Para(Run("Suivi", 10, color=GREY), first_line=0))),
+         Cell(When('tuteur_academique_nom', Para(Run("{tuteur_academique_nom}", 11), first_line=0)))),
+        align='center', borders=NO_BORDERS,
+    ),
+    # Footer bar
+    Centered(30),
+    Table(
+        (16,),
+        (Cell(Para(
+            When('entreprise_ville',
+                 Run("{entreprise_nom} — {entreprise_ville}", 10, color=GREY),
+                 otherwise=Run("{entreprise_nom}", 10, color=GREY)),
+            align='center', first_line=0, before=10,
+        )),),
+        align='center', borders=(top_border(PRIMARY, '18'), NO_BORDERS),
+    ),
+)
@@ -0,0 +1,63 @@
+"""
+Page de garde style timeline - Frise chronologique verticale.
+"""
+from ..layout import (
+    PRIMARY,
+    NO_BORDERS,
+    CoverLayout,
+    Run,
+    Picture,
+    Para,
+    Cell,
+    Table,
+    When,
+    CellPara,
+    Logo,
+)
+from .common import (
+    GREY,
+    LOGOS,
+    STUDENT,
+)
+
+
+generate_cover_timeline = CoverLayout(
+    "Page de garde style timeline - Frise chronologique verticale.",
+    Table(
+        (2, 14),
+        (
+            # Frise
+            Cell(
+                Para(first_line=0),
+                CellPara(4, Run("●", 14, color=PRIMARY), align='center'),
+                CellPara(20, Run("{jour_debut}", 8, color=GREY), align='center'),
+                *[CellPara(0, Run("│", 10, color=PRIMARY), align='center')] * 6,
+                CellPara(20),
+                CellPara(4, Run("●", 14, color=PRIMARY), align='center'),
+                CellPara(0, Run("{jour_fin}", 8, color=GREY), align='center'),
+            ),
+            # Contenu
+            Cell(
+                Para(first_line=0),
+                When(LOGOS, Table(
+                    (6, 6),
+                    (Cell(Logo('logo_ecole', 1.5)),
+                     Cell(Logo('logo_entreprise', 1.5, align='right'))),
+                    borders=NO_BORDERS,
+                )),
+                CellPara(15),
+                CellPara(4, Run("RAPPORT DE STAGE", 26, bold=True, color=PRIMARY)),
+                When('sujet_stage', CellPara(10, Run("{sujet_stage}", 13, italic=True))),
+                When('image_centrale', CellPara(10, Picture('image_centrale', 2.5))),
+                CellPara(15),
+                CellPara(4, STUDENT),
+                CellPara(4, Run("{formation|[Formation]}", 11)),
+                CellPara(10, Run("{ecole|[Établissement]}", 10, color=GREY)),
+                CellPara(4, Run("{entreprise_nom|[Entreprise]}", 13, bold=True, color=PRIMARY)),
+                CellPara(10),
+                CellPara(0, Run("Tuteur : {tuteur_nom|[Nom]}", 10, color=GREY)),
+            ),
+        ),
+        align='center', borders=NO_BORDERS,
+    ),
+)
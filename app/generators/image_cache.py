@@ -0,0 +1,23 @@
+"""
+Cache des images normalisées (JPEG ou PNG prêts pour python-docx), par empreinte du contenu.
+
+Un même logo est décodé pour la page de garde puis pour l'en-tête, et de
+nouveau à chaque rapport du même utilisateur : la conversion Pillow n'est
+faite qu'une fois tant que l'image reste dans le budget.
+"""
+import os
+
+from .lru import ByteBudgetCache
+
+# Budget mémoire des images conservées (octets, par processus)
+IMAGE_CACHE_BYTES = int(os.environ.get('REPORT_IMAGE_CACHE_BYTES', str(64 * 1024 * 1024)))
+
+
+class ImageCache(ByteBudgetCache):
+    """Cache LRU d'images normalisées (octets), indexé par empreinte."""
+
+    def __init__(self, max_bytes: int = IMAGE_CACHE_BYTES):
+        super().__init__(max_bytes)
+
+
+image_cache = ImageCache()
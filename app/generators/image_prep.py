@@ -0,0 +1,142 @@
+"""
+Préparation des images d'un rapport en parallèle de la construction du document.
+
+generate_report soumet dès le début les images dont il aura besoin (logos de
+l'en-tête, images de la page de garde) à un pool de threads : le décodage et
+l'encodage Pillow/zlib libèrent le GIL et se recouvrent avec la création du
+document et des sections. decode_base64_image reprend ensuite les octets
+prêts au lieu de refaire le travail.
+"""
+import io
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .assets import has_image
+from .stats import ReportStats, current_stats, recording, timed_stage
+
+
+def _image_threads() -> int:
+    """Threads de préparation : variable REPORT_IMAGE_THREADS, sinon un par image.
+
+    Sans cœur libre en plus de celui qui construit le document, les threads
+    ne feraient que se partager le même processeur : 0 (préparation à la
+    demande) dans ce cas.
+    """
+    value = os.environ.get('REPORT_IMAGE_THREADS')
+    if value:
+        return int(value)
+    return max(0, min(3, (os.cpu_count() or 1) - 1))
+
+
+# Threads de préparation des images par processus (0 pour préparer à la demande)
+IMAGE_THREADS = _image_threads()
+
+# Résolution maximale des images intégrées (points par pouce, 0 pour désactiver)
+IMAGE_MAX_DPI = int(os.environ.get('REPORT_IMAGE_MAX_DPI', '300'))
+
+# Hauteur des logos de l'en-tête (EMU, Cm(1.2) de python-docx)
+HEADER_LOGO_HEIGHT = int(1.2 * 360000)
+
+
+def target_pixels(height):
+    """Hauteur maximale en pixels d'une image affichée sur height (EMU), ou None."""
+    if height is None or IMAGE_MAX_DPI <= 0:
+        return None
+    return max(1, math.ceil(height / 914400 * IMAGE_MAX_DPI))
+
+
+def header_images(data) -> list:
+    """Images de l'en-tête [(source, hauteur)], pour les préparer à l'avance."""
+    return [(source, HEADER_LOGO_HEIGHT)
+            for source in (data.logos.logo_ecole, data.logos.logo_entreprise)
+            if has_image(source)]
+
+
+_current_images = ContextVar('prepared_images', default=None)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(IMAGE_THREADS, thread_name_prefix='report-image')
+    return _executor
+
+
+class PreparedImages:
+    """Images d'un rapport en cours de préparation, par (source, hauteur).
+
+    decode(source, hauteur) est la fonction de préparation (decode_base64_image) ;
+    chaque tâche mesure son travail dans ses propres ReportStats, reportées
+    dans les mesures du rapport quand l'image est reprise.
+    """
+
+    def __init__(self, decode):
+        self._decode = decode
+        self._futures = {}
+        self._taken = set()
+
+    def submit(self, images):
+        """Lance la préparation des images [(source, hauteur)] pas encore demandées."""
+        if IMAGE_THREADS <= 0:
+            return
+        for key in images:
+            if key not in self._futures:
+                self._futures[key] = _get_executor().submit(self._prepare, *key)
+
+    def _prepare(self, source, height):
+        stats = ReportStats()
+        with recording(stats):
+            try:
+                return stats, self._decode(source, height).getvalue(), None
+            except Exception as e:
+                return stats, None, e
+
+    def take(self, source, height):
+        """Octets préparés pour (source, hauteur), ou None s'ils n'ont pas été demandés.
+
+        Attend la fin de la préparation si nécessaire ; relève l'erreur de
+        décodage éventuelle.
+        """
+        key = (source, height)
+        future = self._futures.get(key)
+        if future is None:
+            return None
+        with timed_stage('image_wait'):
+            stats, content, error = future.result()
+        current = current_stats()
+        if current is not None and key not in self._taken:
+            current.merge(stats)
+        self._taken.add(key)
+        if error is not None:
+            raise error
+        return io.BytesIO(content)
+
+    def cancel(self):
+        """Abandonne les préparations pas encore commencées."""
+        for future in self._futures.values():
+            future.cancel()
+
+
+def current_images():
+    """Images préparées pour la génération en cours dans ce contexte, ou None."""
+    return _current_images.get()
+
+
+@contextmanager
+def preparing(images: PreparedImages):
+    """Rend images accessible via current_images() pendant le bloc."""
+    token = _current_images.set(images)
+    try:
+        yield images
+    finally:
+        _current_images.reset(token)
+        images.cancel()
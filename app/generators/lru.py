@@ -0,0 +1,67 @@
+"""
+Cache LRU borné par un budget en octets, commun aux caches du générateur
+(images normalisées, pages de garde) et des services (documents générés).
+"""
+import threading
+from collections import OrderedDict
+
+
+class ByteBudgetCache:
+    """Cache LRU thread-safe borné par un budget en octets.
+
+    La taille d'une valeur est donnée par sizeof (len par défaut). Une valeur
+    plus grosse qu'un quart du budget n'est pas conservée ; au-delà du
+    budget, les valeurs les moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self, max_bytes: int, sizeof=len):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_bytes // 4
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        # Sans compter de hit ni modifier l'ordre LRU
+        return key in self._entries
+
+    def get(self, key):
+        """Renvoie la valeur associée à key, ou None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def accepts(self, size: int) -> bool:
+        """Indique si une valeur de cette taille peut être mise en cache."""
+        return 0 < size <= self.max_entry_bytes
+
+    def put(self, key, value):
+        """Ajoute une valeur et évince les plus anciennes au-delà du budget."""
+        size = self._sizeof(value)
+        if not self.accepts(size):
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= self._sizeof(previous)
+            self._entries[key] = value
+            self.size += size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= self._sizeof(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -0,0 +1,87 @@
+"""
+Plan des chapitres aplati, calculé une fois par rapport.
+
+La table des matières et les chapitres parcourent le même plan : l'arbre des
+ChapterItem n'est parcouru, et les numéros (« 1.2.3. ») formatés, qu'une
+seule fois, quelle que soit la profondeur. Les pages du plan d'un rapport
+sont estimées par pagination (voir pagination.paginate).
+"""
+from array import array
+
+# Première page des chapitres : page de garde et table des matières avant eux
+FIRST_CHAPTER_PAGE = 3
+
+
+class Outline:
+    """Titres des chapitres dans l'ordre du document, en tableaux parallèles.
+
+    Pour chaque titre : niveau (1 pour un chapitre), numéro, titre et page
+    estimée (par défaut celle du chapitre qui le contient, un chapitre par
+    page). thanks_page et abstract_page sont les pages des remerciements et
+    du résumé, end_page celle qui suit le dernier chapitre (annexes) et
+    page_count le nombre de pages du document.
+    """
+
+    __slots__ = ('levels', 'numbers', 'titles', 'pages', 'first_page', 'end_page',
+                 'thanks_page', 'abstract_page', 'page_count')
+
+    def __init__(self, chapters, first_page: int = FIRST_CHAPTER_PAGE):
+        self.levels = array('H')
+        self.numbers = []
+        self.titles = []
+        self.pages = array('I')
+        self.first_page = first_page
+
+        page = first_page
+        for index, chapter in enumerate(chapters, 1):
+            self._add_chapter(chapter, f"{index}.", page)
+            page += 1
+        # Page suivant le dernier chapitre (annexes)
+        self.end_page = page
+        self.thanks_page = self.abstract_page = first_page
+        self.page_count = page
+
+    def _add_chapter(self, chapter, number: str, page: int):
+        # Parcours en profondeur sans récursion : ordre du document
+        stack = [(chapter, number, 1)]
+        while stack:
+            item, number, level = stack.pop()
+            self.levels.append(level)
+            self.numbers.append(number)
+            self.titles.append(item.title)
+            self.pages.append(page)
+            children = item.children
+            for index in range(len(children), 0, -1):
+                stack.append((children[index - 1], f"{number}{index}.", level + 1))
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self):
+        """(niveau, numéro, titre, page) de chaque titre."""
+        return zip(self.levels, self.numbers, self.titles, self.pages)
+
+
+def get_chapter_hint(title: str) -> str:
+    """Retourne une indication selon le type de chapitre."""
+    t = title.lower()
+    if "introduction" in t:
+        return "[Présenter le contexte, les objectifs et le plan du rapport...]"
+    elif "entreprise" in t or "présentation" in t:
+        return "[Présenter l'entreprise, son histoire, ses activités, son organisation...]"
+    elif "mission" in t:
+        return "[Décrire les missions confiées et leurs objectifs...]"
+    elif "travail" in t or "réalis" in t:
+        return "[Détailler le travail effectué, les méthodes et outils utilisés...]"
+    elif "bilan" in t:
+        return "[Analyser les résultats, difficultés et compétences acquises...]"
+    elif "conclusion" in t:
+        return "[Synthétiser les apports du stage et les perspectives...]"
+    return "[Contenu à rédiger...]"
+
+
+def report_outline(data) -> Outline:
+    """Plan des chapitres de data, avec les pages estimées du document."""
+    from .pagination import paginate
+
+    return paginate(data, Outline(data.chapters))
@@ -0,0 +1,407 @@
+"""
+Estimation de la pagination du rapport, sans traitement de texte.
+
+Les numéros de page de la table des matières sont prédits en simulant la
+mise en page de Word : largeur des caractères de la police du rapport
+(font_family, mesurée une fois par processus avec Pillow ImageFont), coupure
+des lignes aux espaces, interligne (line_spacing), espacements et retraits
+des styles (setup_document_styles), hauteur utile de la page A4 (marges de
+PageConfig), sauts de page, titres liés au paragraphe suivant et contrôle
+des veuves et orphelines. Quelques microsecondes par paragraphe.
+
+Seules les familles de _FONT_FILES sont mesurées : elles sont cherchées dans
+REPORT_FONTS_DIR puis dans les répertoires du système, sous leur nom
+Microsoft ou celui d'un équivalent métrique libre (Liberation, Carlito,
+Caladea). Toute autre famille est estimée avec Times New Roman, et à défaut
+de fichier, la police par défaut de Pillow donne une estimation plus grossière.
+"""
+import math
+import os
+import threading
+
+from .outline import get_chapter_hint
+
+# Répertoire de polices (.ttf, .ttc) consulté avant ceux du système
+FONTS_DIR = os.environ.get('REPORT_FONTS_DIR', '')
+
+# Page A4 (voir base_document.build_base_document), en points
+PAGE_WIDTH = 21 * 72 / 2.54
+PAGE_HEIGHT = 29.7 * 72 / 2.54
+
+# Taille de mesure des caractères (pixels par em)
+_REFERENCE_SIZE = 1000
+
+# Fichiers des polices usuelles de Word puis de leurs équivalents métriques,
+# par variante : normal, gras, italique, gras italique
+_FONT_FILES = {
+    'times new roman': (
+        ('times.ttf', 'Times New Roman.ttf', 'LiberationSerif-Regular.ttf'),
+        ('timesbd.ttf', 'Times New Roman Bold.ttf', 'LiberationSerif-Bold.ttf'),
+        ('timesi.ttf', 'Times New Roman Italic.ttf', 'LiberationSerif-Italic.ttf'),
+        ('timesbi.ttf', 'Times New Roman Bold Italic.ttf', 'LiberationSerif-BoldItalic.ttf'),
+    ),
+    'arial': (
+        ('arial.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf'),
+        ('arialbd.ttf', 'Arial Bold.ttf', 'LiberationSans-Bold.ttf'),
+        ('ariali.ttf', 'Arial Italic.ttf', 'LiberationSans-Italic.ttf'),
+        ('arialbi.ttf', 'Arial Bold Italic.ttf', 'LiberationSans-BoldItalic.ttf'),
+    ),
+    'calibri': (
+        ('calibri.ttf', 'Carlito-Regular.ttf'),
+        ('calibrib.ttf', 'Carlito-Bold.ttf'),
+        ('calibrii.ttf', 'Carlito-Italic.ttf'),
+        ('calibriz.ttf', 'Carlito-BoldItalic.ttf'),
+    ),
+    'cambria': (
+        ('cambria.ttc', 'Caladea-Regular.ttf'),
+        ('cambriab.ttf', 'Caladea-Bold.ttf'),
+        ('cambriai.ttf', 'Caladea-Italic.ttf'),
+        ('cambriaz.ttf', 'Caladea-BoldItalic.ttf'),
+    ),
+    'courier new': (
+        ('cour.ttf', 'LiberationMono-Regular.ttf'),
+        ('courbd.ttf', 'LiberationMono-Bold.ttf'),
+        ('couri.ttf', 'LiberationMono-Italic.ttf'),
+        ('courbi.ttf', 'LiberationMono-BoldItalic.ttf'),
+    ),
+}
+
+# Famille utilisée pour les polices absentes de _FONT_FILES
+_DEFAULT_FAMILY = 'times new roman'
+
+# Dimensions minimales (points) : zone de texte et interligne restent
+# positifs quelles que soient les marges et tailles reçues
+_MIN_LENGTH = 1.0
+
+# Police introuvable et Pillow sans FreeType : largeur moyenne et interligne simple (em)
+_FALLBACK_WIDTH = 0.5
+_FALLBACK_LINE_HEIGHT = 1.15
+
+
+def cm_to_pt(value: float) -> float:
+    return value * 72 / 2.54
+
+
+class _Widths(dict):
+    """Largeur (em) de chaque caractère, mesurée à la première rencontre."""
+
+    def __init__(self, font):
+        super().__init__()
+        self._font = font
+
+    def __missing__(self, char):
+        width = self[char] = self._font.getlength(char) / _REFERENCE_SIZE
+        return width
+
+
+class FontMetrics:
+    """Largeurs des caractères et interligne simple d'une police, en em."""
+
+    def __init__(self, font=None, name: str = ''):
+        self.name = name
+        if font is None:
+            self.line_height = _FALLBACK_LINE_HEIGHT
+            self.widths = {}
+            self.default_width = _FALLBACK_WIDTH
+            return
+        # Hauteur de ligne de FreeType (ascendante, descendante et interligne de la police)
+        self.line_height = font.font.height / _REFERENCE_SIZE
+        self.widths = _Widths(font)
+        self.default_width = None
+        # Caractères courants mesurés d'emblée
+        for code in range(32, 256):
+            self.widths[chr(code)]
+
+    def width(self, text: str) -> float:
+        """Largeur de text (em), sans crénage (comme Word par défaut)."""
+        if self.default_width is not None:
+            return len(text) * self.default_width
+        return sum(map(self.widths.__getitem__, text))
+
+
+def _family_key(family: str) -> str:
+    """Famille de _FONT_FILES utilisée pour font_family (jamais un nom de fichier reçu)."""
+    family = (family or '').strip().lower()
+    return family if family in _FONT_FILES else _DEFAULT_FAMILY
+
+
+def _load_font(family: str, variant: int):
+    from PIL import ImageFont
+
+    for name in _FONT_FILES[family][variant]:
+        paths = [os.path.join(FONTS_DIR, name)] if FONTS_DIR else []
+        for path in paths + [name]:
+            try:
+                return ImageFont.truetype(path, _REFERENCE_SIZE)
+            except OSError:
+                continue
+    return None
+
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def font_metrics(family: str, bold: bool = False, italic: bool = False) -> FontMetrics:
+    """Métriques d'une police (mises en cache pour la durée du processus).
+
+    Le cache est indexé par famille connue (voir _family_key) : au plus une
+    entrée par variante des familles de _FONT_FILES. Sans fichier pour la
+    variante demandée, la variante normale de la même famille est utilisée
+    (Word simule alors gras et italique), puis la police par défaut de Pillow.
+    """
+    family = _family_key(family)
+    variant = bool(bold) + 2 * bool(italic)
+    key = (family, variant)
+    metrics = _metrics.get(key)
+    if metrics is not None:
+        return metrics
+    with _metrics_lock:
+        metrics = _metrics.get(key)
+        if metrics is None:
+            font = _load_font(family, variant)
+            if font is None and variant:
+                font = _load_font(family, 0)
+            metrics = _metrics[key] = (FontMetrics(font, family) if font is not None
+                                       else _default_metrics())
+    return metrics
+
+
+def _default_metrics() -> FontMetrics:
+    """Métriques de la police par défaut de Pillow, partagées (sous _metrics_lock)."""
+    metrics = _metrics.get(None)
+    if metrics is None:
+        try:
+            from PIL import ImageFont
+            font = ImageFont.load_default(_REFERENCE_SIZE)
+        except (ImportError, OSError):
+            font = None
+        if font is not None and not hasattr(font, 'getlength'):
+            font = None
+        metrics = _metrics[None] = FontMetrics(font, 'default')
+    return metrics
+
+
+class ParagraphStyle:
+    """Mise en forme d'un paragraphe utile à sa mise en page (points)."""
+
+    __slots__ = ('metrics', 'size', 'line_height', 'space_before', 'space_after',
+                 'left_indent', 'first_line_indent', 'keep_next')
+
+    def __init__(self, family: str, size: float, line_spacing: float, space_before: float = 0.0,
+                 space_after: float = 0.0, left_indent: float = 0.0, first_line_indent: float = 0.0,
+                 bold: bool = False, italic: bool = False, keep_next: bool = False):
+        self.metrics = font_metrics(family, bold, italic)
+        self.size = size
+        # Interligne « multiple » de Word : line_spacing × interligne simple
+        self.line_height = max(_MIN_LENGTH, self.metrics.line_height * size * line_spacing)
+        self.space_before = space_before
+        self.space_after = space_after
+        self.left_indent = left_indent
+        self.first_line_indent = first_line_indent
+        self.keep_next = keep_next
+
+    def count_lines(self, text: str, width: float) -> int:
+        """Nombre de lignes de text sur une colonne de width points (coupure aux espaces)."""
+        width -= self.left_indent
+        scale = self.size
+        space = self.metrics.width(' ') * scale
+        lines = 0
+        for segment in text.split('\n'):
+            lines += 1
+            limit = width - self.first_line_indent if lines == 1 else width
+            x = 0.0
+            for word in segment.split(' '):
+                word_width = self.metrics.width(word) * scale
+                if x and x + word_width > limit:
+                    lines += 1
+                    limit = width
+                    x = 0.0
+                if word_width > limit > 0:
+                    # Mot plus long que la ligne : coupé où il déborde
+                    extra = math.ceil(word_width / limit) - 1
+                    lines += extra
+                    word_width -= extra * limit
+                    limit = width
+                x += word_width + space
+        return lines
+
+
+def report_styles(style) -> dict:
+    """Styles de paragraphe du rapport (voir setup_document_styles et BodyBuilder)."""
+    family = style.font_family or "Times New Roman"
+    spacing = style.line_spacing
+    pt = cm_to_pt
+    normal = ParagraphStyle(family, style.font_size, spacing, space_after=6,
+                            first_line_indent=pt(1.25))
+    h3 = ParagraphStyle(family, style.title3_size, spacing, 10, 6, pt(1.5),
+                        italic=style.title3_italic, keep_next=True)
+    return {
+        'normal': normal,
+        'hint': ParagraphStyle(family, style.font_size, spacing, space_after=6,
+                               first_line_indent=pt(1.25), italic=True),
+        1: ParagraphStyle(family, style.title1_size, spacing, 18, 12,
+                          bold=style.title1_bold, keep_next=True),
+        2: ParagraphStyle(family, style.title2_size, spacing, 14, 8, pt(0.75),
+                          bold=style.title2_bold, keep_next=True),
+        3: h3,
+        # Entrées de la table des matières (taille fixe, espacement après de 4 pt)
+        'toc1': ParagraphStyle(family, 11, spacing, space_after=4, bold=True),
+        'toc2': ParagraphStyle(family, 10, spacing, space_after=4, left_indent=pt(0.75)),
+        'toc3': ParagraphStyle(family, 10, spacing, space_after=4, left_indent=pt(1.5),
+                               italic=True),
+    }
+
+
+class Paginator:
+    """Place les paragraphes les uns après les autres et suit la page courante."""
+
+    # Tolérance d'arrondi (points)
+    _EPSILON = 0.01
+
+    def __init__(self, page, styles: dict, number: int = 1):
+        self.width = max(_MIN_LENGTH, PAGE_WIDTH - cm_to_pt(page.margin_left + page.margin_right))
+        self.height = max(_MIN_LENGTH, PAGE_HEIGHT - cm_to_pt(page.margin_top + page.margin_bottom))
+        self.styles = styles
+        self.page = number
+        self.y = 0.0
+
+    def _new_page(self):
+        self.page += 1
+        self.y = 0.0
+
+    def paragraph(self, text: str, style: ParagraphStyle, width: float = None) -> int:
+        """Ajoute un paragraphe ; renvoie la page de sa première ligne."""
+        lines = style.count_lines(text, width or self.width)
+        line_height = style.line_height
+        # Espacement avant ignoré en haut de page
+        before = style.space_before if self.y > 0 else 0.0
+        room = self.height - self.y - before + self._EPSILON
+
+        if style.keep_next:
+            # Titre : ses lignes et la première du paragraphe suivant sur la même page
+            following = self.styles['normal'].line_height
+            if self.y > 0 and lines * line_height + following > room:
+                self._new_page()
+                before = 0.0
+            start = self.page
+            self.y += before + lines * line_height
+            if self.y > self.height + self._EPSILON:
+                # Titre plus haut qu'une page : il déborde sur les suivantes
+                overflow = math.ceil((self.y - self.height - self._EPSILON) / self.height)
+                self.y -= overflow * self.height
+                self.page += overflow
+        else:
+            fit = max(0, int(room // line_height))
+            if fit < lines:
+                # Pas de ligne orpheline en bas de page, ni de veuve en haut de la suivante
+                if fit == 1 and lines > 1:
+                    fit = 0
+                elif lines - fit == 1 and fit > 1:
+                    fit -= 1
+            if fit == 0 and self.y > 0:
+                self._new_page()
+                before = 0.0
+                fit = max(1, int((self.height + self._EPSILON) // line_height))
+            start = self.page
+            remaining = lines
+            self.y += before
+            if remaining > fit:
+                # Suite du paragraphe sur des pages pleines, puis la dernière
+                remaining -= fit
+                per_page = max(1, int((self.height + self._EPSILON) // line_height))
+                full = (remaining - 1) // per_page
+                self.page += full + 1
+                self.y = 0.0
+                remaining -= full * per_page
+            self.y += remaining * line_height
+        self.y += style.space_after
+        return start
+
+    def page_break(self):
+        """Paragraphe de saut de page : sa marque de fin occupe une ligne en haut de la page suivante."""
+        self._new_page()
+        normal = self.styles['normal']
+        self.y = normal.line_height + normal.space_after
+
+    def section(self, title: str, paragraphs, page_break: bool = True) -> int:
+        """Section courte : titre de niveau 1 puis paragraphes (texte, style), saut de page."""
+        start = self.paragraph(title, self.styles[1])
+        for text, style in paragraphs:
+            self.paragraph(text, self.styles[style])
+        if page_break:
+            self.page_break()
+        return start
+
+
+def _toc_entries(data, outline):
+    if data.include_thanks:
+        yield "REMERCIEMENTS", 1
+    if data.include_abstract:
+        yield "RÉSUMÉ", 1
+    for level, number, title, _ in outline:
+        yield f"{number} {title}", level
+    if data.include_annexes:
+        yield "ANNEXES", 1
+
+
+def paginate(data, outline):
+    """Renseigne les pages de outline (titres, sections fixes) par mise en page estimée.
+
+    outline.pages reçoit la page de chaque titre ; outline.thanks_page,
+    outline.abstract_page, outline.end_page (annexes) et outline.page_count
+    celles des sections fixes et le nombre total de pages.
+    """
+    styles = report_styles(data.style)
+    paginator = Paginator(data.page, styles)
+
+    # Page de garde : une page, suivie d'un saut de page
+    if data.include_cover:
+        paginator.page_break()
+
+    if data.include_toc:
+        # Titres coupés avant la tabulation du numéro de page (15 cm, voir xml_builder)
+        toc_width = cm_to_pt(15) - 2 * 11
+        paginator.paragraph("TABLE DES MATIÈRES", styles[1])
+        paginator.paragraph("", styles['normal'])
+        for text, level in _toc_entries(data, outline):
+            paginator.paragraph(text, styles[f'toc{min(level, 3)}'], toc_width)
+        paginator.page_break()
+
+    # Remerciements et résumé (voir generate_thanks_section et generate_abstract_section)
+    if data.include_thanks:
+        thanks = [(f"Je tiens à remercier {data.entreprise_nom or '[Entreprise]'} "
+                   "pour m'avoir accueilli durant ce stage.", 'normal')]
+        if data.tuteur_nom:
+            poste = f", {data.tuteur_poste}," if data.tuteur_poste else ""
+            thanks.append((f"Je remercie particulièrement {data.tuteur_nom}{poste} "
+                           "pour son encadrement tout au long de ce stage.", 'normal'))
+        if data.tuteur_academique_nom:
+            poste = f", {data.tuteur_academique_poste}," if data.tuteur_academique_poste else ""
+            thanks.append((f"Je remercie également {data.tuteur_academique_nom}{poste} "
+                           "pour son suivi académique.", 'normal'))
+        thanks.append(("[Compléter les remerciements...]", 'hint'))
+        outline.thanks_page = paginator.section("REMERCIEMENTS", thanks)
+    if data.include_abstract:
+        outline.abstract_page = paginator.section("RÉSUMÉ", [
+            ("[Résumé du rapport en français...]", 'hint'), ("", 'normal'),
+            ("Abstract", 2), ("[English abstract...]", 'hint')])
+
+    # Chapitres : chacun commence sur une nouvelle page (voir generate_chapters)
+    pages = outline.pages
+    hint = styles['hint']
+    for index, (level, number, title, _) in enumerate(outline):
+        if level == 1 and index:
+            paginator.page_break()
+        pages[index] = paginator.paragraph(f"{number} {title}", styles[min(level, 3)])
+        paginator.paragraph(get_chapter_hint(title) if level == 1 else "[Contenu à rédiger...]",
+                            hint)
+    if len(outline):
+        paginator.page_break()
+
+    outline.end_page = paginator.page
+    if data.include_annexes:
+        paginator.section("ANNEXES", [("Annexe A - [Titre]", 2),
+                                      ("[Contenu de l'annexe...]", 'hint')], page_break=False)
+    outline.page_count = paginator.page
+    return outline
@@ -0,0 +1,185 @@
+"""
+Plan d'un rapport : structure et coût estimés sans construire le document.
+
+plan_report(data) compte les paragraphes, tableaux et images que produira
+generate_report et en déduit, par un modèle linéaire, la taille du .docx, la
+durée de génération et la mémoire de pointe. Les coefficients ont été
+calibrés sur des générations mesurées (un cœur, caches d'images et de pages
+de garde vides) : structure seule de 0 à 6 100 titres, puis trois images
+JPEG ou PNG de 400×300 à 4000×3000 pixels.
+"""
+import base64
+import binascii
+import math
+
+from .assets import asset_hash, asset_store
+from .covers import cover_model_name, get_cover_generator
+from .image_prep import IMAGE_MAX_DPI, header_images
+from .outline import Outline, report_outline
+
+# Document vide : durée (s) et taille (octets) du .docx
+BASE_SECONDS = 0.025
+BASE_OUTPUT_BYTES = 39_000
+
+# Par paragraphe produit (titres, indications, entrées de la table des matières)
+PARAGRAPH_SECONDS = 0.00002
+PARAGRAPH_OUTPUT_BYTES = 3
+
+# Par tableau (page de garde, en-tête)
+TABLE_SECONDS = 0.0003
+TABLE_OUTPUT_BYTES = 150
+
+# Par image préparée (une par couple image/hauteur d'affichage) : coût fixe,
+# puis coût par Mo de l'image source selon son format
+IMAGE_SECONDS = 0.008
+IMAGE_SECONDS_PER_MB = {'jpeg': 0.145, 'png': 0.47}
+IMAGE_SECONDS_PER_MB_OTHER = 0.47
+
+# Octets par pixel d'une image réduite à sa taille d'affichage, et proportions
+# supposées (largeur / hauteur) faute de lire ses dimensions
+IMAGE_BYTES_PER_PIXEL = {'jpeg': 0.12, 'png': 0.35}
+IMAGE_BYTES_PER_PIXEL_OTHER = 0.35
+IMAGE_ASPECT = 4 / 3
+
+# Mémoire de pointe (≈ Mo) : processus, par paragraphe et tableau, et par Mo
+# d'image (une image décodée occupe bien plus que sa taille compressée)
+BASE_MEMORY_MB = 8.0
+PARAGRAPH_MEMORY_MB = 0.01
+TABLE_MEMORY_MB = 0.1
+IMAGE_MEMORY_FACTOR = 12
+
+# Paragraphes des sections fixes (titres, indications, sauts de page)
+_TOC_PARAGRAPHS = 3
+_THANKS_PARAGRAPHS = 4
+_ABSTRACT_PARAGRAPHS = 6
+_ANNEXES_PARAGRAPHS = 3
+
+_MAGIC = ((b'\xff\xd8\xff', 'jpeg'), (b'\x89PNG', 'png'))
+
+
+def image_format(source) -> str:
+    """Format d'une image ('jpeg', 'png' ou 'other'), lu sur ses premiers octets."""
+    digest = asset_hash(source)
+    if digest:
+        return 'jpeg' if asset_store.media_type(digest) == 'image/jpeg' else 'png'
+    if isinstance(source, str):
+        if source.startswith('data:'):
+            source = source.split(',', 1)[-1]
+        try:
+            head = base64.b64decode(source[:8])
+        except (binascii.Error, ValueError):
+            return 'other'
+    else:
+        head = bytes(source[:4])
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    return 'other'
+
+
+def image_size(source) -> int:
+    """Taille approximative (octets) du fichier d'une image, sans la décoder."""
+    digest = asset_hash(source)
+    if digest:
+        return asset_store.size(digest)
+    if isinstance(source, str):
+        if source.startswith('data:'):
+            return (len(source) - source.find(',') - 1) * 3 // 4
+        return len(source) * 3 // 4
+    return len(source)
+
+
+class ReportPlan:
+    """Structure et coût estimés d'un rapport (voir plan_report)."""
+
+    __slots__ = (
+        'cover_model', 'chapters', 'headings', 'depth', 'pages',
+        'paragraphs', 'tables', 'images', 'image_bytes', 'embedded_image_bytes',
+        'output_bytes', 'seconds', 'memory_mb',
+    )
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _image_plan(images):
+    """(octets sources, octets intégrés, durée) des images [(source, hauteur)] à préparer."""
+    source_bytes = embedded = 0
+    seconds = 0.0
+    sizes = {}
+    for source, height in images:
+        size = sizes.get(id(source))
+        if size is None:
+            size = sizes[id(source)] = (image_size(source), image_format(source))
+        nbytes, fmt = size
+        seconds += IMAGE_SECONDS + nbytes / (1024 * 1024) * IMAGE_SECONDS_PER_MB.get(
+            fmt, IMAGE_SECONDS_PER_MB_OTHER)
+        if IMAGE_MAX_DPI > 0:
+            height_px = math.ceil(height / 914400 * IMAGE_MAX_DPI)
+            pixels = height_px * height_px * IMAGE_ASPECT
+            nbytes = min(nbytes, int(pixels * IMAGE_BYTES_PER_PIXEL.get(fmt, IMAGE_BYTES_PER_PIXEL_OTHER)))
+        embedded += nbytes
+    for nbytes, _ in sizes.values():
+        source_bytes += nbytes
+    return source_bytes, embedded, seconds
+
+
+def plan_report(data, pages: bool = True) -> ReportPlan:
+    """Structure et coût de generate_report(data), sans construire le document.
+
+    Ne décode aucune image et ne construit aucun XML : la page de garde est
+    comptée sur sa mise en page déclarative, les chapitres sur leur plan, et
+    le nombre de pages est celui de la pagination estimée (voir pagination).
+
+    Avec pages=False, la pagination (polices mesurées avec Pillow) est omise
+    et plan.pages vaut None : le coût seul, calculable dans le processus du
+    serveur sans importer python-docx ni Pillow (admission).
+    """
+    plan = ReportPlan()
+    outline = report_outline(data) if pages else Outline(data.chapters)
+    plan.cover_model = cover_model_name(getattr(data, 'cover_model', 'classique'))
+    plan.chapters = len(data.chapters)
+    plan.headings = len(outline)
+    plan.depth = max(outline.levels, default=0)
+
+    paragraphs = 2 * len(outline) + len(data.chapters)
+    tables = 0
+    images = []
+    pictures = 0
+
+    if data.include_cover:
+        layout = get_cover_generator(plan.cover_model)
+        cover_paragraphs, cover_tables, pictures = layout.count(data)
+        paragraphs += cover_paragraphs + 1
+        tables += cover_tables
+        images += layout.images(data)
+    header = header_images(data)
+    tables += 1
+    pictures += len(header)
+    images += header
+    if data.include_toc:
+        # Titre, ligne vide, entrées (chapitres, sections fixes) et saut de page
+        paragraphs += _TOC_PARAGRAPHS + len(outline) + (
+            data.include_thanks + data.include_abstract + data.include_annexes)
+    if data.include_thanks:
+        paragraphs += _THANKS_PARAGRAPHS + bool(data.tuteur_nom) + bool(data.tuteur_academique_nom)
+    if data.include_abstract:
+        paragraphs += _ABSTRACT_PARAGRAPHS
+    if data.include_annexes:
+        paragraphs += _ANNEXES_PARAGRAPHS
+
+    source_bytes, embedded, image_seconds = _image_plan(images)
+    plan.pages = outline.page_count if pages else None
+    plan.paragraphs = paragraphs
+    plan.tables = tables
+    plan.images = pictures
+    plan.image_bytes = source_bytes
+    plan.embedded_image_bytes = embedded
+    plan.output_bytes = (BASE_OUTPUT_BYTES + paragraphs * PARAGRAPH_OUTPUT_BYTES
+                         + tables * TABLE_OUTPUT_BYTES + embedded)
+    plan.seconds = round(BASE_SECONDS + paragraphs * PARAGRAPH_SECONDS
+                         + tables * TABLE_SECONDS + image_seconds, 4)
+    plan.memory_mb = round(BASE_MEMORY_MB + paragraphs * PARAGRAPH_MEMORY_MB
+                           + tables * TABLE_MEMORY_MB
+                           + IMAGE_MEMORY_FACTOR * source_bytes / (1024 * 1024), 2)
+    return plan
@@ -2,17 +2,18 @@
 Générateur principal de rapport de stage.
 """
 import io
-from docx import Document
-from docx.shared import Cm
-
+import os
+import time
+from contextlib import contextmanager
 from .utils import (
     format_date_fr,
     calculate_duration,
-    setup_document_styles,
+    decode_base64_image,
+    header_images,
     setup_header_with_logos,
     setup_footer_with_page_number,
 )
-from .covers import get_cover_generator
+from .covers import cover_cache_key, cover_images, cover_model_name, render_cover
 from .sections import (
     generate_toc_section,
     generate_thanks_section,
@@ -20,64 +21,140 @@ from .sections import (
     generate_chapters,
     generate_annexes_section,
 )
+from .base_document import base_documents, block_width
+from .image_prep import PreparedImages, preparing
+from .outline import report_outline
+from .stats import ReportStats, recording
+
+
+# Étapes de génération, dans l'ordre (pour le suivi de progression)
+REPORT_STAGES = [
+    'document', 'cover', 'header_footer', 'toc', 'thanks',
+    'abstract', 'chapters', 'annexes', 'save',
+]
+
+
+def count_elements(doc) -> int:
+    """Nombre d'éléments XML dans toutes les parties du document (débogage)."""
+    total = 0
+    for part in doc.part.package.iter_parts():
+        element = getattr(part, '_element', None)
+        if element is not None:
+            total += sum(1 for _ in element.iter())
+    return total
+
+
+@contextmanager
+def _stage(name: str, stats: ReportStats, progress=None, doc=None):
+    """Signale le début d'une étape au callback de progression et la chronomètre.
 
+    Si stats.track_elements est vrai, compte aussi les éléments XML créés.
+    """
+    if progress is not None:
+        progress(name, REPORT_STAGES.index(name) / len(REPORT_STAGES))
+    before = count_elements(doc) if stats.track_elements and doc is not None else None
+    with stats.stage(name):
+        yield
+    if before is not None:
+        stats.elements[name] = count_elements(doc) - before
 
-def generate_report(data) -> io.BytesIO:
-    """Génère le rapport de stage complet."""
-    doc = Document()
 
-    # Configuration de la page (A4)
-    section = doc.sections[0]
-    section.page_width = Cm(21)
-    section.page_height = Cm(29.7)
-    section.top_margin = Cm(data.page.margin_top)
-    section.bottom_margin = Cm(data.page.margin_bottom)
-    section.left_margin = Cm(data.page.margin_left)
-    section.right_margin = Cm(data.page.margin_right)
+def _output_size(output) -> int:
+    """Taille du document écrit dans output (chemin ou fichier)."""
+    if isinstance(output, (str, os.PathLike)):
+        return os.path.getsize(output)
+    return output.tell()
 
-    # Première page différente (pas de header/footer sur page de garde)
-    section.different_first_page_header_footer = True
 
-    # Configurer les styles
-    setup_document_styles(doc, data.style)
+def generate_report(data, output=None, progress=None, stats: ReportStats = None):
+    """Génère le rapport de stage complet.
+
+    Si output (chemin ou fichier binaire) est fourni, l'archive .docx y est
+    écrite directement ; sinon elle est renvoyée dans un BytesIO.
+    progress(stage, fraction) est appelé au début de chaque étape, et les
+    durées et volumes mesurés sont enregistrés dans stats s'il est fourni.
+    """
+    cover_model = getattr(data, 'cover_model', 'classique')
+    if stats is None:
+        stats = ReportStats()
+    stats.cover_model = cover_model_name(cover_model)
+    start = time.perf_counter()
 
     # Variables
     duree = calculate_duration(data.date_debut, data.date_fin)
     date_debut_fr = format_date_fr(data.date_debut)
     date_fin_fr = format_date_fr(data.date_fin)
 
-    # Page de garde
-    if data.include_cover:
-        cover_model = getattr(data, 'cover_model', 'classique')
-        cover_generator = get_cover_generator(cover_model)
-        cover_generator(doc, data, date_debut_fr, date_fin_fr, duree)
-        doc.add_page_break()
+    with recording(stats), preparing(PreparedImages(decode_base64_image)) as images:
+        # Images de la page de garde (sauf si elle est déjà en cache) et logos
+        # de l'en-tête, préparés en parallèle de la construction du document
+        cover_key = None
+        prepared = []
+        if data.include_cover:
+            cover_key = cover_cache_key(cover_model, data, date_debut_fr, date_fin_fr, duree,
+                                        block_width(data.page))
+            prepared += cover_images(cover_key, data)
+        images.submit(prepared + header_images(data))
+
+        # Document de base (page A4, marges, styles) cloné depuis le cache
+        with _stage('document', stats, progress):
+            doc = base_documents.new_document(data.style, data.page)
+            section = doc.sections[0]
+        if stats.track_elements:
+            stats.elements['document'] = count_elements(doc)
+
+        # Plan des chapitres, partagé par la table des matières et les chapitres
+        outline = report_outline(data)
+
+        # Page de garde
+        with _stage('cover', stats, progress, doc):
+            if data.include_cover:
+                render_cover(doc, data, date_debut_fr, date_fin_fr, duree, cover_key)
+                doc.add_page_break()
+
+        # Configurer header et footer pour les pages suivantes
+        with _stage('header_footer', stats, progress, doc):
+            setup_header_with_logos(section, data)
+            setup_footer_with_page_number(section, data)
+
+        # Table des matières
+        with _stage('toc', stats, progress, doc):
+            if data.include_toc:
+                generate_toc_section(doc, data, outline)
 
-    # Configurer header et footer pour les pages suivantes
-    setup_header_with_logos(section, data)
-    setup_footer_with_page_number(section, data)
+        # Remerciements
+        with _stage('thanks', stats, progress, doc):
+            if data.include_thanks:
+                generate_thanks_section(doc, data)
 
-    # Table des matières
-    if data.include_toc:
-        generate_toc_section(doc, data)
+        # Résumé/Abstract
+        with _stage('abstract', stats, progress, doc):
+            if data.include_abstract:
+                generate_abstract_section(doc, data)
 
-    # Remerciements
-    if data.include_thanks:
-        generate_thanks_section(doc, data)
+        # Chapitres
+        with _stage('chapters', stats, progress, doc):
+            generate_chapters(doc, data, outline)
 
-    # Résumé/Abstract
-    if data.include_abstract:
-        generate_abstract_section(doc, data)
+        # Annexes
+        with _stage('annexes', stats, progress, doc):
+            if data.include_annexes:
+                generate_annexes_section(doc, data)
 
-    # Chapitres
-    generate_chapters(doc, data)
+        # Sauvegarder
+        with _stage('save', stats, progress, doc):
+            if output is not None:
+                doc.save(output)
+            else:
+                buffer = io.BytesIO()
+                doc.save(buffer)
 
-    # Annexes
-    if data.include_annexes:
-        generate_annexes_section(doc, data)
+    if output is not None:
+        stats.output_bytes = _output_size(output)
+        stats.total = time.perf_counter() - start
+        return output
 
-    # Sauvegarder
-    buffer = io.BytesIO()
-    doc.save(buffer)
+    stats.output_bytes = buffer.tell()
+    stats.total = time.perf_counter() - start
     buffer.seek(0)
     return buffer
@@ -4,16 +4,21 @@ Générateurs de sections du rapport de stage.
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+from ..outline import get_chapter_hint, report_outline
 from ..utils import create_toc
+from ..xml_builder import BodyBuilder
 
+# Niveau de titre le plus profond disponible (Heading 1 à Heading 9)
+MAX_HEADING_LEVEL = 9
 
-def generate_toc_section(doc, data):
+
+def generate_toc_section(doc, data, outline=None):
     """Génère la table des matières."""
     toc_heading = doc.add_heading("TABLE DES MATIÈRES", level=1)
     toc_heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
     doc.add_paragraph()
-    create_toc(doc, data)
+    create_toc(doc, data, outline)
 
     doc.add_page_break()
 
@@ -68,53 +73,25 @@ def generate_abstract_section(doc, data):
     doc.add_page_break()
 
 
-def get_chapter_hint(title: str) -> str:
-    """Retourne une indication selon le type de chapitre."""
-    t = title.lower()
-    if "introduction" in t:
-        return "[Présenter le contexte, les objectifs et le plan du rapport...]"
-    elif "entreprise" in t or "présentation" in t:
-        return "[Présenter l'entreprise, son histoire, ses activités, son organisation...]"
-    elif "mission" in t:
-        return "[Décrire les missions confiées et leurs objectifs...]"
-    elif "travail" in t or "réalis" in t:
-        return "[Détailler le travail effectué, les méthodes et outils utilisés...]"
-    elif "bilan" in t:
-        return "[Analyser les résultats, difficultés et compétences acquises...]"
-    elif "conclusion" in t:
-        return "[Synthétiser les apports du stage et les perspectives...]"
-    return "[Contenu à rédiger...]"
-
-
-def generate_chapters(doc, data):
-    """Génère tous les chapitres du rapport."""
-    for chapter_idx, chapter in enumerate(data.chapters, 1):
-        chapter_num = chapter_idx
-        doc.add_heading(f"{chapter_num}. {chapter.title}", level=1)
-
-        p = doc.add_paragraph()
-        run = p.add_run(get_chapter_hint(chapter.title))
-        run.italic = True
-        run.font.color.rgb = RGBColor(128, 128, 128)
-
-        for sub_idx, sub in enumerate(chapter.children, 1):
-            doc.add_heading(f"{chapter_num}.{sub_idx}. {sub.title}", level=2)
-
-            p_sub = doc.add_paragraph()
-            run_sub = p_sub.add_run("[Contenu à rédiger...]")
-            run_sub.italic = True
-            run_sub.font.color.rgb = RGBColor(128, 128, 128)
-
-            if hasattr(sub, 'children') and sub.children:
-                for subsub_idx, subsub in enumerate(sub.children, 1):
-                    doc.add_heading(f"{chapter_num}.{sub_idx}.{subsub_idx}. {subsub.title}", level=3)
-
-                    p_subsub = doc.add_paragraph()
-                    run_subsub = p_subsub.add_run("[Contenu à rédiger...]")
-                    run_subsub.italic = True
-                    run_subsub.font.color.rgb = RGBColor(128, 128, 128)
-
-        doc.add_page_break()
+def generate_chapters(doc, data, outline=None):
+    """Génère tous les chapitres du rapport, à partir du plan (report_outline)."""
+    if outline is None:
+        outline = report_outline(data)
+    builder = BodyBuilder(doc)
+    for index, (level, number, title, _) in enumerate(outline):
+        if level == 1:
+            # Chaque chapitre commence sur une nouvelle page
+            if index:
+                builder.page_break()
+            builder.heading(f"{number} {title}", level=1)
+            builder.hint(get_chapter_hint(title))
+        else:
+            # Word ne définit de styles de titre que jusqu'au niveau 9
+            builder.heading(f"{number} {title}", level=min(level, MAX_HEADING_LEVEL))
+            builder.hint("[Contenu à rédiger...]")
+    if len(outline):
+        builder.page_break()
+    builder.flush()
 
 
 def generate_annexes_section(doc, data):
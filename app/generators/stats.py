@@ -0,0 +1,96 @@
+"""
+Mesures collectées pendant la génération d'un rapport (durées par étape, volumes).
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current_stats = ContextVar('report_stats', default=None)
+
+
+class ReportStats:
+    """Durées par étape et volumes mesurés pendant une génération.
+
+    Objet simple et sérialisable : il est rempli dans le worker puis renvoyé
+    au processus principal.
+    """
+
+    def __init__(self, cover_model: str = ''):
+        self.cover_model = cover_model
+        self.durations = {}
+        self.images_decoded = 0
+        self.image_bytes = 0
+        # Consultations du cache d'images normalisées (voir image_cache)
+        self.image_cache_hits = 0
+        self.image_cache_misses = 0
+        # Images refusées, par motif (voir utils.ImageError)
+        self.image_errors = {}
+        self.output_bytes = 0
+        self.total = 0.0
+        # Comptage des éléments XML créés par étape (coûteux, profilage seulement)
+        self.track_elements = False
+        self.elements = {}
+        # Archive de profilage produite par le worker, le cas échéant
+        self.profile_path = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mesure la durée d'une étape (cumulée si l'étape se répète)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+    def add_image(self, size: int):
+        """Comptabilise une image décodée de size octets."""
+        self.images_decoded += 1
+        self.image_bytes += size
+
+    def add_image_lookup(self, hit: bool):
+        """Comptabilise une consultation du cache d'images normalisées."""
+        if hit:
+            self.image_cache_hits += 1
+        else:
+            self.image_cache_misses += 1
+
+    def merge(self, other: 'ReportStats'):
+        """Ajoute les durées et volumes mesurés dans other (travail fait dans un thread)."""
+        for name, duration in other.durations.items():
+            self.durations[name] = self.durations.get(name, 0.0) + duration
+        self.images_decoded += other.images_decoded
+        self.image_bytes += other.image_bytes
+        self.image_cache_hits += other.image_cache_hits
+        self.image_cache_misses += other.image_cache_misses
+        for code, count in other.image_errors.items():
+            self.image_errors[code] = self.image_errors.get(code, 0) + count
+
+    def add_image_error(self, code: str):
+        """Comptabilise une image refusée (illisible, corrompue ou trop grande)."""
+        self.image_errors[code] = self.image_errors.get(code, 0) + 1
+
+
+def current_stats():
+    """Mesures de la génération en cours dans ce contexte, ou None."""
+    return _current_stats.get()
+
+
+@contextmanager
+def recording(stats: ReportStats):
+    """Rend stats accessible via current_stats() pendant le bloc."""
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def timed_stage(name: str):
+    """Mesure une étape dans les mesures courantes, s'il y en a."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    with stats.stage(name):
+        yield
@@ -2,14 +2,20 @@
 Fonctions utilitaires pour la génération de documents Word.
 """
 from docx.shared import Pt, Cm, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT, WD_TAB_LEADER
+from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 import io
-import base64
+import os
 from datetime import datetime
-from PIL import Image as PILImage
+
+from .assets import asset_hash, content_hash, has_image, load_image_bytes, image_digest
+from .image_cache import image_cache
+from .image_prep import HEADER_LOGO_HEIGHT, current_images, header_images, target_pixels
+from .outline import report_outline
+from .stats import current_stats, timed_stage
+from .xml_builder import BodyBuilder
 
 
 def hex_to_rgb(hex_color: str) -> RGBColor:
@@ -18,36 +24,181 @@ def hex_to_rgb(hex_color: str) -> RGBColor:
     return RGBColor(int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
 
 
-def decode_base64_image(base64_str: str) -> io.BytesIO:
-    """Décode une image base64 et la convertit en PNG pour compatibilité python-docx."""
-    if not base64_str:
-        raise ValueError("Image base64 vide")
-    if ',' in base64_str:
-        base64_str = base64_str.split(',')[1]
-    decoded = base64.b64decode(base64_str)
+# Qualité des JPEG réencodés (photos réduites)
+IMAGE_JPEG_QUALITY = int(os.environ.get('REPORT_IMAGE_JPEG_QUALITY', '90'))
+
+# Nombre maximal de pixels d'une image avant décodage (protection mémoire)
+IMAGE_MAX_PIXELS = int(os.environ.get('REPORT_IMAGE_MAX_PIXELS', str(50_000_000)))
+
+# Formats que python-docx et Word lisent tels quels, et modes conservés sans conversion
+_PASSTHROUGH_MODES = {
+    'JPEG': ('RGB', 'L'),
+    'PNG': ('RGB', 'L', 'P', '1'),
+}
+
+
+class ImageError(ValueError):
+    """Image refusée ; code vaut 'unreadable', 'too_large' ou 'corrupt'."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+    def __reduce__(self):
+        # Renvoyée par les workers du pool : args ne contient que le message
+        return type(self), (self.code, str(self))
+
+
+class ImageInfo:
+    """Caractéristiques d'une image lues dans son en-tête, sans décoder les pixels."""
+
+    __slots__ = ('format', 'width', 'height', 'mode', 'transparent')
+
+    def __init__(self, pil_image):
+        self.format = pil_image.format
+        self.width, self.height = pil_image.size
+        self.mode = pil_image.mode
+        self.transparent = pil_image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in pil_image.info
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+    def needs_work(self, max_height: int = None) -> bool:
+        """Vrai si l'image doit être décodée (réduction, aplatissement ou conversion)."""
+        if max_height and self.height > max_height:
+            return True
+        return self.transparent or self.mode not in _PASSTHROUGH_MODES.get(self.format, ())
+
+
+def _open_image(decoded: bytes):
+    """Ouvre l'image (lecture de l'en-tête seulement) et vérifie sa taille."""
+    # Pillow n'est importé que lorsqu'une image est effectivement présente
+    from PIL import Image as PILImage
 
     try:
-        input_stream = io.BytesIO(decoded)
-        pil_image = PILImage.open(input_stream)
-
-        # Convertir en RGB si nécessaire (pour les images RGBA ou autres modes)
-        if pil_image.mode in ('RGBA', 'LA', 'P'):
-            background = PILImage.new('RGB', pil_image.size, (255, 255, 255))
-            if pil_image.mode == 'P':
-                pil_image = pil_image.convert('RGBA')
-            background.paste(pil_image, mask=pil_image.split()[-1] if pil_image.mode == 'RGBA' else None)
-            pil_image = background
-        elif pil_image.mode != 'RGB':
-            pil_image = pil_image.convert('RGB')
-
-        output_stream = io.BytesIO()
-        pil_image.save(output_stream, format='PNG')
-        output_stream.seek(0)
-        return output_stream
+        pil_image = PILImage.open(io.BytesIO(decoded))
+    except PILImage.DecompressionBombError as e:
+        raise ImageError('too_large', f"Image trop grande : {e}") from None
+    except Exception as e:
+        raise ImageError('unreadable', f"Image illisible : {e}") from None
+    width, height = pil_image.size
+    if width * height > IMAGE_MAX_PIXELS:
+        raise ImageError(
+            'too_large',
+            f"Image trop grande : {width}×{height} pixels (maximum {IMAGE_MAX_PIXELS})",
+        )
+    return pil_image
+
+
+def probe_image(decoded: bytes) -> ImageInfo:
+    """Format, dimensions et mode d'une image ; lève ImageError si elle est refusée."""
+    return ImageInfo(_open_image(decoded))
+
+
+def normalize_image(decoded: bytes, max_height: int = None):
+    """Prépare une image pour python-docx : JPEG ou PNG, fond blanc.
+
+    Un JPEG ou un PNG déjà compatible (sans transparence, mode pris en charge)
+    et assez petit est renvoyé tel quel. Sinon l'image est aplatie sur fond
+    blanc et, si max_height est donné, réduite (proportions conservées) à
+    cette hauteur en pixels, sans jamais être agrandie ; une photo JPEG est
+    réencodée en JPEG, le reste en PNG. Renvoie (octets, (largeur, hauteur)) ;
+    lève ImageError si l'image est illisible, corrompue ou trop grande.
+    """
+    pil_image = _open_image(decoded)
+    info = ImageInfo(pil_image)
+
+    # Rien à changer : pas de décodage ni de réencodage
+    if not info.needs_work(max_height):
+        return decoded, (info.width, info.height)
+
+    try:
+        return _convert_image(pil_image, info, max_height)
     except Exception as e:
-        print(f"[DEBUG] Conversion Pillow échouée: {e}, utilisation directe")
+        raise ImageError('corrupt', f"Image corrompue : {e}") from None
+
+
+def _convert_image(pil_image, info: ImageInfo, max_height: int = None):
+    from PIL import Image as PILImage
+
+    resize = bool(max_height) and info.height > max_height
+
+    # Réduction avant décodage complet : thumbnail() passe par draft() pour
+    # les JPEG (décodage DCT à 1/2, 1/4 ou 1/8) et par reduce() avant le
+    # rééchantillonnage. Les modes palette/1 bit sont réduits après conversion.
+    if resize and pil_image.mode not in ('P', '1'):
+        pil_image.thumbnail((pil_image.width, max_height), PILImage.LANCZOS)
+
+    # Aplatir la transparence sur fond blanc, ramener les autres modes à RGB
+    if pil_image.mode == 'P' or 'transparency' in pil_image.info:
+        pil_image = pil_image.convert('RGBA')
+    if pil_image.mode in ('RGBA', 'LA'):
+        background = PILImage.new('RGB', pil_image.size, (255, 255, 255))
+        background.paste(pil_image, mask=pil_image.split()[-1])
+        pil_image = background
+    elif pil_image.mode not in ('RGB', 'L'):
+        pil_image = pil_image.convert('RGB')
+
+    if resize:
+        pil_image.thumbnail((pil_image.width, max_height), PILImage.LANCZOS)
+
+    output_stream = io.BytesIO()
+    if info.format == 'JPEG':
+        pil_image.save(output_stream, format='JPEG', quality=IMAGE_JPEG_QUALITY)
+    else:
+        pil_image.save(output_stream, format='PNG')
+    return output_stream.getvalue(), pil_image.size
+
+
+def decode_base64_image(base64_str, height=None) -> io.BytesIO:
+    """Décode une image (base64, octets bruts ou asset) et la prépare pour python-docx (JPEG ou PNG).
+
+    height est la hauteur d'affichage (Length) : l'image est alors réduite à
+    IMAGE_MAX_DPI pour cette hauteur, ce qui évite d'embarquer des pixels
+    que Word n'affichera pas. Lève ImageError si l'image est refusée.
+    Si l'image a été préparée à l'avance (voir image_prep), ses octets sont repris.
+    """
+    images = current_images()
+    if images is not None:
+        prepared = images.take(base64_str, height)
+        if prepared is not None:
+            return prepared
+    with timed_stage('decode_image'):
+        return _decode_base64_image(base64_str, height)
+
+
+def _decode_base64_image(base64_str, height=None) -> io.BytesIO:
+    decoded = load_image_bytes(base64_str)
+
+    stats = current_stats()
+    if stats is not None:
+        stats.add_image(len(decoded))
+
+    max_height = target_pixels(height)
+    asset = asset_hash(base64_str)
+
+    # Les images du stock sont déjà normalisées
+    if asset and max_height is None:
         return io.BytesIO(decoded)
 
+    # Une même image affichée à deux tailles donne deux entrées distinctes
+    digest = f"{asset or content_hash(decoded)}@{max_height or 0}"
+    normalized = image_cache.get(digest)
+    if stats is not None:
+        stats.add_image_lookup(normalized is not None)
+    if normalized is not None:
+        return io.BytesIO(normalized)
+
+    try:
+        normalized, _ = normalize_image(decoded, max_height)
+    except ImageError as e:
+        if stats is not None:
+            stats.add_image_error(e.code)
+        raise
+    image_cache.put(digest, normalized)
+    return io.BytesIO(normalized)
+
 
 def format_date_fr(date_str: str) -> str:
     """Formate une date en français (ex: 15 janvier 2024)."""
@@ -101,13 +252,6 @@ def add_page_number_field(paragraph):
     run._r.append(fldChar3)
 
 
-def set_cell_shading(cell, color_hex: str):
-    """Applique une couleur de fond à une cellule."""
-    shading_elm = OxmlElement('w:shd')
-    shading_elm.set(qn('w:fill'), color_hex.lstrip('#'))
-    cell._tc.get_or_add_tcPr().append(shading_elm)
-
-
 def remove_table_borders(table):
     """Supprime toutes les bordures d'un tableau."""
     tbl_element = table._tbl
@@ -123,77 +267,29 @@ def remove_table_borders(table):
     tbl_pr.append(tbl_borders)
 
 
-def add_centered_paragraph(doc, space_after: int = 0):
-    """Crée un paragraphe centré sans indentation (pour page de garde)."""
-    para = doc.add_paragraph()
-    para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    para.paragraph_format.first_line_indent = Cm(0)
-    para.paragraph_format.left_indent = Cm(0)
-    para.paragraph_format.space_after = Pt(space_after)
-    para.paragraph_format.space_before = Pt(0)
-    return para
-
-
-def create_toc_entry(doc, text: str, level: int = 1, page: str = ""):
-    """Crée une entrée de table des matières avec tabulation et points de suite."""
-    paragraph = doc.add_paragraph()
-    paragraph.paragraph_format.first_line_indent = Cm(0)
-    paragraph.paragraph_format.space_after = Pt(4)
-
-    # Indentation selon le niveau
-    if level == 1:
-        paragraph.paragraph_format.left_indent = Cm(0)
-    elif level == 2:
-        paragraph.paragraph_format.left_indent = Cm(0.75)
-    else:
-        paragraph.paragraph_format.left_indent = Cm(1.5)
-
-    # Tabulation avec points de suite à 15cm
-    tab_stops = paragraph.paragraph_format.tab_stops
-    tab_stops.add_tab_stop(Cm(15), WD_TAB_ALIGNMENT.RIGHT, WD_TAB_LEADER.DOTS)
-
-    # Texte du titre
-    run = paragraph.add_run(text)
-    if level == 1:
-        run.bold = True
-        run.font.size = Pt(11)
-    elif level == 2:
-        run.font.size = Pt(10)
-    else:
-        run.font.size = Pt(10)
-        run.italic = True
-
-    # Tabulation + numéro de page
-    paragraph.add_run("\t")
-    page_run = paragraph.add_run(page)
-    page_run.font.size = Pt(11 if level == 1 else 10)
-    if level == 1:
-        page_run.bold = True
-
+def create_toc(doc, data, outline=None):
+    """Crée une table des matières avec numérotation automatique.
 
-def create_toc(doc, data):
-    """Crée une table des matières avec numérotation automatique."""
-    page_num = 3
+    outline est le plan du rapport (report_outline), calculé ici s'il n'est
+    pas fourni ; ses numéros de page sont ceux de la pagination estimée.
+    """
+    if outline is None:
+        outline = report_outline(data)
+    builder = BodyBuilder(doc)
 
     if data.include_thanks:
-        create_toc_entry(doc, "REMERCIEMENTS", 1, str(page_num))
-        page_num += 1
+        builder.toc_entry("REMERCIEMENTS", 1, str(outline.thanks_page))
 
     if data.include_abstract:
-        create_toc_entry(doc, "RÉSUMÉ", 1, str(page_num))
-        page_num += 1
-
-    for chapter_idx, chapter in enumerate(data.chapters, 1):
-        create_toc_entry(doc, f"{chapter_idx}. {chapter.title}", 1, str(page_num))
-        for sub_idx, sub in enumerate(chapter.children, 1):
-            create_toc_entry(doc, f"{chapter_idx}.{sub_idx}. {sub.title}", 2, str(page_num))
-            if hasattr(sub, 'children') and sub.children:
-                for subsub_idx, subsub in enumerate(sub.children, 1):
-                    create_toc_entry(doc, f"{chapter_idx}.{sub_idx}.{subsub_idx}. {subsub.title}", 3, str(page_num))
-        page_num += 1
+        builder.toc_entry("RÉSUMÉ", 1, str(outline.abstract_page))
+
+    for level, number, title, page in outline:
+        builder.toc_entry(f"{number} {title}", level, str(page))
 
     if data.include_annexes:
-        create_toc_entry(doc, "ANNEXES", 1, str(page_num))
+        builder.toc_entry("ANNEXES", 1, str(outline.end_page))
+
+    builder.flush()
 
 
 def setup_document_styles(doc, style_config):
@@ -271,11 +367,11 @@ def setup_header_with_logos(section, data):
     para_left = cell_left.paragraphs[0]
     para_left.alignment = WD_ALIGN_PARAGRAPH.LEFT
     para_left.paragraph_format.first_line_indent = Cm(0)
-    if data.logos.logo_ecole and len(data.logos.logo_ecole) > 100:
+    if has_image(data.logos.logo_ecole):
         try:
-            img = decode_base64_image(data.logos.logo_ecole)
+            img = decode_base64_image(data.logos.logo_ecole, HEADER_LOGO_HEIGHT)
             run = para_left.add_run()
-            run.add_picture(img, height=Cm(1.2))
+            run.add_picture(img, height=HEADER_LOGO_HEIGHT)
         except:
             pass
 
@@ -290,62 +386,15 @@ def setup_header_with_logos(section, data):
     para_right = cell_right.paragraphs[0]
     para_right.alignment = WD_ALIGN_PARAGRAPH.RIGHT
     para_right.paragraph_format.first_line_indent = Cm(0)
-    if data.logos.logo_entreprise and len(data.logos.logo_entreprise) > 100:
+    if has_image(data.logos.logo_entreprise):
         try:
-            img = decode_base64_image(data.logos.logo_entreprise)
+            img = decode_base64_image(data.logos.logo_entreprise, HEADER_LOGO_HEIGHT)
             run = para_right.add_run()
-            run.add_picture(img, height=Cm(1.2))
+            run.add_picture(img, height=HEADER_LOGO_HEIGHT)
         except:
             pass
 
 
-def add_cell_paragraph(cell, space_after: int = 0):
-    """Crée un paragraphe sans indentation dans une cellule."""
-    para = cell.add_paragraph()
-    para.paragraph_format.first_line_indent = Cm(0)
-    para.paragraph_format.left_indent = Cm(0)
-    para.paragraph_format.space_after = Pt(space_after)
-    return para
-
-
-def set_table_border(table, color_hex: str, size: str = '6'):
-    """Applique une bordure colorée à un tableau."""
-    tbl_element = table._tbl
-    tbl_pr = tbl_element.find(qn('w:tblPr'))
-    if tbl_pr is None:
-        tbl_pr = OxmlElement('w:tblPr')
-        tbl_element.insert(0, tbl_pr)
-    tbl_borders = OxmlElement('w:tblBorders')
-    for border_name in ['top', 'left', 'bottom', 'right']:
-        border = OxmlElement(f'w:{border_name}')
-        border.set(qn('w:val'), 'single')
-        border.set(qn('w:sz'), size)
-        border.set(qn('w:color'), color_hex.lstrip('#'))
-        tbl_borders.append(border)
-    # Intérieurs vides
-    for border_name in ['insideH', 'insideV']:
-        border = OxmlElement(f'w:{border_name}')
-        border.set(qn('w:val'), 'nil')
-        tbl_borders.append(border)
-    tbl_pr.append(tbl_borders)
-
-
-def set_table_border_top(table, color_hex: str, size: str = '6'):
-    """Applique une bordure uniquement en haut du tableau."""
-    tbl_element = table._tbl
-    tbl_pr = tbl_element.find(qn('w:tblPr'))
-    if tbl_pr is None:
-        tbl_pr = OxmlElement('w:tblPr')
-        tbl_element.insert(0, tbl_pr)
-    tbl_borders = OxmlElement('w:tblBorders')
-    border = OxmlElement('w:top')
-    border.set(qn('w:val'), 'single')
-    border.set(qn('w:sz'), size)
-    border.set(qn('w:color'), color_hex.lstrip('#'))
-    tbl_borders.append(border)
-    tbl_pr.append(tbl_borders)
-
-
 def setup_footer_with_page_number(section, data):
     """Configure le pied de page : entreprise à gauche, numéro au centre, nom à droite."""
     footer = section.footer
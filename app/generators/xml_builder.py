@@ -0,0 +1,125 @@
+"""
+Construction groupée de paragraphes WordprocessingML (chapitres, table des matières,
+pages de garde).
+
+Les paragraphes sont écrits sous forme de texte XML échappé, analysés en une
+seule fois puis insérés dans le corps du document. Le XML produit est
+identique à celui des appels python-docx équivalents (add_heading,
+add_paragraph, add_run...), sans leur coût par objet.
+"""
+from xml.sax.saxutils import escape
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Cm
+
+# Gris des textes d'indication (« [Contenu à rédiger...] »)
+HINT_COLOR = '808080'
+_HINT_PROPERTIES = f'<w:i/><w:color w:val="{HINT_COLOR}"/>'
+
+# Tabulation droite avec points de suite à 15 cm (en twips)
+TOC_TAB_POS = Cm(15).twips
+
+# Mise en forme des entrées de table des matières par niveau :
+# (retrait gauche en twips, propriétés du titre, propriétés du numéro de page)
+_TOC_LEVELS = {
+    1: (Cm(0).twips, '<w:b/><w:sz w:val="22"/>', '<w:b/><w:sz w:val="22"/>'),
+    2: (Cm(0.75).twips, '<w:sz w:val="20"/>', '<w:sz w:val="20"/>'),
+    3: (Cm(1.5).twips, '<w:i/><w:sz w:val="20"/>', '<w:sz w:val="20"/>'),
+}
+
+
+def _run_content(text: str) -> str:
+    """Contenu d'un run pour text, comme python-docx (tabulations, sauts de ligne)."""
+    parts = []
+    buffer = []
+
+    def flush():
+        chunk = ''.join(buffer)
+        if chunk:
+            if len(chunk.strip()) < len(chunk):
+                parts.append(f'<w:t xml:space="preserve">{escape(chunk)}</w:t>')
+            else:
+                parts.append(f'<w:t>{escape(chunk)}</w:t>')
+        buffer.clear()
+
+    for char in text:
+        if char == '\t':
+            flush()
+            parts.append('<w:tab/>')
+        elif char in '\r\n':
+            flush()
+            parts.append('<w:br/>')
+        else:
+            buffer.append(char)
+    flush()
+    return ''.join(parts)
+
+
+def _run(text: str, properties: str = '') -> str:
+    if properties:
+        properties = f'<w:rPr>{properties}</w:rPr>'
+    return f'<w:r>{properties}{_run_content(text)}</w:r>'
+
+
+class BodyBuilder:
+    """Accumule des paragraphes puis les insère d'un bloc dans le document."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._parts = []
+        self._style_ids = {}
+
+    def _style_id(self, name: str):
+        if name not in self._style_ids:
+            self._style_ids[name] = self.doc.part.get_style_id(name, WD_STYLE_TYPE.PARAGRAPH)
+        return self._style_ids[name]
+
+    def heading(self, text: str, level: int):
+        """Équivalent de doc.add_heading(text, level)."""
+        style_id = self._style_id('Title' if level == 0 else f'Heading {level}')
+        properties = f'<w:pPr><w:pStyle w:val="{escape(style_id)}"/></w:pPr>' if style_id else ''
+        content = _run(text) if text else ''
+        self._parts.append(f'<w:p>{properties}{content}</w:p>')
+
+    def hint(self, text: str):
+        """Paragraphe d'indication en italique gris."""
+        self._parts.append(f'<w:p>{_run(text, _HINT_PROPERTIES)}</w:p>')
+
+    def page_break(self):
+        """Équivalent de doc.add_page_break()."""
+        self._parts.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+
+    def toc_entry(self, text: str, level: int = 1, page: str = ""):
+        """Entrée de table des matières : titre, points de suite et numéro de page."""
+        indent, title_properties, page_properties = _TOC_LEVELS.get(level, _TOC_LEVELS[3])
+        self._parts.append(
+            '<w:p><w:pPr>'
+            f'<w:tabs><w:tab w:pos="{TOC_TAB_POS}" w:val="right" w:leader="dot"/></w:tabs>'
+            '<w:spacing w:after="80"/>'
+            f'<w:ind w:firstLine="0" w:left="{indent}"/>'
+            '</w:pPr>'
+            f'{_run(text, title_properties)}'
+            '<w:r><w:tab/></w:r>'
+            f'{_run(page, page_properties)}'
+            '</w:p>'
+        )
+
+    def add_xml(self, xml: str):
+        """Ajoute des éléments de corps déjà sérialisés (paragraphes, tableaux)."""
+        self._parts.append(xml)
+
+    def flush(self) -> list:
+        """Insère les éléments accumulés à la fin du corps (avant sectPr) et les renvoie."""
+        if not self._parts:
+            return []
+        fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(self._parts)}</w:body>')
+        self._parts.clear()
+
+        body = self.doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        index = body.index(sect_pr) if sect_pr is not None else len(body)
+        elements = list(fragment)
+        body[index:index] = elements
+        return elements
@@ -1,8 +1,26 @@
 """
 Pydantic models for the report generator.
 """
-from pydantic import BaseModel
-from typing import Optional
+import math
+import os
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, Optional, Union
+
+# Taille maximale d'une image (octets du fichier)
+IMAGE_MAX_BYTES = int(os.environ.get('REPORT_IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+
+# La même image en data URL base64 (en-tête « data:image/...;base64, » compris)
+IMAGE_MAX_CHARS = 4 * math.ceil(IMAGE_MAX_BYTES / 3) + 256
+
+# Page A4 (voir base_document.build_base_document), en cm
+PAGE_WIDTH_CM = 21.0
+PAGE_HEIGHT_CM = 29.7
+
+# Image : data URL base64, référence « asset:<empreinte> » ou octets bruts
+ImageSource = Optional[Union[
+    Annotated[str, Field(max_length=IMAGE_MAX_CHARS)],
+    Annotated[bytes, Field(max_length=IMAGE_MAX_BYTES)],
+]]
 
 
 class ChapterItem(BaseModel):
@@ -35,34 +53,48 @@ class GanttTask(BaseModel):
 class StyleConfig(BaseModel):
     """Configuration des styles typographiques."""
     font_family: str = "Times New Roman"
-    font_size: int = 12
-    line_spacing: float = 1.5
-    title1_size: int = 16
+    font_size: int = Field(12, gt=0)
+    line_spacing: float = Field(1.5, gt=0)
+    title1_size: int = Field(16, gt=0)
     title1_bold: bool = True
     title1_color: str = "#1a365d"
-    title2_size: int = 14
+    title2_size: int = Field(14, gt=0)
     title2_bold: bool = True
     title2_color: str = "#000000"
-    title3_size: int = 12
+    title3_size: int = Field(12, gt=0)
     title3_italic: bool = True
     title3_color: str = "#333333"
 
 
 class PageConfig(BaseModel):
     """Configuration de la mise en page."""
-    margin_top: float = 2.5
-    margin_bottom: float = 2.5
-    margin_left: float = 2.5
-    margin_right: float = 2.5
+    margin_top: float = Field(2.5, ge=0)
+    margin_bottom: float = Field(2.5, ge=0)
+    margin_left: float = Field(2.5, ge=0)
+    margin_right: float = Field(2.5, ge=0)
     show_page_number: bool = True
     show_student_name: bool = True
 
+    @model_validator(mode='after')
+    def _check_margins(self):
+        # Les marges doivent laisser une zone de texte sur la page A4
+        if self.margin_top + self.margin_bottom >= PAGE_HEIGHT_CM:
+            raise ValueError(f"Marges haute et basse trop grandes (moins de {PAGE_HEIGHT_CM:g} cm)")
+        if self.margin_left + self.margin_right >= PAGE_WIDTH_CM:
+            raise ValueError(f"Marges gauche et droite trop grandes (moins de {PAGE_WIDTH_CM:g} cm)")
+        return self
+
 
 class LogosConfig(BaseModel):
-    """Configuration des logos et images."""
-    logo_ecole: Optional[str] = None
-    logo_entreprise: Optional[str] = None
-    image_centrale: Optional[str] = None
+    """Configuration des logos et images.
+
+    Chaque image est une data URL base64 (requête JSON) ou les octets bruts
+    du fichier (requête multipart), limitée à IMAGE_MAX_BYTES : une image
+    plus grande est refusée dès la validation du JSON.
+    """
+    logo_ecole: ImageSource = None
+    logo_entreprise: ImageSource = None
+    image_centrale: ImageSource = None
 
 
 class ReportData(BaseModel):
@@ -0,0 +1,12 @@
+"""
+Routes de l'API regroupées par fonctionnalité.
+"""
+from .jobs import router as jobs_router
+from .debug import router as debug_router
+from .assets import router as assets_router
+
+__all__ = [
+    'jobs_router',
+    'debug_router',
+    'assets_router',
+]
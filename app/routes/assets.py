@@ -0,0 +1,70 @@
+"""
+Routes du stock d'images : téléversement unique, puis référence par empreinte.
+"""
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from starlette.datastructures import UploadFile
+
+from app.generators.assets import add_asset, asset_store, is_asset_hash
+from app.services import format_size, read_form, report_pool
+
+router = APIRouter(prefix="/assets", tags=["assets"])
+
+# Taille maximale d'une image téléversée (octets)
+ASSET_MAX_UPLOAD = int(os.environ.get('REPORT_ASSET_MAX_UPLOAD', str(10 * 1024 * 1024)))
+
+# Champ multipart portant l'image, et marge du corps au-delà de l'image
+# (délimiteurs, en-têtes de la partie)
+FILE_FIELD = 'file'
+_MULTIPART_OVERHEAD = 64 * 1024
+
+ASSET_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [FILE_FIELD],
+                    "properties": {FILE_FIELD: {"type": "string", "format": "binary"}},
+                }
+            },
+        },
+    }
+}
+
+
+@router.post("", status_code=201, openapi_extra=ASSET_REQUEST_BODY)
+async def upload_asset(request: Request):
+    # Corps compté pendant l'analyse du formulaire, même envoyé par morceaux
+    form = await read_form(request, ASSET_MAX_UPLOAD + _MULTIPART_OVERHEAD)
+    try:
+        file = form.get(FILE_FIELD)
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=422, detail=f"Champ '{FILE_FIELD}' manquant")
+        content = await file.read(ASSET_MAX_UPLOAD + 1)
+    finally:
+        await form.close()
+    if not content:
+        raise HTTPException(status_code=422, detail="Fichier vide")
+    if len(content) > ASSET_MAX_UPLOAD:
+        raise HTTPException(status_code=413, detail=f"Image limitée à {format_size(ASSET_MAX_UPLOAD)}")
+
+    # Normalisation (Pillow) dans un worker, une seule fois par image
+    try:
+        return await report_pool.run(add_asset, content)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/{digest}")
+async def get_asset(digest: str):
+    if not is_asset_hash(digest) or not asset_store.exists(digest):
+        raise HTTPException(status_code=404, detail="Image inconnue ou expirée")
+    return FileResponse(
+        asset_store.path(digest),
+        media_type=asset_store.media_type(digest),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
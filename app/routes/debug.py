@@ -0,0 +1,24 @@
+"""
+Routes de débogage réservées aux administrateurs (profils de génération).
+"""
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.services import PROFILE_HEADER, profile_store, profiling_authorized, iter_file
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, request: Request):
+    if not profiling_authorized(request.headers.get(PROFILE_HEADER, "")):
+        raise HTTPException(status_code=403, detail="Accès réservé")
+    path = profile_store.get(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profil inconnu ou expiré")
+
+    return StreamingResponse(
+        iter_file(path, delete=False),
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename=profil_{profile_id}.zip"}
+    )
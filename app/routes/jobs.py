@@ -0,0 +1,52 @@
+"""
+Routes de l'API de génération asynchrone.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+
+from app.models.schemas import ReportData
+from app.services import (
+    job_queue,
+    JobQueueFull,
+    docx_file_response,
+    read_report_data,
+    REPORT_REQUEST_BODY,
+    version_headers,
+)
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Travail inconnu ou expiré")
+    return job
+
+
+@router.post("", status_code=202, openapi_extra=REPORT_REQUEST_BODY)
+async def submit_job(request: Request, response: Response,
+                     data: ReportData = Depends(read_report_data)):
+    try:
+        job = job_queue.submit(data)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
+    response.headers.update(version_headers(request))
+    return job.to_dict(job_queue.position(job))
+
+
+@router.get("/{job_id}")
+async def job_status(job_id: str):
+    job = _get_job(job_id)
+    return job.to_dict(job_queue.position(job))
+
+
+@router.get("/{job_id}/result")
+async def job_result(job_id: str):
+    job = _get_job(job_id)
+    if job.status == 'error':
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != 'done':
+        raise HTTPException(status_code=409, detail="Génération en cours", headers={"Retry-After": "2"})
+
+    # Le fichier est conservé jusqu'à expiration du travail
+    return docx_file_response(job.path, job.filename, delete=False)
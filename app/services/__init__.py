@@ -0,0 +1,107 @@
+"""
+Services applicatifs (exécution des générations, caches, files d'attente).
+"""
+from .worker_pool import ProgressFile, ReportWorkerPool, report_pool
+from .streaming import (
+    DOCX_MEDIA_TYPE,
+    docx_bytes_response,
+    docx_file_response,
+    iter_file,
+    new_temp_path,
+    pop_file,
+)
+from .batch import MAX_BATCH_SIZE, stream_batch_zip
+from .admission import (
+    AdmissionController,
+    Overloaded,
+    admission,
+    admit_report,
+)
+from .metrics import InFlightMiddleware, MetricsRegistry, registry as metrics_registry
+from .profiling import (
+    PROFILE_HEADER,
+    ProfileStore,
+    profile_store,
+    profiling_authorized,
+    server_timing,
+)
+from .drafts import (
+    PATCH_MEDIA_TYPE,
+    VERSION_HEADER,
+    Draft,
+    DraftStore,
+    draft_store,
+    version_headers,
+)
+from .json_patch import PatchError, apply_patch
+from .jobs import Job, JobQueue, JobQueueFull, job_queue
+from .result_cache import (
+    ResultCache,
+    report_cache,
+    report_cache_key,
+    format_etag,
+    etag_matches,
+)
+from .uploads import (
+    REPORT_BATCH_REQUEST_BODY,
+    REPORT_REQUEST_BODY,
+    check_assets,
+    format_size,
+    read_body,
+    read_form,
+    read_report_batch,
+    read_report_data,
+    report_schemas,
+)
+
+__all__ = [
+    'ProgressFile',
+    'ReportWorkerPool',
+    'report_pool',
+    'DOCX_MEDIA_TYPE',
+    'docx_bytes_response',
+    'docx_file_response',
+    'iter_file',
+    'new_temp_path',
+    'pop_file',
+    'MAX_BATCH_SIZE',
+    'stream_batch_zip',
+    'AdmissionController',
+    'Overloaded',
+    'admission',
+    'admit_report',
+    'InFlightMiddleware',
+    'MetricsRegistry',
+    'metrics_registry',
+    'PROFILE_HEADER',
+    'ProfileStore',
+    'profile_store',
+    'profiling_authorized',
+    'server_timing',
+    'PATCH_MEDIA_TYPE',
+    'VERSION_HEADER',
+    'Draft',
+    'DraftStore',
+    'draft_store',
+    'version_headers',
+    'PatchError',
+    'apply_patch',
+    'Job',
+    'JobQueue',
+    'JobQueueFull',
+    'job_queue',
+    'ResultCache',
+    'report_cache',
+    'report_cache_key',
+    'format_etag',
+    'etag_matches',
+    'REPORT_BATCH_REQUEST_BODY',
+    'REPORT_REQUEST_BODY',
+    'read_body',
+    'read_form',
+    'read_report_batch',
+    'read_report_data',
+    'report_schemas',
+    'check_assets',
+    'format_size',
+]
@@ -0,0 +1,172 @@
+"""
+Contrôle d'admission des générations : limite de concurrence et de coût estimé.
+
+Le coût et la durée d'une génération sont ceux du plan du rapport
+(app.generators.plan.plan_report), calculé sans construire le document.
+"""
+import asyncio
+import math
+import os
+from collections import deque
+from contextlib import asynccontextmanager
+
+# Nombre maximal de générations simultanées (0 = un par worker du pool)
+MAX_CONCURRENT = int(os.environ.get('REPORT_MAX_CONCURRENT', '0'))
+
+# Coût total admis simultanément (unités ≈ Mo de mémoire de pointe)
+MAX_INFLIGHT_COST = float(os.environ.get('REPORT_MAX_INFLIGHT_COST', '256'))
+
+# Requêtes autorisées à attendre une place, et durée maximale d'attente (s)
+MAX_WAITING = int(os.environ.get('REPORT_MAX_WAITING', '16'))
+MAX_WAIT_SECONDS = float(os.environ.get('REPORT_MAX_WAIT_SECONDS', '20'))
+
+
+class Overloaded(Exception):
+    """Capacité de génération dépassée."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Sémaphore pondéré par le coût, avec file d'attente bornée (FIFO).
+
+    Une requête est admise si le nombre de générations et le coût cumulé
+    restent sous les limites ; une requête seule est toujours admise, même si
+    son coût dépasse la limite. Au-delà de la file d'attente ou du délai
+    d'attente, Overloaded est levée immédiatement ; les générations de fond
+    (lots, travaux) attendent leur tour sans limite (reject=False).
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, max_cost: float = MAX_INFLIGHT_COST,
+                 max_waiting: int = MAX_WAITING, max_wait: float = MAX_WAIT_SECONDS):
+        self._max_concurrent = max_concurrent
+        self.max_cost = max_cost
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.inflight = 0
+        self.inflight_cost = 0.0
+        # Durée estimée des générations en cours (plans), pour Retry-After
+        self.inflight_seconds = 0.0
+        self.rejected = 0
+        # Rapport (lissé) entre durées mesurées et estimées : corrige le
+        # modèle de coût pour la machine qui exécute les générations
+        self.duration_scale = 1.0
+        self._waiters = deque()
+
+    @property
+    def max_concurrent(self) -> int:
+        if self._max_concurrent:
+            return self._max_concurrent
+        from .worker_pool import report_pool
+        return max(1, report_pool.max_workers)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self, seconds: float = 0.0) -> int:
+        """Délai suggéré avant une nouvelle tentative (secondes).
+
+        Durée estimée du travail en cours et en attente, plus la requête
+        elle-même (seconds), répartie sur les générations simultanées.
+        """
+        backlog = self.inflight_seconds + seconds + sum(entry[1] for entry in self._waiters)
+        return max(1, math.ceil(self.duration_scale * backlog / self.max_concurrent))
+
+    def _fits(self, cost: float) -> bool:
+        if self.inflight == 0:
+            return True
+        return (self.inflight < self.max_concurrent
+                and self.inflight_cost + cost <= self.max_cost)
+
+    def _take(self, cost: float, seconds: float):
+        self.inflight += 1
+        self.inflight_cost += cost
+        self.inflight_seconds += seconds
+
+    def _release(self, cost: float, seconds: float):
+        self.inflight -= 1
+        self.inflight_cost -= cost
+        self.inflight_seconds -= seconds
+        self._wake()
+
+    def _wake(self):
+        """Admet les requêtes en attente qui tiennent, dans l'ordre d'arrivée."""
+        while self._waiters:
+            waiter_cost, waiter_seconds, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(waiter_cost):
+                break
+            self._waiters.popleft()
+            self._take(waiter_cost, waiter_seconds)
+            future.set_result(None)
+
+    def _reject(self, reason: str, seconds: float):
+        self.rejected += 1
+        raise Overloaded(reason, self.retry_after(seconds))
+
+    async def _acquire(self, cost: float, seconds: float, reject: bool = True):
+        if not self._waiters and self._fits(cost):
+            self._take(cost, seconds)
+            return
+        if reject and len(self._waiters) >= self.max_waiting:
+            self._reject("Serveur saturé, réessayez plus tard", seconds)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (cost, seconds, future)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(future, self.max_wait if reject else None)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Admise juste avant l'annulation : rendre la place
+                self._release(cost, seconds)
+            else:
+                try:
+                    self._waiters.remove(entry)
+                except ValueError:
+                    pass
+                # Une requête retirée en tête de file libère celles qui la suivent
+                self._wake()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self._reject("Délai d'attente dépassé, réessayez plus tard", seconds)
+
+    @asynccontextmanager
+    async def admit(self, cost: float, seconds: float = 1.0, reject: bool = True):
+        """Attend une place pour une génération de coût et de durée estimés donnés.
+
+        Avec reject=False, attend sans limite de file ni de délai.
+        """
+        await self._acquire(cost, seconds, reject)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            yield
+        finally:
+            if seconds > 0:
+                ratio = (loop.time() - started) / seconds
+                self.duration_scale = 0.8 * self.duration_scale + 0.2 * ratio
+            self._release(cost, seconds)
+
+
+admission = AdmissionController()
+
+
+@asynccontextmanager
+async def admit_report(data, reject: bool = True):
+    """Admission d'une génération de data, au coût de son plan (renvoyé).
+
+    Le plan (sans pagination) est calculé hors de la boucle d'événements.
+    Utilisé par /generate, les lots et la file de travaux : toutes les
+    générations partagent le même budget.
+    """
+    from app.generators.plan import plan_report
+
+    plan = await asyncio.to_thread(plan_report, data, False)
+    async with admission.admit(plan.memory_mb, plan.seconds, reject):
+        yield plan
@@ -0,0 +1,101 @@
+"""
+Génération par lot : archive ZIP envoyée au fil de la génération des rapports.
+"""
+import asyncio
+import json
+import os
+import zipfile
+
+from .admission import admit_report
+from .streaming import CHUNK_SIZE
+from .worker_pool import report_pool
+
+# Nombre maximal de rapports par lot
+MAX_BATCH_SIZE = int(os.environ.get('REPORT_MAX_BATCH_SIZE', '200'))
+
+
+class _ZipStream:
+    """Flux non positionnable qui accumule les octets écrits par ZipFile."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Renvoie et vide les octets accumulés."""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def batch_entry_name(index: int, data) -> str:
+    """Nom de l'entrée du rapport dans l'archive (ex: 001_rapport_stage_Dupont.docx)."""
+    nom = (data.nom or 'rapport').replace('/', '_').replace('\\', '_')
+    return f"{index + 1:03d}_rapport_stage_{nom}.docx"
+
+
+async def _generate_indexed(index: int, data):
+    """Génère un rapport du lot ; renvoie (index, chemin, erreur)."""
+    try:
+        # Même budget que /generate : les rapports du lot attendent leur tour
+        async with admit_report(data, reject=False):
+            path, _ = await report_pool.generate(data)
+        return index, path, None
+    except Exception as e:
+        return index, None, f"{type(e).__name__}: {e}"
+
+
+async def stream_batch_zip(reports):
+    """Génère les rapports en parallèle et produit l'archive ZIP par morceaux.
+
+    Les entrées sont ajoutées dans l'ordre de fin de génération. Un rapport en
+    échec donne une entrée .error.txt au lieu d'interrompre le lot, et un
+    manifest.json final récapitule le statut de chaque rapport.
+    """
+    tasks = [asyncio.create_task(_generate_indexed(i, data)) for i, data in enumerate(reports)]
+    stream = _ZipStream()
+    manifest = []
+    try:
+        # Les .docx sont déjà compressés : les entrées sont stockées telles quelles
+        with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as zf:
+            for next_done in asyncio.as_completed(tasks):
+                index, path, error = await next_done
+                name = batch_entry_name(index, reports[index])
+
+                if error is not None:
+                    zf.writestr(f"{name}.error.txt", error)
+                    manifest.append({"index": index, "file": None, "status": "error", "error": error})
+                    yield stream.drain()
+                    continue
+
+                try:
+                    with open(path, 'rb') as src, zf.open(name, 'w') as dst:
+                        while True:
+                            chunk = src.read(CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            dst.write(chunk)
+                            yield stream.drain()
+                finally:
+                    os.unlink(path)
+                manifest.append({"index": index, "file": name, "status": "ok", "error": None})
+                yield stream.drain()
+
+            manifest.sort(key=lambda entry: entry["index"])
+            zf.writestr("manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2))
+        yield stream.drain()
+    finally:
+        # Client déconnecté : annuler les générations restantes et nettoyer
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                _, path, _ = task.result()
+                if path and os.path.exists(path):
+                    os.unlink(path)
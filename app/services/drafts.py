@@ -0,0 +1,190 @@
+"""
+Brouillons de rapport : dernière version acceptée des données de chaque session.
+
+Un rapport reçu en entier est conservé sous un jeton de version
+« <session>.<n> », renvoyé dans l'en-tête X-Report-Version. Le client peut
+ensuite n'envoyer qu'un JSON Patch (RFC 6902) contre cette version : la
+taille de la requête et le temps de lecture suivent alors la modification,
+pas le rapport (images comprises).
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import get_args, get_origin
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.models.schemas import ReportData
+from .json_patch import apply_patch
+
+# Budget mémoire des brouillons (octets, estimé d'après les corps reçus)
+DRAFTS_MAX_BYTES = int(os.environ.get('REPORT_DRAFTS_BYTES', str(64 * 1024 * 1024)))
+
+# Nombre maximal de sessions conservées, et durée d'inactivité avant oubli (secondes)
+DRAFTS_MAX = int(os.environ.get('REPORT_DRAFTS_MAX', '1024'))
+DRAFTS_TTL = int(os.environ.get('REPORT_DRAFTS_TTL', '3600'))
+
+# En-tête portant le jeton de version (réponse, puis requête suivante)
+VERSION_HEADER = 'X-Report-Version'
+
+# Type de contenu d'une soumission par différence
+PATCH_MEDIA_TYPE = 'application/json-patch+json'
+
+# Champs listes de modèles (chapitres, glossaire...) : une modification à
+# l'intérieur d'un élément ne revalide que cet élément
+_ITEM_ADAPTERS = {
+    name: TypeAdapter(get_args(info.annotation)[0])
+    for name, info in ReportData.model_fields.items()
+    if get_origin(info.annotation) is list
+}
+
+
+class Draft:
+    """Version acceptée des données d'une session."""
+
+    __slots__ = ('session', 'version', 'data', 'size', 'used_at', '_doc')
+
+    def __init__(self, session: str, version: int, data: ReportData, size: int, doc=None):
+        self.session = session
+        self.version = version
+        self.data = data
+        self.size = size
+        self.used_at = time.time()
+        self._doc = doc
+
+    @property
+    def token(self) -> str:
+        return f"{self.session}.{self.version}"
+
+    @property
+    def doc(self) -> dict:
+        """Données sous forme JSON (dict), construites au premier patch.
+
+        Les chaînes (images base64 comprises) sont partagées avec data.
+        """
+        if self._doc is None:
+            self._doc = self.data.model_dump()
+        return self._doc
+
+    def patched(self, operations) -> tuple:
+        """(données, document, taille estimée) après application du patch à cette version.
+
+        Seuls les champs de premier niveau touchés par le patch sont
+        revalidés (seuls les éléments touchés, pour une liste dont aucun
+        élément n'est ajouté ou retiré) ; les autres sont repris de la
+        version acceptée. La taille est celle de cette version, corrigée des
+        valeurs ajoutées et retirées par le patch. Lève PatchError ou
+        ValidationError ; le brouillon n'est pas modifié.
+        """
+        doc, changes, size_delta = apply_patch(self.doc, operations)
+        size = max(0, self.size + size_delta)
+        if changes is None or not isinstance(doc, dict):
+            return ReportData.model_validate(doc), doc, size
+
+        # Éléments touchés par champ (None : le champ entier)
+        fields = {}
+        for tokens in changes:
+            fields.setdefault(tokens[0], set()).add(tokens[1] if len(tokens) > 2 else None)
+
+        data = self.data.model_copy()
+        validator = ReportData.__pydantic_validator__
+        for field, items in fields.items():
+            info = ReportData.model_fields.get(field)
+            if info is None:
+                continue
+            if field in _ITEM_ADAPTERS and None not in items:
+                try:
+                    setattr(data, field, _validate_items(getattr(data, field), doc[field], items,
+                                                         _ITEM_ADAPTERS[field]))
+                    continue
+                except ValidationError:
+                    # Erreur rapportée par la validation du champ entier (chemin complet)
+                    pass
+            value = doc[field] if field in doc else info.get_default(call_default_factory=True)
+            validator.validate_assignment(data, field, value)
+        return data, doc, size
+
+
+def _validate_items(current: list, values: list, indexes, adapter: TypeAdapter) -> list:
+    items = list(current)
+    for index in indexes:
+        index = int(index)
+        items[index] = adapter.validate_python(values[index])
+    return items
+
+
+class DraftStore:
+    """Brouillons par session (LRU), bornés en nombre, en octets et en durée."""
+
+    def __init__(self, max_bytes: int = DRAFTS_MAX_BYTES, max_entries: int = DRAFTS_MAX,
+                 ttl: int = DRAFTS_TTL):
+        self.max_bytes = max_bytes
+        # Un brouillon plus gros qu'un quart du budget n'est pas conservé
+        self.max_entry_bytes = max_bytes // 4
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str):
+        """Brouillon désigné par un jeton de version, ou None s'il est inconnu ou dépassé."""
+        session, _, version = (token or '').strip().partition('.')
+        with self._lock:
+            self._sweep()
+            draft = self._entries.get(session)
+            if draft is None or str(draft.version) != version:
+                return None
+            self._entries.move_to_end(session)
+            draft.used_at = time.time()
+            return draft
+
+    def save(self, data: ReportData, size: int, token: str = None, doc=None):
+        """Conserve data comme nouvelle version de la session du jeton (ou d'une nouvelle).
+
+        Renvoie le jeton de la nouvelle version, ou None si le brouillon est
+        trop gros pour être conservé.
+        """
+        session = (token or '').strip().partition('.')[0]
+        with self._lock:
+            previous = self._entries.pop(session, None)
+            if previous is not None:
+                self.size -= previous.size
+            if not 0 <= size <= self.max_entry_bytes:
+                return None
+            if previous is None:
+                session = uuid.uuid4().hex
+            draft = Draft(session, previous.version + 1 if previous else 1, data, size, doc)
+            self._entries[session] = draft
+            self.size += size
+            self._sweep()
+            return draft.token
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _sweep(self):
+        limit = time.time() - self.ttl
+        while self._entries:
+            session, draft = next(iter(self._entries.items()))
+            if (len(self._entries) <= self.max_entries and self.size <= self.max_bytes
+                    and draft.used_at >= limit):
+                break
+            del self._entries[session]
+            self.size -= draft.size
+
+
+def version_headers(request) -> dict:
+    """En-tête X-Report-Version de la réponse, si les données ont été conservées."""
+    token = getattr(request.state, 'report_version', None)
+    return {VERSION_HEADER: token} if token else {}
+
+
+draft_store = DraftStore()
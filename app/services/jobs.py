@@ -0,0 +1,172 @@
+"""
+File de travaux de génération asynchrones (soumission, suivi, téléchargement).
+"""
+import asyncio
+import os
+import time
+import uuid
+
+from .admission import admit_report
+from .streaming import new_temp_path
+from .worker_pool import ProgressFile, report_pool
+
+# Nombre maximal de travaux en attente
+JOBS_MAX_QUEUE = int(os.environ.get('REPORT_JOBS_MAX_QUEUE', '100'))
+
+# Nombre de travaux exécutés simultanément (0 = un par worker du pool)
+JOBS_CONCURRENCY = int(os.environ.get('REPORT_JOBS_CONCURRENCY', '0'))
+
+# Durée de conservation d'un travail terminé et de son résultat (secondes)
+JOBS_TTL = int(os.environ.get('REPORT_JOBS_TTL', '600'))
+
+
+class JobQueueFull(Exception):
+    """La file de travaux a atteint sa profondeur maximale."""
+
+
+class Job:
+    """Travail de génération d'un rapport."""
+
+    def __init__(self, data):
+        self.id = uuid.uuid4().hex
+        self.data = data
+        self.filename = f"rapport_stage_{data.nom or 'rapport'}.docx"
+        self.status = 'queued'
+        self.error = None
+        self.path = None
+        self.progress = ProgressFile(new_temp_path('.progress'))
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'error')
+
+    def to_dict(self, position: int = None) -> dict:
+        """État du travail tel que renvoyé par l'API."""
+        if self.status == 'running':
+            stage, fraction = self.progress.read()
+        elif self.status == 'done':
+            stage, fraction = None, 1.0
+        else:
+            stage, fraction = None, 0.0
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stage": stage,
+            "progress": fraction,
+            "position": position,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def discard(self):
+        """Supprime les fichiers associés au travail."""
+        for path in (self.path, self.progress.path):
+            if path:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+        self.path = None
+        self.data = None
+
+
+class JobQueue:
+    """File bornée de travaux, consommée par des tâches asyncio locales.
+
+    La génération elle-même s'exécute dans report_pool ; la concurrence de la
+    file se règle indépendamment du nombre de requêtes HTTP.
+    """
+
+    def __init__(self, max_depth: int = JOBS_MAX_QUEUE, concurrency: int = JOBS_CONCURRENCY,
+                 ttl: int = JOBS_TTL):
+        self.max_depth = max_depth
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self._jobs = {}
+        self._pending = []
+        self._queue = None
+        self._consumers = []
+
+    def start(self):
+        """Démarre les consommateurs (à appeler depuis la boucle d'événements)."""
+        if self._queue is not None:
+            return
+        concurrency = self.concurrency or max(1, report_pool.max_workers)
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(concurrency)]
+
+    async def stop(self):
+        """Arrête les consommateurs et supprime les résultats conservés."""
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        self._queue = None
+        for job in self._jobs.values():
+            job.discard()
+        self._jobs.clear()
+        self._pending.clear()
+
+    def submit(self, data) -> Job:
+        """Ajoute un travail à la file ; lève JobQueueFull si elle est pleine."""
+        if self._queue is None:
+            self.start()
+        self._sweep()
+        job = Job(data)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            job.discard()
+            raise JobQueueFull(f"File de génération pleine ({self.max_depth} travaux)")
+        self._jobs[job.id] = job
+        self._pending.append(job.id)
+        return job
+
+    def get(self, job_id: str):
+        """Renvoie le travail job_id, ou None s'il est inconnu ou expiré."""
+        self._sweep()
+        return self._jobs.get(job_id)
+
+    def position(self, job: Job):
+        """Position du travail dans la file d'attente (0 = prochain), ou None."""
+        try:
+            return self._pending.index(job.id)
+        except ValueError:
+            return None
+
+    def _sweep(self):
+        """Supprime les travaux terminés depuis plus de ttl secondes."""
+        limit = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at < limit]
+        for job_id in expired:
+            self._jobs.pop(job_id).discard()
+
+    async def _consume(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                # Même budget que /generate : le travail reste en file jusqu'à son admission
+                async with admit_report(job.data, reject=False):
+                    self._pending.remove(job.id)
+                    job.status = 'running'
+                    job.path, _ = await report_pool.generate(job.data, job.progress)
+                job.status = 'done'
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status = 'error'
+                job.error = f"{type(e).__name__}: {e}"
+            finally:
+                if job.id in self._pending:
+                    self._pending.remove(job.id)
+                job.finished_at = time.time()
+                # Les données (logos compris) ne sont plus nécessaires
+                job.data = None
+                self._queue.task_done()
+
+
+job_queue = JobQueue()
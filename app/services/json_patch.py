@@ -0,0 +1,234 @@
+"""
+Application de JSON Patch (RFC 6902) sans modifier le document d'origine.
+
+Seuls les conteneurs situés sur les chemins modifiés sont copiés (une fois
+par patch) : le coût suit la taille du patch, pas celle du document, et le
+document d'origine reste intact si une opération échoue. La variation de
+taille du document est mesurée sur les seules valeurs ajoutées et retirées.
+"""
+import copy
+
+_OPERATIONS = ('add', 'remove', 'replace', 'move', 'copy', 'test')
+
+
+class PatchError(ValueError):
+    """Patch invalide ou inapplicable au document."""
+
+
+def parse_pointer(pointer) -> list:
+    """Jetons d'un JSON Pointer (RFC 6901) : « /a/b~1c » → ['a', 'b/c']."""
+    if not isinstance(pointer, str):
+        raise PatchError("Chemin JSON Pointer attendu")
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f"Chemin invalide : {pointer!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _index(container: list, token: str, append: bool = False) -> int:
+    if append and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == '0'):
+        raise PatchError(f"Indice de tableau invalide : {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise PatchError(f"Indice hors du tableau : {token}")
+    return index
+
+
+def json_size(value) -> int:
+    """Taille approximative (octets) de value sérialisée en JSON.
+
+    Les octets bruts (images reçues en multipart) comptent pour leur longueur.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            size += len(value) + 2
+        elif isinstance(value, (bytes, bytearray)):
+            size += len(value)
+        elif isinstance(value, dict):
+            size += 2 + sum(len(key) + 4 for key in value)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            size += 2 + len(value)
+            stack.extend(value)
+        elif value is None or value is True:
+            size += 4
+        elif value is False:
+            size += 5
+        else:
+            size += len(repr(value))
+    return size
+
+
+def _entry_size(parent, key, value) -> int:
+    # Valeur et sa place dans le conteneur : « "clé": » ou séparateur
+    return json_size(value) + (len(key) + 4 if isinstance(parent, dict) else 1)
+
+
+def _equal(a, b) -> bool:
+    # Égalité JSON : true n'est pas égal à 1
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_equal(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    if type(a) in (int, float) and type(b) in (int, float):
+        return a == b
+    return type(a) is type(b) and a == b
+
+
+class _Patch:
+    """Document en cours de modification, copié au fil des chemins touchés."""
+
+    def __init__(self, doc):
+        self.doc = doc
+        # Variation de taille du document (voir json_size)
+        self.size_delta = 0
+        # Conteneurs déjà copiés par ce patch (conservés pour que leur id reste valable)
+        self._owned = {}
+
+    def _own(self, container):
+        if id(container) in self._owned:
+            return container
+        owned = container.copy()
+        self._owned[id(owned)] = owned
+        return owned
+
+    def _get(self, tokens: list):
+        node = self.doc
+        for token in tokens:
+            if isinstance(node, dict):
+                if token not in node:
+                    raise PatchError(f"Chemin introuvable : /{'/'.join(tokens)}")
+                node = node[token]
+            elif isinstance(node, list):
+                node = node[_index(node, token)]
+            else:
+                raise PatchError(f"Chemin introuvable : /{'/'.join(tokens)}")
+        return node
+
+    def _parent(self, tokens: list):
+        """Conteneur parent du dernier jeton, copié ainsi que ses ancêtres."""
+        if not isinstance(self.doc, (dict, list)):
+            raise PatchError(f"Chemin introuvable : /{'/'.join(tokens)}")
+        self.doc = node = self._own(self.doc)
+        for token in tokens[:-1]:
+            if isinstance(node, dict):
+                if token not in node:
+                    raise PatchError(f"Chemin introuvable : /{'/'.join(tokens)}")
+                key = token
+            else:
+                key = _index(node, token)
+            child = node[key]
+            if not isinstance(child, (dict, list)):
+                raise PatchError(f"Chemin introuvable : /{'/'.join(tokens)}")
+            node[key] = node = self._own(child)
+        return node
+
+    def _replace_root(self, value):
+        self.size_delta += json_size(value) - json_size(self.doc)
+        self.doc = value
+
+    def add(self, tokens: list, value):
+        if not tokens:
+            self._replace_root(value)
+            return
+        parent = self._parent(tokens)
+        key = tokens[-1]
+        if isinstance(parent, dict):
+            if key in parent:
+                self.size_delta -= _entry_size(parent, key, parent[key])
+            parent[key] = value
+        else:
+            parent.insert(_index(parent, key, append=True), value)
+        self.size_delta += _entry_size(parent, key, value)
+
+    def remove(self, tokens: list):
+        if not tokens:
+            raise PatchError("Impossible de supprimer la racine du document")
+        parent = self._parent(tokens)
+        key = tokens[-1]
+        if isinstance(parent, dict):
+            if key not in parent:
+                raise PatchError(f"Chemin introuvable : /{'/'.join(tokens)}")
+            value = parent.pop(key)
+        else:
+            value = parent.pop(_index(parent, key))
+        self.size_delta -= _entry_size(parent, key, value)
+        return value
+
+    def replace(self, tokens: list, value):
+        if not tokens:
+            self._replace_root(value)
+            return
+        self._get(tokens)
+        parent = self._parent(tokens)
+        key = tokens[-1] if isinstance(parent, dict) else _index(parent, tokens[-1])
+        self.size_delta += json_size(value) - json_size(parent[key])
+        parent[key] = value
+
+    def apply(self, operation) -> tuple:
+        """Applique une opération ; renvoie les chemins (jetons) modifiés."""
+        if not isinstance(operation, dict):
+            raise PatchError("Opération JSON Patch attendue (objet)")
+        name = operation.get('op')
+        if name not in _OPERATIONS:
+            raise PatchError(f"Opération inconnue : {name!r}")
+        path = parse_pointer(operation.get('path'))
+        if name in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f"Valeur manquante pour '{name}'")
+
+        if name == 'add':
+            self.add(path, operation['value'])
+        elif name == 'remove':
+            self.remove(path)
+        elif name == 'replace':
+            self.replace(path, operation['value'])
+        elif name == 'test':
+            if not _equal(self._get(path), operation['value']):
+                raise PatchError(f"Test échoué pour {operation['path']}")
+            return ()
+        elif name == 'copy':
+            # Copie profonde : les deux emplacements ne partagent rien
+            self.add(path, copy.deepcopy(self._get(parse_pointer(operation.get('from')))))
+        else:
+            source = parse_pointer(operation.get('from'))
+            if path[:len(source)] == source and len(path) > len(source):
+                raise PatchError("Impossible de déplacer une valeur dans l'un de ses enfants")
+            if path == source:
+                self._get(source)
+                return ()
+            self.add(path, self.remove(source))
+            return path, source
+        return (path,)
+
+
+def apply_patch(doc, operations) -> tuple:
+    """Applique un patch (liste d'opérations RFC 6902) à doc.
+
+    Renvoie (nouveau document, chemins modifiés, variation de taille) : les
+    chemins sont une liste de listes de jetons, ou None si la racine du
+    document elle-même a été remplacée ; la variation est celle de json_size.
+    doc n'est jamais modifié. Lève PatchError si une opération est invalide
+    ou échoue.
+    """
+    if not isinstance(operations, list):
+        raise PatchError("Un patch est un tableau d'opérations")
+    patch = _Patch(doc)
+    changes = []
+    for position, operation in enumerate(operations):
+        try:
+            paths = patch.apply(operation)
+        except PatchError as e:
+            raise PatchError(f"Opération {position} : {e}") from None
+        if changes is not None:
+            changes.extend(paths)
+            if any(not tokens for tokens in paths):
+                changes = None
+    return patch.doc, changes, patch.size_delta
@@ -0,0 +1,234 @@
+"""
+Métriques de génération exposées au format texte Prometheus (sans dépendance externe).
+"""
+import threading
+
+from .admission import admission
+from .result_cache import report_cache
+
+# Bornes des histogrammes
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (16e3, 64e3, 256e3, 1e6, 4e6, 16e6, 64e6)
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames=(), function=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Valeur éventuellement lue au moment du rendu (métrique sans labels)
+        self._function = function
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, '') for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        if self._function is not None:
+            with self._lock:
+                self._values[()] = self._function()
+        with self._lock:
+            items = sorted(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), self._empty())]
+        for key, value in items:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _empty(self):
+        return 0.0
+
+    def _render_sample(self, key, value) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Compteur monotone."""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Valeur instantanée."""
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Histogramme à bornes fixes (buckets cumulés, somme et nombre)."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def _empty(self):
+        return [[0] * len(self.buckets), 0.0]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = self._empty()
+            counts = state[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            state[1] += value
+
+    def _render_sample(self, key, value) -> list:
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames + ('le',), key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble de métriques rendues ensemble sur /metrics."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4"
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self.register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self.register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+STAGE_DURATION = registry.histogram(
+    'report_stage_duration_seconds', "Durée de chaque étape de generate_report.",
+    ('stage', 'cover_model'))
+GENERATION_DURATION = registry.histogram(
+    'report_generation_duration_seconds', "Durée totale de generate_report.",
+    ('cover_model',))
+OUTPUT_SIZE = registry.histogram(
+    'report_output_size_bytes', "Taille des documents générés.",
+    ('cover_model',), buckets=SIZE_BUCKETS)
+OUTPUT_BYTES = registry.counter(
+    'report_output_bytes_total', "Octets de documents générés.")
+IMAGE_BYTES = registry.counter(
+    'report_image_bytes_decoded_total', "Octets d'images base64 décodées.")
+IMAGES_DECODED = registry.counter(
+    'report_images_decoded_total', "Nombre d'images décodées.")
+IMAGE_CACHE_HITS = registry.counter(
+    'report_image_cache_hits_total', "Images normalisées servies depuis le cache des workers.")
+IMAGE_CACHE_MISSES = registry.counter(
+    'report_image_cache_misses_total', "Images à normaliser (absentes du cache des workers).")
+IMAGE_ERRORS = registry.counter(
+    'report_image_errors_total', "Images refusées, par motif.",
+    ('reason',))
+GENERATIONS = registry.counter(
+    'report_generations_total', "Générations terminées, par résultat.",
+    ('cover_model', 'result'))
+GENERATIONS_IN_FLIGHT = registry.gauge(
+    'report_generations_in_flight', "Générations en cours dans le pool.")
+HTTP_IN_FLIGHT = registry.gauge(
+    'http_requests_in_flight', "Requêtes HTTP en cours de traitement.")
+
+registry.counter('report_cache_hits_total', "Documents servis depuis le cache.",
+                 function=lambda: report_cache.hits)
+registry.counter('report_cache_misses_total', "Documents absents du cache.",
+                 function=lambda: report_cache.misses)
+registry.gauge('report_cache_size_bytes', "Octets occupés par le cache de documents.",
+               function=lambda: report_cache.size)
+registry.counter('report_admission_rejected_total', "Requêtes refusées par le contrôle d'admission.",
+                 function=lambda: admission.rejected)
+registry.gauge('report_admission_waiting', "Requêtes en attente d'admission.",
+               function=lambda: admission.waiting)
+
+
+def observe_report(stats):
+    """Enregistre les mesures d'une génération terminée."""
+    model = stats.cover_model
+    for stage, duration in stats.durations.items():
+        STAGE_DURATION.observe(duration, stage=stage, cover_model=model)
+    GENERATION_DURATION.observe(stats.total, cover_model=model)
+    OUTPUT_SIZE.observe(stats.output_bytes, cover_model=model)
+    OUTPUT_BYTES.inc(stats.output_bytes)
+    IMAGE_BYTES.inc(stats.image_bytes)
+    IMAGES_DECODED.inc(stats.images_decoded)
+    IMAGE_CACHE_HITS.inc(stats.image_cache_hits)
+    IMAGE_CACHE_MISSES.inc(stats.image_cache_misses)
+    for reason, count in stats.image_errors.items():
+        IMAGE_ERRORS.inc(count, reason=reason)
+    GENERATIONS.inc(cover_model=model, result='ok')
+
+
+class InFlightMiddleware:
+    """Middleware ASGI comptant les requêtes HTTP en cours."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
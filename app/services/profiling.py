@@ -0,0 +1,156 @@
+"""
+Profilage à la demande d'une génération (cProfile, tracemalloc) et en-tête Server-Timing.
+"""
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+import zipfile
+
+from .streaming import new_temp_path
+
+# Jeton d'administration requis pour le profilage (désactivé s'il est vide)
+PROFILE_TOKEN = os.environ.get('REPORT_PROFILE_TOKEN', '')
+PROFILE_HEADER = 'x-report-profile'
+
+# Profils conservés (nombre et durée en secondes)
+PROFILES_MAX = int(os.environ.get('REPORT_PROFILES_MAX', '20'))
+PROFILES_TTL = int(os.environ.get('REPORT_PROFILES_TTL', '3600'))
+
+
+def profiling_authorized(token: str) -> bool:
+    """Vérifie le jeton d'administration fourni par le client."""
+    if not PROFILE_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), PROFILE_TOKEN.encode('utf-8'))
+
+
+def server_timing(stats=None, **extra) -> str:
+    """Valeur de l'en-tête Server-Timing (durées par étape en millisecondes)."""
+    metrics = []
+    for name, seconds in extra.items():
+        metrics.append(f"{name};dur={seconds * 1000:.1f}")
+    if stats is not None:
+        for name, seconds in stats.durations.items():
+            metrics.append(f"{name};dur={seconds * 1000:.1f}")
+        metrics.append(f"total;dur={stats.total * 1000:.1f}")
+    return ', '.join(metrics)
+
+
+def _write_profile(profiler, snapshot, peak: int, stats) -> str:
+    """Écrit l'archive de profilage (pstats, texte, allocations, étapes)."""
+    path = new_temp_path('.zip')
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(60)
+
+    allocations = io.StringIO()
+    allocations.write(f"Pic mémoire tracé : {peak / 1024:.1f} Kio\n\n")
+    for stat in snapshot.statistics('lineno')[:50]:
+        allocations.write(f"{stat}\n")
+
+    summary = {
+        "cover_model": stats.cover_model,
+        "total_seconds": stats.total,
+        "durations": stats.durations,
+        "elements": stats.elements,
+        "images_decoded": stats.images_decoded,
+        "image_bytes": stats.image_bytes,
+        "image_cache_hits": stats.image_cache_hits,
+        "image_cache_misses": stats.image_cache_misses,
+        "image_errors": stats.image_errors,
+        "output_bytes": stats.output_bytes,
+        "tracemalloc_peak_bytes": peak,
+    }
+
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        profile_file = new_temp_path('.pstats')
+        try:
+            profiler.dump_stats(profile_file)
+            zf.write(profile_file, 'profile.pstats')
+        finally:
+            os.unlink(profile_file)
+        zf.writestr('profile.txt', report.getvalue())
+        zf.writestr('tracemalloc.txt', allocations.getvalue())
+        zf.writestr('stages.json', json.dumps(summary, indent=2))
+    return path
+
+
+def profile_generation(generate, stats):
+    """Exécute generate() sous cProfile et tracemalloc.
+
+    Le chemin de l'archive produite est placé dans stats.profile_path.
+    """
+    stats.track_elements = True
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            result = generate()
+        finally:
+            profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    stats.profile_path = _write_profile(profiler, snapshot, peak, stats)
+    return result
+
+
+class ProfileStore:
+    """Archives de profilage récentes, téléchargeables par identifiant."""
+
+    def __init__(self, max_entries: int = PROFILES_MAX, ttl: int = PROFILES_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def add(self, path: str) -> str:
+        """Enregistre une archive et renvoie son identifiant."""
+        profile_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[profile_id] = (path, time.time())
+            self._sweep()
+        return profile_id
+
+    def get(self, profile_id: str):
+        """Chemin de l'archive, ou None si elle est inconnue ou expirée."""
+        with self._lock:
+            self._sweep()
+            entry = self._entries.get(profile_id)
+        return entry[0] if entry else None
+
+    def clear(self):
+        """Supprime toutes les archives conservées."""
+        with self._lock:
+            for path, _ in self._entries.values():
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+
+    def _sweep(self):
+        limit = time.time() - self.ttl
+        by_age = sorted(self._entries.items(), key=lambda item: item[1][1])
+        excess = len(by_age) - self.max_entries
+        for i, (profile_id, (path, created)) in enumerate(by_age):
+            if i < excess or created < limit:
+                del self._entries[profile_id]
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,60 @@
+"""
+Cache des documents générés, indexé par l'empreinte des données du rapport.
+"""
+import hashlib
+import os
+
+from app.generators.assets import image_digest
+from app.generators.lru import ByteBudgetCache
+from app.models.schemas import LogosConfig
+
+# Incrémenter quand le rendu des documents change, pour invalider les ETag existants
+REPORT_FORMAT_VERSION = "6"
+
+# Budget mémoire du cache (octets)
+CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_BYTES', str(64 * 1024 * 1024)))
+
+
+def report_cache_key(data) -> str:
+    """Empreinte SHA-256 de la forme canonique (JSON) des données du rapport.
+
+    Les images sont prises en compte par image_digest(), sans être décodées :
+    le calcul reste léger et ne dépend pas de la validité du base64.
+    """
+    digest = hashlib.sha256(REPORT_FORMAT_VERSION.encode('ascii') + b'\0')
+    digest.update(data.model_dump_json(exclude={'logos'}).encode('utf-8'))
+    for field in LogosConfig.model_fields:
+        digest.update(f"\0{field}:{image_digest(getattr(data.logos, field))}".encode('ascii'))
+    return digest.hexdigest()
+
+
+def format_etag(key: str) -> str:
+    """ETag HTTP (fort) correspondant à une clé de cache."""
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Indique si l'en-tête If-None-Match désigne l'ETag donné.
+
+    « * » n'est pas un ETag connu du client : il ne suffit pas à renvoyer
+    304 pour un rapport qu'il n'a jamais reçu.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResultCache(ByteBudgetCache):
+    """Cache LRU de documents (bytes) borné par un budget en octets."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+
+
+report_cache = ResultCache()
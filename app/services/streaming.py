@@ -0,0 +1,81 @@
+"""
+Envoi des documents générés par morceaux, sans copie intégrale en mémoire.
+"""
+import os
+import tempfile
+
+from fastapi.responses import Response, StreamingResponse
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Taille des morceaux envoyés au client
+CHUNK_SIZE = 64 * 1024
+
+# Répertoire des fichiers temporaires (partagé entre workers et processus principal)
+TMP_DIR = os.environ.get('REPORT_TMP_DIR') or tempfile.gettempdir()
+
+
+def new_temp_path(suffix: str = '.docx') -> str:
+    """Réserve un fichier temporaire et renvoie son chemin."""
+    fd, path = tempfile.mkstemp(prefix='rapport_', suffix=suffix, dir=TMP_DIR)
+    os.close(fd)
+    return path
+
+
+def iter_file(path: str, chunk_size: int = CHUNK_SIZE, delete: bool = True):
+    """Lit un fichier par morceaux ; le supprime à la fin si delete=True."""
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        if delete:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def pop_file(path: str) -> bytes:
+    """Lit entièrement un fichier temporaire puis le supprime."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.unlink(path)
+
+
+def docx_headers(filename: str, size: int, etag: str = None, extra_headers: dict = None) -> dict:
+    """En-têtes HTTP communs aux réponses .docx."""
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Content-Length": str(size),
+    }
+    if etag:
+        headers["ETag"] = etag
+    if extra_headers:
+        headers.update(extra_headers)
+    return headers
+
+
+def docx_file_response(path: str, filename: str, delete: bool = True, etag: str = None,
+                       extra_headers: dict = None) -> StreamingResponse:
+    """Réponse HTTP envoyant le .docx situé à path par morceaux."""
+    return StreamingResponse(
+        iter_file(path, delete=delete),
+        media_type=DOCX_MEDIA_TYPE,
+        headers=docx_headers(filename, os.path.getsize(path), etag, extra_headers)
+    )
+
+
+def docx_bytes_response(content: bytes, filename: str, etag: str = None,
+                        extra_headers: dict = None) -> Response:
+    """Réponse HTTP envoyant un .docx déjà en mémoire (sans copie)."""
+    return Response(
+        content=content,
+        media_type=DOCX_MEDIA_TYPE,
+        headers=docx_headers(filename, len(content), etag, extra_headers)
+    )
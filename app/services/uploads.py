@@ -0,0 +1,293 @@
+"""
+Lecture des données de rapport : JSON (images en base64), multipart/form-data
+ou JSON Patch contre une version déjà envoyée (voir drafts).
+"""
+import json
+import os
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import Field, TypeAdapter, ValidationError
+from starlette.datastructures import UploadFile
+from typing import Annotated
+
+from app.generators.assets import ASSET_PREFIX, asset_hash, asset_store
+from app.models.schemas import IMAGE_MAX_BYTES, IMAGE_MAX_CHARS, LogosConfig, ReportData
+from .batch import MAX_BATCH_SIZE
+from .drafts import PATCH_MEDIA_TYPE, VERSION_HEADER, draft_store
+from .json_patch import PatchError
+
+# Champ multipart portant le JSON du rapport ; les images sont des parties
+# fichier nommées comme les champs de LogosConfig
+DATA_FIELD = 'data'
+IMAGE_FIELDS = tuple(LogosConfig.model_fields)
+
+# Taille maximale du corps d'une requête de rapport (octets) : toutes les
+# images à leur taille maximale en base64, plus le texte du rapport
+MAX_BODY_BYTES = int(os.environ.get(
+    'REPORT_MAX_BODY_BYTES', str(len(IMAGE_FIELDS) * IMAGE_MAX_CHARS + 2 * 1024 * 1024)))
+
+# ... et d'un lot de rapports (/generate/batch)
+MAX_BATCH_BODY_BYTES = int(os.environ.get('REPORT_MAX_BATCH_BODY_BYTES', str(4 * MAX_BODY_BYTES)))
+
+# Lot de rapports validé directement depuis le JSON, nombre de rapports compris
+_REPORT_BATCH = TypeAdapter(Annotated[list[ReportData], Field(max_length=MAX_BATCH_SIZE)])
+
+# Erreurs dont la valeur reçue n'est pas renvoyée au client (plusieurs Mo de base64)
+_LARGE_INPUT_ERRORS = ('string_too_long', 'bytes_too_long', 'too_long')
+
+
+def _validation_error(error: ValidationError, location: str) -> RequestValidationError:
+    errors = []
+    for item in error.errors(include_url=False):
+        item = dict(item)
+        item['loc'] = (location,) + tuple(item.get('loc', ()))
+        if item.get('type') in _LARGE_INPUT_ERRORS:
+            item.pop('input', None)
+        errors.append(item)
+    return RequestValidationError(errors)
+
+
+def format_size(nbytes: int) -> str:
+    """Taille lisible en Mo, Ko ou octets (« 10 Mo », « 1,5 Mo », « 512 Ko »)."""
+    for unit, factor in (('Mo', 1024 * 1024), ('Ko', 1024)):
+        if nbytes >= factor:
+            value = f"{nbytes / factor:.1f}".rstrip('0').rstrip('.')
+            return f"{value.replace('.', ',')} {unit}"
+    return f"{nbytes} octets"
+
+
+def _too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Requête limitée à {format_size(limit)}")
+
+
+def _check_length(request: Request, limit: int):
+    """Refuse d'emblée un corps annoncé (Content-Length) plus grand que limit."""
+    length = request.headers.get('content-length', '')
+    if length.isdigit() and int(length) > limit:
+        raise _too_large(limit)
+
+
+async def read_body(request: Request, limit: int = MAX_BODY_BYTES) -> bytearray:
+    """Corps de la requête, lu par morceaux et refusé (413) dès qu'il dépasse limit.
+
+    Le bytearray est passé tel quel à model_validate_json, sans copie.
+    """
+    _check_length(request, limit)
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > limit:
+            raise _too_large(limit)
+    return body
+
+
+def _limited_receive(receive, limit: int):
+    """receive ASGI qui refuse (413) un corps dépassant limit, même envoyé par morceaux."""
+    received = 0
+
+    async def limited():
+        nonlocal received
+        message = await receive()
+        if message['type'] == 'http.request':
+            received += len(message.get('body', b''))
+            if received > limit:
+                raise _too_large(limit)
+        return message
+
+    return limited
+
+
+async def read_form(request: Request, limit: int):
+    """Formulaire de la requête, refusé (413) dès que le corps dépasse limit.
+
+    Sans Content-Length (envoi par morceaux), le corps est compté pendant
+    l'analyse : request.form() seul le lirait sans limite. L'appelant ferme
+    le formulaire (form.close()).
+    """
+    _check_length(request, limit)
+    return await Request(request.scope, _limited_receive(request.receive, limit)).form()
+
+
+async def _read_multipart(request: Request) -> tuple:
+    form = await read_form(request, MAX_BODY_BYTES)
+    try:
+        raw = form.get(DATA_FIELD)
+        if raw is None:
+            raise HTTPException(status_code=422, detail=f"Champ '{DATA_FIELD}' manquant")
+        if isinstance(raw, UploadFile):
+            raw = await raw.read()
+        try:
+            data = ReportData.model_validate_json(raw)
+        except ValidationError as e:
+            raise _validation_error(e, DATA_FIELD)
+
+        # Les fichiers envoyés remplacent les images éventuelles du JSON,
+        # sans passer par le base64
+        size = len(raw)
+        for field in IMAGE_FIELDS:
+            part = form.get(field)
+            if isinstance(part, UploadFile):
+                if part.size is not None and part.size > IMAGE_MAX_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Image '{field}' limitée à {format_size(IMAGE_MAX_BYTES)}",
+                    )
+                content = await part.read()
+                if content:
+                    setattr(data.logos, field, content)
+                    size += len(content)
+        return data, size
+    finally:
+        await form.close()
+
+
+def check_assets(data: ReportData):
+    """Vérifie que les images référencées par « asset:<empreinte> » sont stockées."""
+    for field in IMAGE_FIELDS:
+        value = getattr(data.logos, field)
+        if isinstance(value, str) and value.startswith(ASSET_PREFIX):
+            digest = asset_hash(value)
+            if digest is None or not asset_store.exists(digest):
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Image inconnue ou expirée pour '{field}', renvoyez-la via /assets",
+                )
+
+
+async def read_report_data(request: Request) -> ReportData:
+    """Dépendance FastAPI : données du rapport envoyées en JSON ou en multipart.
+
+    En multipart/form-data, le champ 'data' contient le JSON du rapport et les
+    images sont envoyées en fichiers (logo_ecole, logo_entreprise,
+    image_centrale), transmis tels quels au générateur. Dans les deux cas,
+    une image peut aussi être une référence « asset:<empreinte> » (voir /assets).
+
+    En application/json-patch+json, le corps est un JSON Patch (RFC 6902)
+    appliqué à la version désignée par l'en-tête X-Report-Version. Les
+    données acceptées sont conservées comme nouvelle version, dont le jeton
+    est placé dans request.state.report_version (voir version_headers).
+    """
+    token = request.headers.get(VERSION_HEADER)
+    content_type = request.headers.get('content-type', '')
+    if content_type.startswith(PATCH_MEDIA_TYPE):
+        data, size, doc = await _read_report_patch(request, token)
+    else:
+        data, size = await _read_report_data(request)
+        doc = None
+    check_assets(data)
+    request.state.report_version = draft_store.save(data, size, token, doc)
+    return data
+
+
+async def _read_report_data(request: Request) -> tuple:
+    content_type = request.headers.get('content-type', '')
+    if content_type.startswith(('multipart/form-data', 'application/x-www-form-urlencoded')):
+        return await _read_multipart(request)
+
+    # Validation en une passe depuis les octets reçus (limites de LogosConfig comprises)
+    body = await read_body(request)
+    try:
+        return ReportData.model_validate_json(body), len(body)
+    except ValidationError as e:
+        raise _validation_error(e, 'body')
+
+
+async def _read_report_patch(request: Request, token: str) -> tuple:
+    """(données, taille estimée, document) après application du patch reçu."""
+    body = await read_body(request)
+    # Pas d'attente entre la lecture du brouillon et l'enregistrement de la
+    # nouvelle version : deux patchs contre la même version ne peuvent pas
+    # réussir tous les deux
+    draft = draft_store.get(token)
+    if draft is None:
+        raise HTTPException(
+            status_code=409,
+            detail="Version du rapport inconnue ou expirée, renvoyez le rapport complet",
+        )
+    try:
+        operations = json.loads(body)
+    except ValueError as e:
+        raise RequestValidationError([{'type': 'json_invalid', 'loc': ('body',),
+                                       'msg': f"JSON invalide : {e}", 'input': {}}])
+    try:
+        data, doc, size = draft.patched(operations)
+    except PatchError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValidationError as e:
+        raise _validation_error(e, 'body')
+    return data, size, doc
+
+
+async def read_report_batch(request: Request) -> list:
+    """Dépendance FastAPI : lot de rapports (tableau JSON de ReportData).
+
+    Le tableau est validé en une passe depuis les octets reçus ; un lot vide
+    ou de plus de MAX_BATCH_SIZE rapports est refusé.
+    """
+    try:
+        reports = _REPORT_BATCH.validate_json(await read_body(request, MAX_BATCH_BODY_BYTES))
+    except ValidationError as e:
+        if any(error['type'] == 'too_long' and not error['loc'] for error in e.errors()):
+            raise HTTPException(status_code=413, detail=f"Lot limité à {MAX_BATCH_SIZE} rapports")
+        raise _validation_error(e, 'body')
+    if not reports:
+        raise HTTPException(status_code=422, detail="Aucun rapport à générer")
+    for data in reports:
+        check_assets(data)
+    return reports
+
+
+def report_schemas() -> dict:
+    """Schémas OpenAPI de ReportData et de ses sous-modèles.
+
+    Les routes lisent elles-mêmes leur corps (read_body) : FastAPI ne les
+    ajoute donc pas aux composants référencés ci-dessous.
+    """
+    schema = ReportData.model_json_schema(ref_template='#/components/schemas/{model}')
+    schemas = schema.pop('$defs', {})
+    schemas['ReportData'] = schema
+    return schemas
+
+
+# Description OpenAPI des corps acceptés par read_report_batch et read_report_data
+REPORT_BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": {"$ref": "#/components/schemas/ReportData"},
+                    "maxItems": MAX_BATCH_SIZE,
+                }
+            },
+        },
+    }
+}
+
+REPORT_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"$ref": "#/components/schemas/ReportData"}},
+            PATCH_MEDIA_TYPE: {
+                "schema": {
+                    "type": "array",
+                    "description": f"JSON Patch (RFC 6902) contre la version indiquée par {VERSION_HEADER}",
+                    "items": {"type": "object", "required": ["op", "path"]},
+                }
+            },
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": [DATA_FIELD],
+                    "properties": {
+                        DATA_FIELD: {"type": "string", "description": "JSON du rapport (ReportData)"},
+                        **{field: {"type": "string", "format": "binary"} for field in IMAGE_FIELDS},
+                    },
+                }
+            },
+        },
+    }
+}
@@ -0,0 +1,183 @@
+"""
+Pool de processus pour exécuter generate_report hors de la boucle d'événements.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .metrics import GENERATIONS, GENERATIONS_IN_FLIGHT, observe_report
+from .profiling import profile_generation
+from .streaming import new_temp_path
+
+# Modules lourds chargés une seule fois par le forkserver puis hérités par les workers
+PRELOAD_MODULES = ['docx', 'PIL.Image', 'app.generators']
+
+
+def _default_workers() -> int:
+    """Nombre de workers : variable REPORT_WORKERS, sinon nombre de cœurs."""
+    value = os.environ.get('REPORT_WORKERS')
+    if value is not None:
+        return max(0, int(value))
+    return os.cpu_count() or 1
+
+
+def _init_worker():
+    """Initialise un worker : importe python-docx, Pillow et les générateurs,
+    puis prépare le document de base, les pages de garde et les métriques de
+    la police par défaut (pagination)."""
+    for module in PRELOAD_MODULES:
+        __import__(module)
+    from app.generators.base_document import base_documents
+    from app.generators.covers import COVER_GENERATORS, compile_layouts
+    from app.generators.pagination import report_styles
+    from app.models.schemas import StyleConfig
+    for doc in base_documents.warm():
+        compile_layouts(COVER_GENERATORS.values(), doc._block_width)
+    report_styles(StyleConfig())
+
+
+def _ping() -> int:
+    """Tâche vide utilisée pour démarrer les workers à l'avance."""
+    return os.getpid()
+
+
+class ProgressFile:
+    """Callback de progression qui écrit l'étape courante dans un petit fichier.
+
+    Permet au processus principal de suivre une génération exécutée dans un
+    autre processus.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __call__(self, stage: str, fraction: float):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(f"{stage} {fraction:.3f}")
+        os.replace(tmp_path, self.path)
+
+    def read(self):
+        """Renvoie (étape, fraction) ou (None, 0.0) si rien n'a été écrit."""
+        try:
+            with open(self.path) as f:
+                stage, fraction = f.read().split()
+            return stage, float(fraction)
+        except (FileNotFoundError, ValueError):
+            return None, 0.0
+
+
+def _build_report(data, progress=None, profile: bool = False):
+    """Génère le rapport dans le worker, directement dans un fichier temporaire.
+
+    Seuls le chemin du fichier et les mesures (ReportStats) repassent au
+    processus principal, qui envoie ensuite le fichier par morceaux. Avec
+    profile=True, la génération est profilée (voir profiling.py).
+    """
+    from app.generators import generate_report, ReportStats
+    path = new_temp_path()
+    stats = ReportStats()
+    try:
+        with open(path, 'wb') as f:
+            if profile:
+                profile_generation(lambda: generate_report(data, f, progress=progress, stats=stats), stats)
+            else:
+                generate_report(data, f, progress=progress, stats=stats)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, stats
+
+
+def _discard_file(future):
+    """Supprime le fichier produit par une génération dont plus personne n'attend le résultat."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    path, stats = future.result()
+    for leftover in (path, stats.profile_path):
+        if leftover:
+            try:
+                os.unlink(leftover)
+            except FileNotFoundError:
+                pass
+
+
+def _get_mp_context():
+    """Utilise forkserver (préchargement des modules) si disponible, sinon spawn."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('forkserver')
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context('spawn')
+
+
+class ReportWorkerPool:
+    """Pool de workers pré-démarrés pour la génération des rapports.
+
+    Avec max_workers=0, la génération s'exécute dans un thread du processus
+    courant (utile en développement ou sur une instance mono-cœur).
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = _default_workers() if max_workers is None else max_workers
+        self._executor = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self):
+        """Démarre les processus et attend qu'ils aient chargé les modules."""
+        if self.started:
+            return
+        if self.max_workers == 0:
+            _init_worker()
+            return
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=_get_mp_context(),
+            initializer=_init_worker,
+        )
+        warmup = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for future in warmup:
+            future.result()
+
+    def shutdown(self):
+        """Arrête les workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func, *args):
+        """Exécute func(*args) dans le pool sans bloquer la boucle d'événements."""
+        if self._executor is None:
+            return await asyncio.to_thread(func, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def generate(self, data, progress: ProgressFile = None, profile: bool = False):
+        """Génère le rapport dans un worker.
+
+        Renvoie (chemin du .docx, ReportStats) ; les mesures sont aussi
+        enregistrées dans les métriques globales.
+        """
+        future = asyncio.ensure_future(self.run(_build_report, data, progress, profile))
+        GENERATIONS_IN_FLIGHT.inc()
+        try:
+            path, stats = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Le worker va au bout de la génération : supprimer le fichier produit
+            future.add_done_callback(_discard_file)
+            raise
+        except Exception:
+            from app.generators import cover_model_name
+            GENERATIONS.inc(cover_model=cover_model_name(data.cover_model), result='error')
+            raise
+        finally:
+            GENERATIONS_IN_FLIGHT.dec()
+        observe_report(stats)
+        return path, stats
+
+
+report_pool = ReportWorkerPool()
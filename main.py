@@ -1,21 +1,77 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
-import io
+import asyncio
+import os
+import time
 
 # Import depuis les nouveaux modules
+from app.generators.plan import plan_report
 from app.models.schemas import ReportData
-from app.generators import generate_report
+from app.routes import jobs_router, debug_router, assets_router
+from app.services import (
+    report_pool,
+    admit_report,
+    Overloaded,
+    job_queue,
+    metrics_registry,
+    InFlightMiddleware,
+    report_cache,
+    report_cache_key,
+    profile_store,
+    profiling_authorized,
+    server_timing,
+    PROFILE_HEADER,
+    format_etag,
+    etag_matches,
+    docx_bytes_response,
+    docx_file_response,
+    pop_file,
+    stream_batch_zip,
+    REPORT_BATCH_REQUEST_BODY,
+    REPORT_REQUEST_BODY,
+    read_report_batch,
+    read_report_data,
+    report_schemas,
+    version_headers,
+)
 
 # Chemins absolus pour production
 BASE_DIR = Path(__file__).resolve().parent
 
-app = FastAPI(title="Générateur de Rapport de Stage v3")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Démarrer les workers de génération avant de servir les requêtes
+    report_pool.start()
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    report_pool.shutdown()
+    profile_store.clear()
+
+
+app = FastAPI(title="Générateur de Rapport de Stage v3", lifespan=lifespan)
 
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
+app.include_router(jobs_router)
+app.include_router(debug_router)
+app.include_router(assets_router)
+app.add_middleware(InFlightMiddleware)
+
+
+def openapi():
+    """Schéma OpenAPI, complété par ReportData (corps lus sans modèle FastAPI)."""
+    if app.openapi_schema is None:
+        FastAPI.openapi(app)['components']['schemas'].update(report_schemas())
+    return app.openapi_schema
+
+
+app.openapi = openapi
 
 
 # ===== ROUTES =====
@@ -25,18 +81,75 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
-@app.post("/generate")
-async def generate(data: ReportData):
-    # Générer le document Word
-    doc_buffer = generate_report(data)
+@app.post("/generate", openapi_extra=REPORT_REQUEST_BODY)
+async def generate(request: Request, data: ReportData = Depends(read_report_data)):
+    # Corps JSON (images en base64) ou multipart/form-data (images en fichiers)
+    # Profilage à la demande (en-tête d'administration) : ignore le cache
+    profile = profiling_authorized(request.headers.get(PROFILE_HEADER, ""))
+
+    # Empreinte des données : sert d'ETag et de clé de cache
+    key = report_cache_key(data)
+    etag = format_etag(key)
+    # Jeton de la version conservée, pour une prochaine soumission en JSON Patch
+    version = version_headers(request)
+    if not profile and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304,
+                        headers={"ETag": etag, "Server-Timing": 'cache;desc="304"', **version})
 
     # Nom du fichier
     filename = f"rapport_stage_{data.nom or 'rapport'}.docx"
 
+    content = None if profile else report_cache.get(key)
+    if content is not None:
+        return docx_bytes_response(content, filename, etag=etag,
+                                   extra_headers={"Server-Timing": 'cache;desc="hit"', **version})
+
+    # Générer le document Word dans un worker (hors boucle d'événements),
+    # en refusant rapidement la requête si le serveur est saturé
+    wait_start = time.perf_counter()
+    try:
+        async with admit_report(data):
+            waited = time.perf_counter() - wait_start
+            path, stats = await report_pool.generate(data, profile=profile)
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    headers = {"Server-Timing": server_timing(stats, admission=waited), **version}
+    if stats.profile_path:
+        headers["X-Report-Profile-Id"] = profile_store.add(stats.profile_path)
+
+    # Trop gros pour le cache : envoi par morceaux depuis le fichier temporaire
+    if not report_cache.accepts(os.path.getsize(path)):
+        return docx_file_response(path, filename, etag=etag, extra_headers=headers)
+
+    content = pop_file(path)
+    report_cache.put(key, content)
+    return docx_bytes_response(content, filename, etag=etag, extra_headers=headers)
+
+
+@app.post("/plan", openapi_extra=REPORT_REQUEST_BODY)
+async def plan(request: Request, response: Response, data: ReportData = Depends(read_report_data)):
+    # Structure et coût estimés (pages, taille du .docx, durée, mémoire),
+    # sans générer le document ; mêmes estimations que l'admission de /generate.
+    # Calculé dans un thread, hors de la file des générations : les métriques
+    # des polices (Pillow ImageFont) sont mesurées une fois par processus.
+    response.headers.update(version_headers(request))
+    plan = await asyncio.to_thread(plan_report, data)
+    return plan.to_dict()
+
+
+@app.get("/metrics")
+async def metrics():
+    return Response(content=metrics_registry.render(), media_type=metrics_registry.CONTENT_TYPE)
+
+
+@app.post("/generate/batch", openapi_extra=REPORT_BATCH_REQUEST_BODY)
+async def generate_batch(reports: list[ReportData] = Depends(read_report_batch)):
+    # Archive ZIP envoyée au fur et à mesure que les rapports sont prêts
     return StreamingResponse(
-        io.BytesIO(doc_buffer.getvalue()),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        stream_batch_zip(reports),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=rapports_stage.zip"}
     )
 
 
@@ -310,20 +310,45 @@ function formatDateShort(dateStr) {
 }
 
 // ===== LOGO PREVIEW =====
-function previewLogo(input, previewId, logoKey) {
+// Les images sont stockées une fois sur le serveur et référencées par
+// « asset:<empreinte> » ; à défaut, elles restent en data URL base64
+function imageSrc(value) {
+    if (value && value.startsWith('asset:')) return `/assets/${value.slice(6)}`;
+    return value;
+}
+
+async function uploadAsset(file) {
+    const form = new FormData();
+    form.append('file', file);
+    const response = await fetch('/assets', { method: 'POST', body: form });
+    if (!response.ok) throw new Error('Envoi de l\'image impossible');
+    return (await response.json()).ref;
+}
+
+function readAsDataURL(file) {
+    return new Promise((resolve, reject) => {
+        const reader = new FileReader();
+        reader.onload = (e) => resolve(e.target.result);
+        reader.onerror = reject;
+        reader.readAsDataURL(file);
+    });
+}
+
+async function previewLogo(input, previewId, logoKey) {
     const preview = document.getElementById(previewId);
     const file = input.files[0];
 
     if (file) {
-        const reader = new FileReader();
-        reader.onload = (e) => {
-            const base64 = e.target.result;
-            preview.innerHTML = `<img src="${base64}" alt="Logo">`;
-            logos[logoKey] = base64;
-            saveToLocalStorage();
-            updatePreview();
-        };
-        reader.readAsDataURL(file);
+        let value;
+        try {
+            value = await uploadAsset(file);
+        } catch (error) {
+            value = await readAsDataURL(file);
+        }
+        preview.innerHTML = `<img src="${imageSrc(value)}" alt="Logo">`;
+        logos[logoKey] = value;
+        saveToLocalStorage();
+        updatePreview();
     }
 }
 
@@ -387,13 +412,13 @@ function loadFromLocalStorage() {
         if (data.logos) {
             logos = data.logos;
             if (logos.logo_ecole) {
-                document.getElementById('logoEcolePreview').innerHTML = `<img src="${logos.logo_ecole}" alt="Logo">`;
+                document.getElementById('logoEcolePreview').innerHTML = `<img src="${imageSrc(logos.logo_ecole)}" alt="Logo">`;
             }
             if (logos.logo_entreprise) {
-                document.getElementById('logoEntreprisePreview').innerHTML = `<img src="${logos.logo_entreprise}" alt="Logo">`;
+                document.getElementById('logoEntreprisePreview').innerHTML = `<img src="${imageSrc(logos.logo_entreprise)}" alt="Logo">`;
             }
             if (logos.image_centrale) {
-                document.getElementById('imageCentralePreview').innerHTML = `<img src="${logos.image_centrale}" alt="Image">`;
+                document.getElementById('imageCentralePreview').innerHTML = `<img src="${imageSrc(logos.image_centrale)}" alt="Image">`;
             }
         }
 
@@ -521,7 +546,7 @@ function updatePreview() {
 
             // Bandeau image
             if (data.logos.image_centrale) {
-                html += `<div class="preview-banner"><img src="${data.logos.image_centrale}"></div>`;
+                html += `<div class="preview-banner"><img src="${imageSrc(data.logos.image_centrale)}"></div>`;
             } else {
                 html += `<div class="preview-banner" style="background: linear-gradient(135deg, ${primaryColor}20, ${primaryColor}40);"></div>`;
             }
@@ -537,9 +562,9 @@ function updatePreview() {
 
             // Logos côte à côte
             html += `<div style="display:flex;justify-content:center;align-items:center;gap:15px;margin:10px 0;">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
                 <span style="color:#ccc;">→</span>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             html += `<div style="text-align:center;font-size:9px;">
@@ -560,8 +585,8 @@ function updatePreview() {
             // Contenu principal
             html += `<div style="flex:1;padding:15px 12px;">
                 <div style="display:flex;justify-content:space-between;margin-bottom:15px;">
-                    <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                    <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                    <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                    <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
                 </div>
                 <div style="font-size:18px;font-weight:bold;color:${primaryColor};">RAPPORT</div>
                 <div style="font-size:12px;color:#666;margin-bottom:8px;">DE STAGE</div>
@@ -603,8 +628,8 @@ function updatePreview() {
 
             // Logos
             html += `<div style="display:flex;justify-content:space-between;margin-bottom:10px;">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             html += `<p style="font-size:10px;font-weight:bold;color:${primaryColor};">${data.ecole || '[École]'}</p>`;
@@ -631,7 +656,7 @@ function updatePreview() {
             // Bloc colore en haut
             html += `<div style="display:flex;margin-bottom:20px;">
                 <div style="flex:1;">
-                    <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
+                    <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
                 </div>
                 <div style="background:${primaryColor};padding:8px 15px;color:white;font-size:9px;font-weight:bold;">
                     ${data.annee_scolaire || '[Année]'}
@@ -662,13 +687,13 @@ function updatePreview() {
             // Colonne gauche coloree
             html += `<div style="width:35%;background:${primaryColor};padding:12px;color:white;display:flex;flex-direction:column;align-items:center;justify-content:center;">`;
             if (data.logos.logo_ecole) {
-                html += `<div class="preview-logo-sm" style="background:white;margin-bottom:15px;"><img src="${data.logos.logo_ecole}"></div>`;
+                html += `<div class="preview-logo-sm" style="background:white;margin-bottom:15px;"><img src="${imageSrc(data.logos.logo_ecole)}"></div>`;
             }
             html += `<div style="font-size:14px;font-weight:bold;margin:20px 0;">STAGE</div>`;
             html += `<p style="font-size:8px;opacity:0.8;">${data.annee_scolaire || '[Année]'}</p>`;
             html += `<p style="font-size:7px;opacity:0.7;margin-top:10px;text-align:center;">${data.date_debut || '[Date]'}<br>—<br>${data.date_fin || '[Date]'}</p>`;
             if (data.logos.logo_entreprise) {
-                html += `<div class="preview-logo-sm" style="background:white;margin-top:20px;"><img src="${data.logos.logo_entreprise}"></div>`;
+                html += `<div class="preview-logo-sm" style="background:white;margin-top:20px;"><img src="${imageSrc(data.logos.logo_entreprise)}"></div>`;
             }
             html += `</div>`;
 
@@ -692,9 +717,9 @@ function updatePreview() {
 
             // Header bar
             html += `<div style="background:${primaryColor};padding:10px;display:flex;justify-content:space-between;align-items:center;">
-                <div class="preview-logo-sm" style="background:white;">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
+                <div class="preview-logo-sm" style="background:white;">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
                 <span style="color:white;font-size:8px;">${data.annee_scolaire || '[Année]'}</span>
-                <div class="preview-logo-sm" style="background:white;">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm" style="background:white;">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             // Contenu central - flex:1 pour pousser le footer en bas
@@ -735,8 +760,8 @@ function updatePreview() {
 
             // Logos
             html += `<div style="display:flex;justify-content:center;gap:20px;margin:15px 0;">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             // Contenu
@@ -768,8 +793,8 @@ function updatePreview() {
 
             // Logos
             html += `<div style="display:flex;justify-content:space-between;margin-bottom:15px;">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             html += `<div style="font-size:16px;font-weight:bold;color:${primaryColor};">RAPPORT DE STAGE</div>`;
@@ -793,8 +818,8 @@ function updatePreview() {
 
             // Logos
             html += `<div style="display:flex;justify-content:space-between;margin-bottom:20px;position:relative;z-index:1;">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             // Titre stylise
@@ -828,8 +853,8 @@ function updatePreview() {
 
             // Logos
             html += `<div style="display:flex;justify-content:space-between;margin-bottom:15px;">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             // Ligne decorative
@@ -873,8 +898,8 @@ function updatePreview() {
 
             // Header avec logos
             html += `<div class="preview-header-bar">
-                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${data.logos.logo_ecole}">` : ''}</div>
-                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${data.logos.logo_entreprise}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_ecole ? `<img src="${imageSrc(data.logos.logo_ecole)}">` : ''}</div>
+                <div class="preview-logo-sm">${data.logos.logo_entreprise ? `<img src="${imageSrc(data.logos.logo_entreprise)}">` : ''}</div>
             </div>`;
 
             // Contenu page de garde
@@ -883,7 +908,7 @@ function updatePreview() {
                 ${data.sujet_stage ? `<p style="font-size:10px;font-weight:bold;color:${primaryColor};margin:5px 0;">${data.sujet_stage}</p>` : ''}
                 <p style="font-size:9px;font-style:italic;">${data.formation || '[Formation]'}</p>
                 <div style="border-top:2px solid ${primaryColor};width:60%;margin:8px auto;"></div>
-                ${data.logos.image_centrale ? `<div class="preview-cover-image" style="width:60px;height:60px;"><img src="${data.logos.image_centrale}"></div>` : ''}
+                ${data.logos.image_centrale ? `<div class="preview-cover-image" style="width:60px;height:60px;"><img src="${imageSrc(data.logos.image_centrale)}"></div>` : ''}
                 <p style="margin-top:8px;font-size:10px;"><strong>${data.prenom || '[Prénom]'} ${data.nom || '[Nom]'}</strong></p>
                 <p style="font-size:8px;">${data.ecole || '[École]'}</p>
                 <p style="font-size:7px;font-style:italic;">Année ${data.annee_scolaire || '[Année]'}</p>
@@ -1010,6 +1035,92 @@ function updatePreview() {
 }
 
 // ===== GENERATE REPORT =====
+// Dernier document téléchargé (réutilisé si le serveur répond 304)
+let lastReport = { etag: null, blob: null };
+
+// Dernières données acceptées par le serveur et leur jeton de version : les
+// générations suivantes n'envoient que la différence (JSON Patch, RFC 6902)
+let lastDraft = { version: null, state: null };
+
+function escapePointer(key) {
+    return key.replace(/~/g, '~0').replace(/\//g, '~1');
+}
+
+// Opérations JSON Patch transformant before en after (valeurs JSON)
+function diffJson(before, after, path = '', ops = []) {
+    if (before === after) return ops;
+    const isObject = (value) => value !== null && typeof value === 'object';
+    if (!isObject(before) || !isObject(after) || Array.isArray(before) !== Array.isArray(after)) {
+        ops.push({ op: 'replace', path, value: after });
+        return ops;
+    }
+    if (Array.isArray(after)) {
+        // Éléments comparés un à un, puis suppressions ou ajouts en fin de tableau
+        const common = Math.min(before.length, after.length);
+        for (let i = 0; i < common; i++) diffJson(before[i], after[i], `${path}/${i}`, ops);
+        for (let i = before.length - 1; i >= after.length; i--) ops.push({ op: 'remove', path: `${path}/${i}` });
+        for (let i = before.length; i < after.length; i++) ops.push({ op: 'add', path: `${path}/-`, value: after[i] });
+        return ops;
+    }
+    for (const key of Object.keys(before)) {
+        if (!(key in after)) ops.push({ op: 'remove', path: `${path}/${escapePointer(key)}` });
+    }
+    for (const [key, value] of Object.entries(after)) {
+        const child = `${path}/${escapePointer(key)}`;
+        if (key in before) diffJson(before[key], value, child, ops);
+        else ops.push({ op: 'add', path: child, value });
+    }
+    return ops;
+}
+
+// Une image en data URL doit partir en fichier : envoi complet du rapport
+function canSendPatch(state) {
+    return lastDraft.version !== null
+        && Object.values(state.logos || {}).every((value) => !value || value.startsWith('asset:'));
+}
+
+async function postReport(state, headers) {
+    if (canSendPatch(state)) {
+        const response = await fetch('/generate', {
+            method: 'POST',
+            headers: {
+                ...headers,
+                'Content-Type': 'application/json-patch+json',
+                'X-Report-Version': lastDraft.version
+            },
+            body: JSON.stringify(diffJson(lastDraft.state, state))
+        });
+        // Version expirée côté serveur : renvoyer le rapport complet
+        if (response.status !== 409) return response;
+    }
+    if (lastDraft.version) headers = { ...headers, 'X-Report-Version': lastDraft.version };
+    return fetch('/generate', {
+        method: 'POST',
+        headers,
+        body: await buildReportForm(state)
+    });
+}
+
+// Corps multipart : le JSON du rapport (images stockées référencées par
+// empreinte), puis chaque autre image en fichier binaire
+async function buildReportForm(data) {
+    const form = new FormData();
+    const images = data.logos || {};
+    const refs = {};
+    for (const [key, value] of Object.entries(images)) {
+        if (!value) continue;
+        if (value.startsWith('asset:')) {
+            // Image déjà stockée sur le serveur : seule la référence est envoyée
+            refs[key] = value;
+            continue;
+        }
+        const blob = await (await fetch(value)).blob();
+        form.append(key, blob, key);
+    }
+    form.append('data', JSON.stringify({ ...data, logos: refs }));
+    return form;
+}
+
 async function generateReport() {
     const btn = document.querySelector('.btn-primary');
     const originalText = btn.textContent;
@@ -1018,17 +1129,25 @@ async function generateReport() {
     btn.innerHTML = 'Generation...';
 
     try {
-        const data = collectFormData();
+        // Copie JSON : sert de référence à la prochaine différence
+        const data = JSON.parse(JSON.stringify(collectFormData()));
 
-        const response = await fetch('/generate', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(data)
-        });
+        const headers = {};
+        if (lastReport.etag) headers['If-None-Match'] = lastReport.etag;
+
+        const response = await postReport(data, headers);
+        const version = response.headers.get('X-Report-Version');
+        lastDraft = version ? { version, state: data } : { version: null, state: null };
 
-        if (!response.ok) throw new Error('Erreur lors de la génération');
+        let blob;
+        if (response.status === 304 && lastReport.blob) {
+            blob = lastReport.blob;
+        } else {
+            if (!response.ok) throw new Error('Erreur lors de la génération');
+            blob = await response.blob();
+            lastReport = { etag: response.headers.get('ETag'), blob };
+        }
 
-        const blob = await response.blob();
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;
@@ -0,0 +1,105 @@
+import asyncio
+import importlib
+import tempfile
+
+import pytest
+
+from app.models.schemas import ReportData
+from app.services import batch, jobs
+from app.services.admission import AdmissionController, Overloaded
+
+# Le paquet app.services exporte le contrôleur sous le nom du module
+admission_module = importlib.import_module('app.services.admission')
+
+
+def test_background_waits_past_queue_limit():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=1, max_cost=100, max_waiting=0, max_wait=0.01)
+        async with controller.admit(1, 0.1):
+            with pytest.raises(Overloaded):
+                async with controller.admit(1, 0.1):
+                    pass
+            waiting = asyncio.create_task(controller.admit(1, 0.1, reject=False).__aenter__())
+            await asyncio.sleep(0.05)
+            assert not waiting.done() and controller.waiting == 1
+        await waiting
+        assert controller.inflight == 1
+
+    asyncio.run(scenario())
+
+
+class _FakePool:
+    """report_pool.generate qui relève la concurrence admise."""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.peak = 0
+        self.calls = 0
+
+    async def generate(self, data, progress=None, profile=False):
+        self.calls += 1
+        self.peak = max(self.peak, self.controller.inflight)
+        assert self.controller.inflight >= 1
+        await asyncio.sleep(0.01)
+        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
+            f.write(b'docx')
+        return f.name, None
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    controller = AdmissionController(max_concurrent=1, max_waiting=0)
+    monkeypatch.setattr(admission_module, 'admission', controller)
+    return controller
+
+
+def test_batch_goes_through_admission(controller, monkeypatch):
+    pool = _FakePool(controller)
+    monkeypatch.setattr(batch, 'report_pool', pool)
+
+    async def scenario():
+        return b''.join([chunk async for chunk in batch.stream_batch_zip([ReportData()] * 5)])
+
+    archive = asyncio.run(scenario())
+    assert archive and pool.calls == 5
+    # Cinq rapports, une place : jamais plus d'une génération admise, aucun refus
+    assert pool.peak == 1 and controller.rejected == 0 and controller.inflight == 0
+
+
+def test_jobs_go_through_admission(controller, monkeypatch):
+    pool = _FakePool(controller)
+    monkeypatch.setattr(jobs, 'report_pool', pool)
+
+    async def scenario():
+        queue = jobs.JobQueue(concurrency=3)
+        queue.start()
+        submitted = [queue.submit(ReportData()) for _ in range(4)]
+        await queue._queue.join()
+        statuses = [job.status for job in submitted]
+        await queue.stop()
+        return statuses
+
+    assert asyncio.run(scenario()) == ['done'] * 4
+    assert pool.calls == 4 and pool.peak == 1 and controller.rejected == 0
+
+
+def test_timed_out_waiter_wakes_the_next_one():
+    async def scenario():
+        controller = AdmissionController(max_concurrent=4, max_cost=60, max_waiting=4, max_wait=0.05)
+        async with controller.admit(30, 0.1):
+            # Coût 50 : ne tient pas avant la fin de la première génération
+            large = asyncio.create_task(controller.admit(50, 0.1).__aenter__())
+            await asyncio.sleep(0.01)
+            # Référence conservée : la place est rendue quand le contexte est libéré
+            small_admit = controller.admit(10, 0.1, reject=False)
+            small = asyncio.create_task(small_admit.__aenter__())
+            await asyncio.sleep(0.01)
+            assert controller.waiting == 2
+            with pytest.raises(Overloaded):
+                await large
+            # La requête de coût 10 tient dans le budget dès le retrait de la précédente
+            await asyncio.wait_for(small, 0.05)
+            assert controller.inflight == 2 and controller.waiting == 0
+            await small_admit.__aexit__(None, None, None)
+
+    asyncio.run(scenario())
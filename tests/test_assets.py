@@ -0,0 +1,78 @@
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+import main
+from app.generators.assets import ASSET_PREFIX, asset_hash, asset_store, is_asset_hash
+from app.routes import assets as assets_routes
+
+DIGEST = 'a' * 64
+
+
+@pytest.mark.parametrize('digest, expected', [
+    (DIGEST, True),
+    ('0123456789abcdef' * 4, True),
+    (DIGEST.upper(), False),
+    ('g' * 64, False),
+    ('a' * 63, False),
+    (DIGEST + '\n', False),
+    ('../' + 'a' * 61, False),
+    (None, False),
+])
+def test_is_asset_hash(digest, expected):
+    assert is_asset_hash(digest) is expected
+
+
+def test_asset_hash_rejects_trailing_newline():
+    assert asset_hash(ASSET_PREFIX + DIGEST) == DIGEST
+    assert asset_hash(ASSET_PREFIX + DIGEST + '\n') is None
+
+
+@pytest.mark.parametrize('digest', [DIGEST.upper(), 'z' * 64, 'a' * 63])
+def test_get_asset_rejects_invalid_digest(digest):
+    assert TestClient(main.app).get(f'/assets/{digest}').status_code == 404
+
+
+BOUNDARY = 'asset-boundary'
+
+
+def _multipart(content: bytes) -> bytes:
+    return (f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="logo"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode()
+            + content + f'\r\n--{BOUNDARY}--\r\n'.encode())
+
+
+def _chunked(body: bytes, size: int = 4096):
+    # Générateur : httpx envoie le corps par morceaux, sans Content-Length
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def test_chunked_upload_over_limit(monkeypatch):
+    monkeypatch.setattr(assets_routes, 'ASSET_MAX_UPLOAD', 1024)
+    monkeypatch.setattr(assets_routes, '_MULTIPART_OVERHEAD', 1024)
+    response = TestClient(main.app).post(
+        '/assets', content=_chunked(_multipart(b'x' * 64 * 1024)),
+        headers={'Content-Type': f'multipart/form-data; boundary={BOUNDARY}'})
+    assert response.status_code == 413
+
+
+@pytest.mark.parametrize('fmt, media_type', [('JPEG', 'image/jpeg'), ('PNG', 'image/png')])
+def test_upload_keeps_the_real_format(fmt, media_type, tmp_path, monkeypatch):
+    monkeypatch.setattr(asset_store, 'directory', str(tmp_path))
+    image = io.BytesIO()
+    Image.new('RGB', (64, 48), (200, 30, 30)).save(image, format=fmt)
+
+    client = TestClient(main.app)
+    response = client.post('/assets', files={'file': ('logo', image.getvalue(), media_type)})
+    assert response.status_code == 201
+    digest = response.json()['hash']
+    # Fichier nommé par l'empreinte seule : pas d'extension .png pour un JPEG
+    assert os.listdir(tmp_path) == [digest]
+
+    response = client.get(f'/assets/{digest}')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == media_type
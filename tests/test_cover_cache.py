@@ -0,0 +1,28 @@
+import io
+
+import pytest
+
+from app.generators.covers import COVER_GENERATORS, cover_cache, cover_cache_key
+from app.generators.report_generator import generate_report
+from app.models.schemas import ReportData
+
+# Padding base64 invalide : b64decode lève binascii.Error
+MALFORMED_LOGO = 'data:image/png;base64,' + 'QUJD' * 40 + 'A'
+
+MALFORMED_LOGOS = {'logo_ecole': MALFORMED_LOGO, 'logo_entreprise': MALFORMED_LOGO,
+                   'image_centrale': MALFORMED_LOGO}
+
+
+@pytest.mark.parametrize('model', sorted(COVER_GENERATORS))
+def test_cover_cache_key_tolerates_malformed_logo(model):
+    data = ReportData(cover_model=model, logos=MALFORMED_LOGOS)
+    key = cover_cache_key(model, data, '1 janvier 2024', '1 juin 2024', '5 mois')
+    assert key == cover_cache_key(model, data, '1 janvier 2024', '1 juin 2024', '5 mois')
+
+
+@pytest.mark.parametrize('model', sorted(COVER_GENERATORS))
+def test_generate_report_skips_malformed_logo(model):
+    cover_cache.clear()
+    data = ReportData(cover_model=model, logos=MALFORMED_LOGOS)
+    output = generate_report(data)
+    assert isinstance(output, io.BytesIO) and output.getvalue()
@@ -0,0 +1,70 @@
+"""
+Démarrage du serveur : importer main ne doit charger ni python-docx, ni lxml,
+ni Pillow, réservés aux workers de génération. /plan, calculé dans le
+processus principal, ne charge que Pillow ImageFont (métriques des polices).
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('docx', 'lxml', 'PIL')
+
+# Import de main, cumulé (FastAPI compris), et modules du dépôt seuls (ms)
+IMPORT_BUDGET_MS = 2000
+APP_IMPORT_BUDGET_MS = 200
+
+_LOADED = f"import json, sys; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+
+_PLAN = """
+from fastapi.testclient import TestClient
+import main
+
+async def _no_pool(*args):
+    raise AssertionError('/plan ne passe pas par le pool de génération')
+
+main.report_pool.run = _no_pool
+with TestClient(main.app) as client:
+    response = client.post('/plan', json={
+        'include_cover': True,
+        'chapters': [{'id': 1, 'title': 'Introduction', 'level': 1,
+                      'children': [{'id': 2, 'title': 'Contexte', 'level': 2}]}]})
+    assert response.status_code == 200, response.text
+    assert response.json()['pages'] > 0
+"""
+
+
+def _python(*args, env=None):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True,
+                          timeout=120, env={**os.environ, **(env or {})}, check=True)
+
+
+def _import_times(stderr: str) -> dict:
+    """{module: (self, cumulé)} en microsecondes, d'après -X importtime."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        if own.strip().isdigit():
+            times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def test_import_main_skips_heavy_modules():
+    result = _python('-X', 'importtime', '-c', f"import main; {_LOADED}")
+    assert json.loads(result.stdout) == []
+
+    times = _import_times(result.stderr)
+    assert times['main'][1] / 1000 < IMPORT_BUDGET_MS
+    app_time = sum(own for name, (own, _) in times.items()
+                   if name == 'main' or name == 'app' or name.startswith('app.'))
+    assert app_time / 1000 < APP_IMPORT_BUDGET_MS
+
+
+def test_plan_request_skips_docx():
+    # Pool démarré avec le serveur : /plan ne l'utilise pas pour autant
+    result = _python('-c', f"{_PLAN}\n{_LOADED}", env={'REPORT_WORKERS': '1'})
+    assert json.loads(result.stdout.splitlines()[-1]) in ([], ['PIL'])
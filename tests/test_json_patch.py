@@ -0,0 +1,143 @@
+import copy
+import json
+
+import pytest
+
+from app.models.schemas import ReportData
+from app.services.drafts import Draft
+from app.services.json_patch import PatchError, apply_patch, json_size
+
+# Exemples de l'annexe A de la RFC 6902 : (document, patch, résultat ou PatchError)
+RFC_6902_EXAMPLES = {
+    'A.1 add object member': (
+        {"foo": "bar"},
+        [{"op": "add", "path": "/baz", "value": "qux"}],
+        {"baz": "qux", "foo": "bar"}),
+    'A.2 add array element': (
+        {"foo": ["bar", "baz"]},
+        [{"op": "add", "path": "/foo/1", "value": "qux"}],
+        {"foo": ["bar", "qux", "baz"]}),
+    'A.3 remove object member': (
+        {"baz": "qux", "foo": "bar"},
+        [{"op": "remove", "path": "/baz"}],
+        {"foo": "bar"}),
+    'A.4 remove array element': (
+        {"foo": ["bar", "qux", "baz"]},
+        [{"op": "remove", "path": "/foo/1"}],
+        {"foo": ["bar", "baz"]}),
+    'A.5 replace value': (
+        {"baz": "qux", "foo": "bar"},
+        [{"op": "replace", "path": "/baz", "value": "boo"}],
+        {"baz": "boo", "foo": "bar"}),
+    'A.6 move value': (
+        {"foo": {"bar": "baz", "waldo": "fred"}, "qux": {"corge": "grault"}},
+        [{"op": "move", "from": "/foo/waldo", "path": "/qux/thud"}],
+        {"foo": {"bar": "baz"}, "qux": {"corge": "grault", "thud": "fred"}}),
+    'A.7 move array element': (
+        {"foo": ["all", "grass", "cows", "eat"]},
+        [{"op": "move", "from": "/foo/1", "path": "/foo/3"}],
+        {"foo": ["all", "cows", "eat", "grass"]}),
+    'A.8 test value success': (
+        {"baz": "qux", "foo": ["a", 2, "c"]},
+        [{"op": "test", "path": "/baz", "value": "qux"},
+         {"op": "test", "path": "/foo/1", "value": 2}],
+        {"baz": "qux", "foo": ["a", 2, "c"]}),
+    'A.9 test value error': (
+        {"baz": "qux"},
+        [{"op": "test", "path": "/baz", "value": "bar"}],
+        PatchError),
+    'A.10 add nested member object': (
+        {"foo": "bar"},
+        [{"op": "add", "path": "/child", "value": {"grandchild": {}}}],
+        {"foo": "bar", "child": {"grandchild": {}}}),
+    'A.11 ignore unrecognized elements': (
+        {"foo": "bar"},
+        [{"op": "add", "path": "/baz", "value": "qux", "xyz": 123}],
+        {"foo": "bar", "baz": "qux"}),
+    'A.12 add to nonexistent target': (
+        {"foo": "bar"},
+        [{"op": "add", "path": "/baz/bat", "value": "qux"}],
+        PatchError),
+    # Clé « op » en double : json.loads garde la dernière (remove d'un membre absent)
+    'A.13 invalid patch document': (
+        {"foo": "bar"},
+        json.loads('[{"op": "add", "path": "/baz", "value": "qux", "op": "remove"}]'),
+        PatchError),
+    'A.14 ~ escape ordering': (
+        {"/": 9, "~1": 10},
+        [{"op": "test", "path": "/~01", "value": 10}],
+        {"/": 9, "~1": 10}),
+    'A.15 compare strings and numbers': (
+        {"/": 9, "~1": 10},
+        [{"op": "test", "path": "/~01", "value": "10"}],
+        PatchError),
+    'A.16 add array value': (
+        {"foo": ["bar"]},
+        [{"op": "add", "path": "/foo/-", "value": ["abc", "def"]}],
+        {"foo": ["bar", ["abc", "def"]]}),
+}
+
+
+@pytest.mark.parametrize('name', RFC_6902_EXAMPLES)
+def test_rfc_6902_appendix_a(name):
+    doc, operations, expected = RFC_6902_EXAMPLES[name]
+    before = copy.deepcopy(doc)
+    if expected is PatchError:
+        with pytest.raises(PatchError):
+            apply_patch(doc, operations)
+    else:
+        result, _, size_delta = apply_patch(doc, operations)
+        assert result == expected
+        # Variation de taille mesurée sur les seules valeurs modifiées
+        assert json_size(doc) + size_delta == json_size(result)
+    # Document d'origine intact, même en cas d'échec
+    assert doc == before
+
+
+@pytest.mark.parametrize('operations, expected', [
+    ([{"op": "add", "path": "/foo/01", "value": 2}], PatchError),
+    ([{"op": "replace", "path": "", "value": {"x": 1}}], {"x": 1}),
+    ([{"op": "move", "from": "/foo", "path": "/foo/0"}], PatchError),
+    ([{"op": "test", "path": "/flag/0", "value": 1}], PatchError),
+    ([{"op": "copy", "from": "/foo", "path": "/bar"}, {"op": "add", "path": "/bar/-", "value": 3}],
+     {"foo": [1], "flag": [True], "bar": [1, 3]}),
+])
+def test_edge_cases(operations, expected):
+    doc = {"foo": [1], "flag": [True]}
+    if expected is PatchError:
+        with pytest.raises(PatchError):
+            apply_patch(doc, operations)
+    else:
+        result, _, size_delta = apply_patch(doc, operations)
+        assert result == expected
+        assert json_size(doc) + size_delta == json_size(result)
+    assert doc == {"foo": [1], "flag": [True]}
+
+
+def test_untouched_containers_are_shared():
+    doc = {"chapters": [{"t": i} for i in range(5)], "logos": {"x": "y"}}
+    result, changes, _ = apply_patch(doc, [
+        {"op": "replace", "path": "/chapters/2/t", "value": "z"},
+        {"op": "replace", "path": "/chapters/3/t", "value": "w"},
+    ])
+    assert result["logos"] is doc["logos"]
+    assert result["chapters"][0] is doc["chapters"][0]
+    assert doc["chapters"][2]["t"] == 2
+    assert changes == [["chapters", "2", "t"], ["chapters", "3", "t"]]
+
+
+def test_draft_size_follows_patched_content():
+    data = ReportData(nom="Dupont", logos={'logo_ecole': "data:image/png;base64," + "A" * 4000})
+    draft = Draft('session', 1, data, len(data.model_dump_json()))
+    size = draft.size
+
+    # Aller-retour : la taille revient à celle de départ, au lieu de s'accumuler
+    renamed, doc, renamed_size = draft.patched([{"op": "replace", "path": "/nom", "value": "Martin"}])
+    assert renamed.nom == "Martin" and renamed_size == size
+    back = Draft('session', 2, renamed, renamed_size, doc)
+    _, _, back_size = back.patched([{"op": "replace", "path": "/nom", "value": "Dupont"}])
+    assert back_size == size
+
+    # Image retirée : la taille diminue d'autant
+    _, _, smaller = draft.patched([{"op": "replace", "path": "/logos/logo_ecole", "value": None}])
+    assert smaller <= size - 4000
@@ -0,0 +1,53 @@
+from operator import attrgetter
+
+from app.generators.covers.cache import CoverCache
+from app.generators.image_cache import ImageCache
+from app.generators.lru import ByteBudgetCache
+from app.services.result_cache import ResultCache
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = ByteBudgetCache(40)
+    cache.put('a', b'x' * 10)
+    cache.put('b', b'x' * 10)
+    cache.put('c', b'x' * 10)
+    assert cache.get('a') == b'x' * 10
+    cache.put('d', b'x' * 10)
+    cache.put('e', b'x' * 10)
+    # « b » est le moins récemment utilisé
+    assert 'b' not in cache and 'a' in cache
+    assert cache.size == 40 and len(cache) == 4
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get('b') is None and cache.misses == 1
+
+
+def test_replacing_a_key_updates_the_size():
+    cache = ByteBudgetCache(100)
+    cache.put('a', b'x' * 20)
+    cache.put('a', b'x' * 5)
+    assert cache.size == 5 and len(cache) == 1
+
+
+def test_rejects_values_over_a_quarter_of_the_budget():
+    cache = ByteBudgetCache(100)
+    cache.put('big', b'x' * 26)
+    cache.put('empty', b'')
+    assert len(cache) == 0 and cache.size == 0
+
+
+def test_custom_sizeof():
+    class Value:
+        def __init__(self, size):
+            self.size = size
+
+    cache = ByteBudgetCache(100, sizeof=attrgetter('size'))
+    cache.put('a', Value(20))
+    cache.put('b', Value(20))
+    assert cache.size == 40
+    cache.clear()
+    assert cache.size == 0 and len(cache) == 0
+
+
+def test_caches_share_the_implementation():
+    for cls in (ResultCache, ImageCache, CoverCache):
+        assert issubclass(cls, ByteBudgetCache)
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+from pydantic import ValidationError
+
+from app.generators.outline import report_outline
+from app.generators.pagination import Paginator, report_styles
+from app.models.schemas import PageConfig, ReportData, StyleConfig
+
+
+def _chapters(count: int = 3) -> list:
+    return [{'id': i, 'title': f"Chapitre {i}", 'level': 1,
+             'children': [{'id': 100 + i, 'title': "Section", 'level': 2}]}
+            for i in range(1, count + 1)]
+
+
+def _outline(data, timeout: float = 5.0):
+    """report_outline(data), en échouant si la pagination ne se termine pas."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(report_outline(data)), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert result, "pagination interrompue au bout du délai"
+    return result[0]
+
+
+def test_default_report_pages():
+    outline = _outline(ReportData(chapters=_chapters()))
+    pages = list(outline.pages)
+    assert pages == sorted(pages)
+    assert pages[0] >= 3
+    assert outline.page_count > pages[-1]
+
+
+@pytest.mark.parametrize('page', [
+    {'margin_top': 20, 'margin_bottom': 20},
+    {'margin_left': 15, 'margin_right': 15},
+    {'margin_top': -5},
+])
+def test_schema_rejects_margins_without_text_area(page):
+    with pytest.raises(ValidationError):
+        PageConfig(**page)
+
+
+@pytest.mark.parametrize('style', [
+    {'font_size': 0},
+    {'line_spacing': 0},
+    {'line_spacing': -1.5},
+    {'title1_size': -16},
+])
+def test_schema_rejects_non_positive_sizes(style):
+    with pytest.raises(ValidationError):
+        StyleConfig(**style)
+
+
+@pytest.mark.parametrize('page, style', [
+    # Valeurs refusées par le schéma, mais possibles via model_construct
+    ({'margin_top': 20, 'margin_bottom': 20}, {}),
+    ({'margin_left': 15, 'margin_right': 15}, {}),
+    ({}, {'font_size': 0}),
+    ({}, {'line_spacing': 0}),
+    ({}, {'line_spacing': -1.5}),
+    ({}, {'title1_size': 100000}),
+])
+def test_paginator_bounded_for_degenerate_layouts(page, style):
+    data = ReportData(chapters=_chapters())
+    data.page = PageConfig.model_construct(**{**PageConfig().model_dump(), **page})
+    data.style = StyleConfig.model_construct(**{**StyleConfig().model_dump(), **style})
+    outline = _outline(data)
+    assert outline.page_count >= 1
+    assert all(page >= 1 for page in outline.pages)
+
+
+def test_long_paragraph_spans_pages():
+    data = ReportData()
+    paginator = Paginator(data.page, report_styles(data.style))
+    normal = paginator.styles['normal']
+    lines_per_page = int(paginator.height // normal.line_height)
+    start = paginator.paragraph("\n" * (3 * lines_per_page), normal)
+    assert start == 1
+    assert paginator.page == 4
+
+
+def test_unknown_font_families_share_metrics():
+    from app.generators import pagination
+
+    reference = pagination.font_metrics("Times New Roman")
+    before = len(pagination._metrics)
+    for family in ("../../etc/passwd", "Comic Sans MS", "x" * 1000, ""):
+        assert pagination.font_metrics(family) is reference
+        assert pagination.font_metrics(family, bold=True) is pagination.font_metrics(
+            "times new roman", bold=True)
+    assert len(pagination._metrics) <= before + 1
+    assert pagination.font_metrics(" ARIAL ") is pagination.font_metrics("Arial")
@@ -0,0 +1,49 @@
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from app.generators import report_generator
+from app.generators.base_document import base_documents, block_width
+from app.generators.covers import cover_cache
+from app.models.schemas import PageConfig, ReportData, StyleConfig
+
+
+def _image(fmt: str) -> str:
+    content = io.BytesIO()
+    Image.new('RGB', (320, 240), (200, 30, 30)).save(content, format=fmt)
+    return f"data:image/{fmt.lower()};base64," + base64.b64encode(content.getvalue()).decode()
+
+
+@pytest.mark.parametrize('left, right', [(2.5, 2.5), (1.27, 3.1), (0, 0), (3.333, 2.05)])
+def test_block_width_matches_base_document(left, right):
+    page = PageConfig(margin_left=left, margin_right=right)
+    assert block_width(page) == base_documents.new_document(StyleConfig(), page)._block_width
+
+
+def test_cover_images_submitted_before_document(monkeypatch):
+    events = []
+    submit = report_generator.PreparedImages.submit
+    new_document = base_documents.new_document
+
+    def recording_submit(self, images):
+        events.append(('submit', [height for _, height in images]))
+        return submit(self, images)
+
+    def recording_new_document(style, page):
+        events.append(('document', None))
+        return new_document(style, page)
+
+    monkeypatch.setattr(report_generator.PreparedImages, 'submit', recording_submit)
+    monkeypatch.setattr(base_documents, 'new_document', recording_new_document)
+    cover_cache.clear()
+    data = ReportData(cover_model='moderne', logos={
+        'logo_ecole': _image('PNG'), 'logo_entreprise': _image('JPEG'),
+        'image_centrale': _image('JPEG')})
+    report_generator.generate_report(data)
+
+    # Un seul envoi, avant le document : images de la page de garde et logos de l'en-tête
+    assert [name for name, _ in events] == ['submit', 'document']
+    heights = events[0][1]
+    assert len(heights) > 2
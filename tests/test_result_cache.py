@@ -0,0 +1,39 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.models.schemas import ReportData
+from app.services.result_cache import etag_matches, format_etag, report_cache_key
+
+ETAG = format_etag('abc123')
+
+
+@pytest.mark.parametrize('header, expected', [
+    (ETAG, True),
+    (f'W/{ETAG}', True),
+    (f'"autre", {ETAG}', True),
+    ('"autre"', False),
+    ('', False),
+    (None, False),
+    # « * » ne désigne pas le rapport demandé : pas de 304 pour un contenu jamais reçu
+    ('*', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, ETAG) is expected
+
+
+# Padding base64 invalide : b64decode lève binascii.Error
+MALFORMED_LOGO = 'data:image/png;base64,' + 'QUJD' * 40 + 'A'
+
+
+def test_report_cache_key_tolerates_malformed_logo():
+    data = ReportData(logos={'logo_ecole': MALFORMED_LOGO})
+    assert report_cache_key(data) == report_cache_key(data.model_copy())
+    assert report_cache_key(data) != report_cache_key(ReportData())
+
+
+def test_generate_skips_malformed_logo():
+    # Sans lifespan, le pool n'est pas démarré : génération dans le processus
+    response = TestClient(main.app).post('/generate', json={'logos': {'logo_ecole': MALFORMED_LOGO}})
+    assert response.status_code == 200
+    assert response.headers['etag']
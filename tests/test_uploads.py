@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.services import uploads
+from app.services.uploads import format_size
+
+BOUNDARY = 'rapport-boundary'
+
+
+def _multipart(data: dict, image: bytes = b'') -> bytes:
+    parts = [f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="data"\r\n\r\n'
+             f'{json.dumps(data)}\r\n'.encode()]
+    if image:
+        parts.append(f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="logo_ecole"; '
+                     f'filename="logo.png"\r\nContent-Type: image/png\r\n\r\n'.encode()
+                     + image + b'\r\n')
+    parts.append(f'--{BOUNDARY}--\r\n'.encode())
+    return b''.join(parts)
+
+
+def _chunked(body: bytes, size: int = 4096):
+    # Générateur : httpx envoie le corps par morceaux, sans Content-Length
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize('nbytes, text', [
+    (10 * 1024 * 1024, "10 Mo"),
+    (3 * 1024 * 1024 // 2, "1,5 Mo"),
+    (512 * 1024, "512 Ko"),
+    (1000, "1000 octets"),
+])
+def test_format_size(nbytes, text):
+    assert format_size(nbytes) == text
+
+
+def test_chunked_multipart_over_limit(client, monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_BODY_BYTES', 64 * 1024)
+    body = _multipart({'nom': 'Dupont'}, image=b'\x89PNG' + b'\0' * (256 * 1024))
+    response = client.post('/plan', content=_chunked(body),
+                           headers={'content-type': f'multipart/form-data; boundary={BOUNDARY}'})
+    assert response.status_code == 413
+    assert response.json()['detail'] == "Requête limitée à 64 Ko"
+
+
+def test_announced_multipart_over_limit(client, monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_BODY_BYTES', 64 * 1024)
+    body = _multipart({'nom': 'Dupont'}, image=b'\x89PNG' + b'\0' * (256 * 1024))
+    response = client.post('/plan', content=body,
+                           headers={'content-type': f'multipart/form-data; boundary={BOUNDARY}'})
+    assert response.status_code == 413
+
+
+def test_chunked_multipart_under_limit(client):
+    body = _multipart({'nom': 'Dupont', 'chapters': [{'id': 1, 'title': "Introduction", 'level': 1}]})
+    response = client.post('/plan', content=_chunked(body, 16),
+                           headers={'content-type': f'multipart/form-data; boundary={BOUNDARY}'})
+    assert response.status_code == 200
+    assert response.json()['chapters'] == 1
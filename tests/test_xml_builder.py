@@ -0,0 +1,152 @@
+"""
+Différentiel BodyBuilder / python-docx : les chapitres et la table des
+matières construits en XML doivent donner le même document.xml que les
+appels python-docx qu'ils remplacent.
+"""
+import io
+import zipfile
+
+import pytest
+from docx.enum.text import WD_TAB_ALIGNMENT, WD_TAB_LEADER
+from docx.shared import Cm, Pt, RGBColor
+
+from app.generators.base_document import base_documents
+from app.generators.outline import get_chapter_hint, report_outline
+from app.generators.sections.sections import MAX_HEADING_LEVEL, generate_chapters
+from app.generators.utils import create_toc
+from app.generators.xml_builder import BodyBuilder
+from app.models.schemas import ChapterItem, ReportData
+
+TITLES = [
+    "Introduction",
+    "Présentation de l'entreprise",
+    "A & <b> \"guillemets\" 'apostrophes'",
+    "  espaces en tête",
+    "espaces en fin  ",
+    "tab\ttitre",
+    "ligne\nsuivante\r\nfin",
+    "",
+    "é à ü — 漢字",
+    "\t",
+    "Bilan et conclusion",
+    "x" * 300,
+]
+
+
+def _tree(depth: int, width: int, level: int = 1, start: int = 0) -> list:
+    if depth == 0:
+        return []
+    return [ChapterItem(id=level * 100 + i, title=TITLES[(start + i) % len(TITLES)], level=level,
+                        children=_tree(depth - 1, width, level + 1, start + i + 1))
+            for i in range(width)]
+
+
+OUTLINES = {
+    'vide': [],
+    'plat': _tree(1, len(TITLES)),
+    'imbrique': _tree(3, 3),
+    # Plus profond que les styles de titre de Word (Heading 9)
+    'profond': _tree(MAX_HEADING_LEVEL + 2, 1),
+}
+
+
+def _reference_hint(doc, text: str):
+    run = doc.add_paragraph().add_run(text)
+    run.italic = True
+    run.font.color.rgb = RGBColor(128, 128, 128)
+
+
+def _reference_chapters(doc, outline):
+    """generate_chapters avec les appels python-docx."""
+    for index, (level, number, title, _) in enumerate(outline):
+        if level == 1:
+            if index:
+                doc.add_page_break()
+            doc.add_heading(f"{number} {title}", level=1)
+            _reference_hint(doc, get_chapter_hint(title))
+        else:
+            doc.add_heading(f"{number} {title}", level=min(level, MAX_HEADING_LEVEL))
+            _reference_hint(doc, "[Contenu à rédiger...]")
+    if len(outline):
+        doc.add_page_break()
+
+
+def _reference_toc_entry(doc, text: str, level: int = 1, page: str = ""):
+    """Entrée de table des matières construite avec python-docx."""
+    paragraph = doc.add_paragraph()
+    paragraph.paragraph_format.first_line_indent = Cm(0)
+    paragraph.paragraph_format.space_after = Pt(4)
+    paragraph.paragraph_format.left_indent = Cm({1: 0, 2: 0.75}.get(level, 1.5))
+    paragraph.paragraph_format.tab_stops.add_tab_stop(Cm(15), WD_TAB_ALIGNMENT.RIGHT,
+                                                      WD_TAB_LEADER.DOTS)
+    run = paragraph.add_run(text)
+    if level == 1:
+        run.bold = True
+        run.font.size = Pt(11)
+    else:
+        run.font.size = Pt(10)
+        if level > 2:
+            run.italic = True
+    paragraph.add_run("\t")
+    page_run = paragraph.add_run(page)
+    page_run.font.size = Pt(11 if level == 1 else 10)
+    if level == 1:
+        page_run.bold = True
+
+
+def _reference_toc(doc, data, outline):
+    if data.include_thanks:
+        _reference_toc_entry(doc, "REMERCIEMENTS", 1, str(outline.thanks_page))
+    if data.include_abstract:
+        _reference_toc_entry(doc, "RÉSUMÉ", 1, str(outline.abstract_page))
+    for level, number, title, page in outline:
+        _reference_toc_entry(doc, f"{number} {title}", level, str(page))
+    if data.include_annexes:
+        _reference_toc_entry(doc, "ANNEXES", 1, str(outline.end_page))
+
+
+def _document_xml(doc) -> bytes:
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    with zipfile.ZipFile(buffer) as archive:
+        return archive.read('word/document.xml')
+
+
+@pytest.mark.parametrize('name', OUTLINES)
+@pytest.mark.parametrize('sections', [True, False])
+def test_chapters_and_toc_match_python_docx(name, sections):
+    data = ReportData(chapters=OUTLINES[name], include_thanks=sections,
+                      include_abstract=sections, include_annexes=not sections)
+    outline = report_outline(data)
+
+    built = base_documents.new_document(data.style, data.page)
+    create_toc(built, data, outline)
+    generate_chapters(built, data, outline)
+
+    reference = base_documents.new_document(data.style, data.page)
+    _reference_toc(reference, data, outline)
+    _reference_chapters(reference, outline)
+
+    assert _document_xml(built) == _document_xml(reference)
+
+
+@pytest.mark.parametrize('text', TITLES)
+def test_primitives_match_python_docx(text):
+    data = ReportData()
+    built = base_documents.new_document(data.style, data.page)
+    builder = BodyBuilder(built)
+    builder.heading(text, level=0)
+    builder.heading(text, level=2)
+    builder.hint(text)
+    builder.page_break()
+    builder.toc_entry(text, 3, text)
+    builder.flush()
+
+    reference = base_documents.new_document(data.style, data.page)
+    reference.add_heading(text, level=0)
+    reference.add_heading(text, level=2)
+    _reference_hint(reference, text)
+    reference.add_page_break()
+    _reference_toc_entry(reference, text, 3, text)
+
+    assert _document_xml(built) == _document_xml(reference)